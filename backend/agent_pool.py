@@ -0,0 +1,235 @@
+"""
+Agent Instance Pool
+
+Keeps idle any-agent instances around so repeated runs of the same agent
+configuration (hot workflows, webhook-triggered runs) skip framework
+initialization, client construction and tool wrapping.
+
+Instances are keyed by (framework, model_id, instructions hash, tool set),
+leased to one run at a time, evicted least-recently-used beyond the max
+size and dropped after sitting idle longer than the TTL.
+
+Pooling is off by default (AGENT_POOL_ENABLED). any-agent's sync run starts
+a fresh event loop per call, and framework clients holding async HTTP pools
+bound to an earlier loop may break when reused; enable it only for
+frameworks whose clients tolerate that.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _tool_identity(tool: Any) -> Tuple[str, int]:
+    # Registry tools are stable objects until the registry is invalidated,
+    # so identity distinguishes tools that share a name (e.g. per-server MCP wrappers)
+    return (getattr(tool, "__name__", repr(tool)), id(tool))
+
+
+class AgentInstancePool:
+    """LRU pool of idle agent instances with idle TTL and hit/miss counters"""
+
+    def __init__(self, max_size: int = None, idle_ttl: float = None, enabled: bool = None):
+        self.max_size = max(0, max_size if max_size is not None else int(os.getenv("AGENT_POOL_MAX_SIZE", "32")))
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv("AGENT_POOL_IDLE_TTL", "600"))
+        if enabled is None:
+            enabled = os.getenv("AGENT_POOL_ENABLED", "false").lower() == "true"
+        self.enabled = enabled and self.max_size > 0
+
+        self._lock = threading.Lock()
+        self._entry_ids = itertools.count()
+        self._idle: Dict[Hashable, Dict[int, Tuple[Any, float]]] = {}  # key -> {entry_id: (agent, released_at)}
+        self._lru: "OrderedDict[int, Hashable]" = OrderedDict()        # entry_id -> key, least recent first
+        self._in_use = 0
+        self._runs: Dict[int, asyncio.Future] = {}  # id(agent) -> run of a leased agent still in progress
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.discarded = 0
+
+    @staticmethod
+    def make_key(framework: Any, agent_config: Any) -> Hashable:
+        """Pool key for an agent configuration"""
+        tools = getattr(agent_config, "tools", None) or []
+        model_args = getattr(agent_config, "model_args", None)
+        return (
+            str(framework).lower(),
+            getattr(agent_config, "model_id", None),
+            _hash_text(getattr(agent_config, "instructions", "") or ""),
+            tuple(sorted(_tool_identity(tool) for tool in tools)),
+            # Name and description show up in traces, so they are part of the identity too
+            getattr(agent_config, "name", None),
+            _hash_text(getattr(agent_config, "description", "") or ""),
+            _hash_text(json.dumps(model_args, sort_keys=True, default=str)) if model_args else None,
+        )
+
+    def _close(self, agent: Any):
+        exit_fn = getattr(agent, "exit", None)
+        if callable(exit_fn):
+            try:
+                exit_fn()
+            except Exception as e:
+                logger.debug(f"Agent exit failed during pool eviction: {e}")
+
+    def _pop_entry(self, entry_id: int) -> Any:
+        key = self._lru.pop(entry_id)
+        bucket = self._idle[key]
+        agent, _ = bucket.pop(entry_id)
+        if not bucket:
+            del self._idle[key]
+        return agent
+
+    def _expire_idle(self, now: float) -> list:
+        """Remove idle entries past their TTL (oldest first); returns agents to close"""
+        expired = []
+        while self._lru:
+            entry_id, key = next(iter(self._lru.items()))
+            _, released_at = self._idle[key][entry_id]
+            if now - released_at <= self.idle_ttl:
+                break
+            expired.append(self._pop_entry(entry_id))
+            self.expirations += 1
+        return expired
+
+    def acquire(self, key: Hashable) -> Optional[Any]:
+        """Take an idle instance for the key, or None on a miss"""
+        if not self.enabled:
+            return None
+        to_close = []
+        agent = None
+        with self._lock:
+            to_close.extend(self._expire_idle(time.monotonic()))
+            bucket = self._idle.get(key)
+            if bucket:
+                entry_id = next(reversed(bucket))  # most recently released
+                agent = self._pop_entry(entry_id)
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._in_use += 1
+        for stale in to_close:
+            self._close(stale)
+        return agent
+
+    def release(self, key: Hashable, agent: Any):
+        """Return a healthy instance to the pool after a run"""
+        if not self.enabled:
+            self._close(agent)
+            return
+        to_close = []
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+            now = time.monotonic()
+            entry_id = next(self._entry_ids)
+            self._idle.setdefault(key, {})[entry_id] = (agent, now)
+            self._lru[entry_id] = key
+            to_close.extend(self._expire_idle(now))
+            while len(self._lru) > self.max_size:
+                to_close.append(self._pop_entry(next(iter(self._lru))))
+                self.evictions += 1
+        for stale in to_close:
+            self._close(stale)
+
+    def discard(self, agent: Any):
+        """Drop an instance whose run failed instead of returning it to the pool"""
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+            self.discarded += 1
+            pending = self._runs.pop(id(agent), None)
+        if pending is not None and not pending.done():
+            # The caller gave up (timeout, cancellation) but the run is still going on a
+            # worker thread; close the agent once it finishes, not underneath it
+            pending.add_done_callback(lambda _: self._close(agent))
+            return
+        self._close(agent)
+
+    async def run(self, agent: Any, awaitable: Awaitable[Any]) -> Any:
+        """Await a run of a leased agent; if the caller stops waiting, the run keeps the agent until it ends"""
+        future = asyncio.ensure_future(awaitable)
+        # Abandoned runs are not awaited by anyone; retrieve their outcome to avoid unhandled-error noise
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        with self._lock:
+            self._runs[id(agent)] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                with self._lock:
+                    if self._runs.get(id(agent)) is future:
+                        del self._runs[id(agent)]
+
+    @asynccontextmanager
+    async def lease(self, framework: Any, agent_config: Any, create: Callable[[], Awaitable[Any]]):
+        """Lease an agent for one run, creating it with `create()` on a miss"""
+        key = self.make_key(framework, agent_config)
+        agent = self.acquire(key)
+        if agent is None:
+            try:
+                agent = await create()
+            except BaseException:
+                with self._lock:
+                    self._in_use = max(0, self._in_use - 1)
+                raise
+        try:
+            yield agent
+        except BaseException:
+            self.discard(agent)
+            raise
+        else:
+            self.release(key, agent)
+
+    def clear(self):
+        """Close every idle instance (called on app shutdown)"""
+        with self._lock:
+            agents = [agent for bucket in self._idle.values() for agent, _ in bucket.values()]
+            self._idle.clear()
+            self._lru.clear()
+        for agent in agents:
+            self._close(agent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and hit/miss metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_size": self.max_size,
+                "idle_ttl_seconds": self.idle_ttl,
+                "idle": len(self._lru),
+                "distinct_configs": len(self._idle),
+                "in_use": self._in_use,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "discarded": self.discarded,
+            }
+
+
+# Global agent pool instance
+_agent_instance_pool: Optional[AgentInstancePool] = None
+
+
+def get_agent_instance_pool() -> AgentInstancePool:
+    """Get or create the global agent instance pool"""
+    global _agent_instance_pool
+    if _agent_instance_pool is None:
+        _agent_instance_pool = AgentInstancePool()
+    return _agent_instance_pool
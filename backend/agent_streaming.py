@@ -0,0 +1,164 @@
+"""
+Agent Output Streaming
+
+Opt-in (AGENT_OUTPUT_STREAMING=true) per-turn streaming of agent node output.
+This is not token streaming: agents run through any-agent's normal
+(non-streaming) run on the worker pool, so tracing spans, run settings and
+off-loop tool execution are unchanged. An any-agent callback forwards the
+text of each completed LLM call to the event loop, where it is sent through
+the execution's event sink as one `node_output_delta` event per turn, so
+viewers of multi-turn agents see intermediate output before the node
+finishes. A `node_output_final` event with the node's final output follows,
+letting a viewer that missed deltas resync.
+
+When the callback never fires (any-agent without callbacks, or a run that
+produced no text turns) the final output is sent as a single delta.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+from agent_worker_pool import get_agent_worker_pool
+from execution_events import OUTPUT_DELTA_EVENT
+
+logger = logging.getLogger(__name__)
+
+# Callbacks are only available in recent any-agent releases
+try:
+    from any_agent.callbacks import Callback
+    CALLBACKS_AVAILABLE = True
+except ImportError:
+    Callback = object
+    CALLBACKS_AVAILABLE = False
+
+OUTPUT_FINAL_EVENT = "node_output_final"
+
+
+def is_output_streaming_enabled() -> bool:
+    """Whether agent nodes stream partial output to viewers"""
+    return os.getenv("AGENT_OUTPUT_STREAMING", "false").lower() == "true"
+
+
+class NodeOutputPublisher:
+    """Sends the text turns of one node as node_output_delta events"""
+
+    def __init__(self, sink: Any, execution_id: str, node_id: str):
+        self.sink = sink
+        self.execution_id = execution_id
+        self.node_id = node_id
+        self.sent_chars = 0
+        self.events = 0
+
+    async def send(self, text: str):
+        """Send one turn's text; awaiting the sink is the producer's backpressure"""
+        if not text:
+            return
+        await self.sink.send_json({
+            "type": OUTPUT_DELTA_EVENT,
+            "execution_id": self.execution_id,
+            "node_id": self.node_id,
+            "offset": self.sent_chars,
+            "delta": text,
+        })
+        self.sent_chars += len(text)
+        self.events += 1
+
+    async def finish(self, final_output: Any):
+        """Send the node's final output so viewers with gaps can replace their text"""
+        await self.sink.send_json({
+            "type": OUTPUT_FINAL_EVENT,
+            "execution_id": self.execution_id,
+            "node_id": self.node_id,
+            "output": final_output if isinstance(final_output, str) else str(final_output or ""),
+        })
+
+
+class _OutputStream:
+    """Hands text from the thread running an agent to a consumer on the event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.emitted = 0
+
+    def emit(self, text: str):
+        """Thread-safe; called from the worker thread (or the loop itself with native async runs)"""
+        if not text:
+            return
+        self.emitted += 1
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+
+# Output stream of the agent run in this context; the worker pool copies it onto the worker thread
+_current_stream: contextvars.ContextVar[Optional[_OutputStream]] = contextvars.ContextVar(
+    "agent_output_stream", default=None
+)
+
+
+class OutputStreamCallback(Callback):
+    """any-agent callback forwarding the text of each completed LLM call (one turn) to the run's output stream"""
+
+    def after_llm_call(self, context: Any, *args, **kwargs) -> Any:
+        stream = _current_stream.get()
+        span = getattr(context, "current_span", None)
+        attributes = getattr(span, "attributes", None) or {}
+        # Tool-call turns carry JSON output; only text turns are shown to viewers
+        if stream is not None and attributes.get("gen_ai.output.type", "text") == "text":
+            text = attributes.get("gen_ai.output")
+            if isinstance(text, str):
+                stream.emit(text)
+        return context
+
+
+def with_output_stream_callback(agent_config: Any) -> Any:
+    """Agent config with the output stream callback added (when streaming is enabled and supported)"""
+    if not (CALLBACKS_AVAILABLE and is_output_streaming_enabled()):
+        return agent_config
+    callbacks = list(getattr(agent_config, "callbacks", None) or [])
+    if any(isinstance(callback, OutputStreamCallback) for callback in callbacks):
+        return agent_config
+    return agent_config.model_copy(update={"callbacks": [*callbacks, OutputStreamCallback()]})
+
+
+async def run_agent_streamed(agent: Any, prompt: str, on_text: Callable[[str], Awaitable[None]]) -> Any:
+    """Run an agent on the worker pool, passing the text of each turn to on_text as it completes"""
+    stream = _OutputStream(asyncio.get_running_loop())
+
+    async def consume():
+        while True:
+            text = await stream.queue.get()
+            if text is None:
+                return
+            await on_text(text)
+
+    consumer = asyncio.create_task(consume())
+    token = _current_stream.set(stream)
+    try:
+        result = await get_agent_worker_pool().run_agent(agent, prompt)
+    finally:
+        _current_stream.reset(token)
+        stream.close()
+        await consumer
+
+    if not stream.emitted:
+        final_output = getattr(result, "final_output", None)
+        if final_output:
+            await on_text(final_output if isinstance(final_output, str) else str(final_output))
+    return result
+
+
+async def run_agent_with_output_stream(agent: Any, prompt: str, sink: Any, execution_id: str, node_id: str) -> Any:
+    """Run an agent for a workflow node, streaming its output to the sink when streaming is enabled"""
+    if sink is None or not is_output_streaming_enabled():
+        return await get_agent_worker_pool().run_agent(agent, prompt)
+    publisher = NodeOutputPublisher(sink, execution_id, node_id)
+    result = await run_agent_streamed(agent, prompt, publisher.send)
+    await publisher.finish(getattr(result, "final_output", None))
+    logger.debug(f"📡 Streamed {publisher.sent_chars} chars of {node_id} in {publisher.events} turns")
+    return result
@@ -0,0 +1,181 @@
+"""
+Agent Worker Pool
+
+Runs blocking any-agent work (agent creation, agent.run, tool calls) on a
+bounded thread pool so the FastAPI event loop stays free to serve API
+requests and WebSocket updates while workflows execute.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AgentWorkerPool:
+    """Bounded worker pool for blocking agent and tool calls"""
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, native_async: bool = None):
+        self.max_workers = max(1, max_workers or int(os.getenv("AGENT_WORKER_POOL_SIZE", "8")))
+        if max_queue is None:
+            max_queue = int(os.getenv("AGENT_WORKER_QUEUE_LIMIT", "64"))
+        self.max_queue = max(0, max_queue)
+        if native_async is None:
+            native_async = os.getenv("AGENT_NATIVE_ASYNC", "false").lower() == "true"
+        self.native_async = native_async
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._admission: Optional[asyncio.Semaphore] = None
+        self._admission_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        # Live counters
+        self._waiting = 0  # waiting for admission (pool + queue full)
+        self._queued = 0   # admitted, waiting for a free worker thread
+        self._active = 0   # running on a worker thread
+
+        # Lifetime counters
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queue_depth = 0
+        self._total_wait_ms = 0.0
+        self._total_run_ms = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the underlying thread pool on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="agent-worker"
+            )
+            logger.info(f"🧵 Agent worker pool started: {self.max_workers} workers, queue limit {self.max_queue}")
+        return self._executor
+
+    def _get_admission(self, loop: asyncio.AbstractEventLoop) -> Optional[asyncio.Semaphore]:
+        """Admission semaphore bounding running + queued work on the main loop"""
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(self.max_workers + self.max_queue)
+            self._admission_loop = loop
+        if self._admission_loop is not loop:
+            # Called from a private event loop (e.g. a worker thread); skip admission control
+            return None
+        return self._admission
+
+    def _queue_depth(self) -> int:
+        return self._waiting + self._queued
+
+    def _invoke(self, func: Callable, args: tuple, kwargs: dict, enqueued_at: float) -> Any:
+        """Runs on a worker thread"""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._total_wait_ms += (started_at - enqueued_at) * 1000
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._total_run_ms += (time.perf_counter() - started_at) * 1000
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        admission = self._get_admission(loop)
+        enqueued_at = time.perf_counter()
+
+        with self._lock:
+            self._waiting += 1
+            self._submitted += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth())
+
+        admitted = False
+        try:
+            if admission is not None:
+                await admission.acquire()
+            admitted = True
+            with self._lock:
+                self._waiting -= 1
+                self._queued += 1
+
+            # Preserve context variables (tracing context etc.) on the worker thread
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, self._invoke, func, args, kwargs, enqueued_at)
+            return await loop.run_in_executor(self._get_executor(), call)
+        finally:
+            if not admitted:
+                with self._lock:
+                    self._waiting -= 1
+            elif admission is not None:
+                admission.release()
+
+    async def run_agent(self, agent: Any, prompt: str) -> Any:
+        """Run an any-agent agent without blocking the event loop"""
+        if self.native_async and hasattr(agent, "run_async"):
+            return await agent.run_async(prompt)
+        return await self.run(agent.run, prompt)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and saturation metrics for monitoring"""
+        with self._lock:
+            finished = self._completed + self._failed
+            queue_depth = self._queue_depth()
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "native_async": self.native_async,
+                "active": self._active,
+                "queue_depth": queue_depth,
+                "waiting_for_admission": self._waiting,
+                "saturation": round(self._active / self.max_workers, 3),
+                "queue_utilization": round(queue_depth / self.max_queue, 3) if self.max_queue else 0.0,
+                "peak_queue_depth": self._peak_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_queue_wait_ms": round(self._total_wait_ms / finished, 2) if finished else 0.0,
+                "avg_run_ms": round(self._total_run_ms / finished, 2) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("🧵 Agent worker pool shut down")
+
+
+# Global worker pool instance
+_agent_worker_pool: Optional[AgentWorkerPool] = None
+
+
+def get_agent_worker_pool() -> AgentWorkerPool:
+    """Get or create the global agent worker pool"""
+    global _agent_worker_pool
+    if _agent_worker_pool is None:
+        _agent_worker_pool = AgentWorkerPool()
+    return _agent_worker_pool
+
+
+def shutdown_agent_worker_pool(wait: bool = False):
+    """Shut down the global agent worker pool (called on app shutdown)"""
+    global _agent_worker_pool
+    if _agent_worker_pool is not None:
+        _agent_worker_pool.shutdown(wait=wait)
+        _agent_worker_pool = None
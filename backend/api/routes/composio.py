@@ -6,6 +6,8 @@ import json
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException
 
+from tool_registry import get_tool_registry
+
 router = APIRouter(tags=["composio"])
 
 # Dependencies
@@ -62,6 +64,7 @@ async def update_composio_config(request: dict):
         
         # Save settings
         _save_user_settings(user_id, settings)
+        get_tool_registry().invalidate(f"Composio config updated for {user_id}")
         
         return {"success": True, "message": "Composio configuration updated"}
         
@@ -116,6 +119,7 @@ async def save_and_update_composio(request: dict):
         # Update available tools
         if composio_http_manager:
             await composio_http_manager.refresh_user_tools(user_id, api_key)
+        get_tool_registry().invalidate(f"Composio tools refreshed for {user_id}")
         
         return {"success": True, "message": "Configuration saved and tools updated"}
         
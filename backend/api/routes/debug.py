@@ -5,6 +5,14 @@ import uuid
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 
+from agent_worker_pool import get_agent_worker_pool
+from agent_pool import get_agent_instance_pool
+from tool_registry import get_tool_registry
+from workflow_plan import get_workflow_plan_cache
+from model_prices import get_model_price_table
+from judge_cache import get_judge_cache
+from execution_events import get_execution_event_hub
+
 router = APIRouter(prefix="/api/debug", tags=["debug"])
 
 # Dependencies
@@ -31,7 +39,7 @@ async def get_workflow_store_state():
         return {"error": "WorkflowStore not initialized"}
     
     return {
-        "total_executions": len(workflow_store.executions),
+        "total_executions": workflow_store.count_executions(),
         "executions": [
             {
                 "execution_id": e.get("execution_id"),
@@ -40,7 +48,7 @@ async def get_workflow_store_state():
                 "created_at": e.get("created_at"),
                 "workflow_name": e.get("workflow_name")
             }
-            for e in workflow_store.executions[-10:]  # Last 10 executions
+            for e in workflow_store.get_recent_executions(limit=10)  # Last 10 executions
         ],
         "workflow_store_id": id(workflow_store),
         "executor_store_id": id(executor.workflow_store) if executor and hasattr(executor, "workflow_store") else None,
@@ -48,6 +56,31 @@ async def get_workflow_store_state():
     }
 
 
+def _get_composio_http_stats():
+    try:
+        from composio_http_manager import user_manager
+        return user_manager.get_pool_stats()
+    except ImportError:
+        return None
+
+
+@router.get("/runtime-stats")
+async def get_runtime_stats():
+    """Get runtime metrics for the execution infrastructure"""
+    return {
+        "agent_worker_pool": get_agent_worker_pool().get_stats(),
+        "agent_instance_pool": get_agent_instance_pool().get_stats(),
+        "tool_registry": get_tool_registry().get_stats(),
+        "workflow_plan_cache": get_workflow_plan_cache().get_stats(),
+        "model_prices": get_model_price_table().get_stats(),
+        "judge_cache": get_judge_cache().get_stats() if get_judge_cache() else {"enabled": False},
+        "executions": executor.get_memory_stats() if executor else None,
+        "execution_events": get_execution_event_hub().get_stats(),
+        "composio_http": _get_composio_http_stats(),
+        "workflow_store": workflow_store.get_stats() if workflow_store else None
+    }
+
+
 @router.post("/test-executions")
 async def create_test_executions():
     """Create test executions for development"""
@@ -92,8 +125,7 @@ async def clear_test_executions():
     
     # Clear test user executions
     if "test_user" in executor.user_executions:
-        count = len(executor.user_executions["test_user"])
-        executor.user_executions["test_user"] = {}
+        count = executor._clear_user_executions("test_user")
         return {"success": True, "message": f"Cleared {count} test executions"}
     
     return {"success": True, "message": "No test executions to clear"}
@@ -139,22 +171,14 @@ async def migrate_anonymous_executions(request: Request):
     if not anon_executions:
         return {"success": True, "message": "No anonymous executions to migrate"}
     
-    # Get or create target user executions
-    if target_user_id not in executor.user_executions:
-        executor.user_executions[target_user_id] = {}
-    
-    # Migrate executions
+    # Migrate executions (IDs no longer encode the user, so they stay the same)
     migrated_count = 0
-    for exec_id, execution in anon_executions.items():
-        # Update execution ID to include user ID
-        new_exec_id = f"exec_{target_user_id}_{exec_id.split('_')[-1]}"
-        execution["migrated_from"] = exec_id
-        executor.user_executions[target_user_id][new_exec_id] = execution
+    for exec_id, execution in list(anon_executions.items()):
+        execution["user_id"] = target_user_id
+        execution["migrated_from"] = "anonymous"
+        executor._add_execution(target_user_id, exec_id, execution)
         migrated_count += 1
     
-    # Clear anonymous executions
-    executor.user_executions["anonymous"] = {}
-    
     return {
         "success": True,
         "message": f"Migrated {migrated_count} executions to user {target_user_id}"
@@ -206,8 +230,8 @@ async def debug_workflow_store_state():
     return {
         "workflow_store_instance": str(workflow_store),
         "workflow_store_id": id(workflow_store),
-        "total_executions_in_memory": len(workflow_store.executions),
-        "sample_executions": workflow_store.executions[:5] if workflow_store.executions else [],
+        "total_executions_stored": workflow_store.count_executions(),
+        "sample_executions": workflow_store.get_recent_executions(limit=5),
         "analytics_result": analytics,
         "executor_store_reference": {
             "has_reference": executor.workflow_store is not None if executor else False,
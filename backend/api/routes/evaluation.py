@@ -4,13 +4,14 @@ Evaluation and testing routes.
 import json
 import os
 import uuid
+from dataclasses import asdict
 from typing import Dict, List, Any
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 
 from models import EvaluationCaseRequest
-from lightweight_evaluation import evaluate_workflow_output
-from enhanced_workflow_evaluation import evaluate_end_to_end_workflow, WorkflowEvaluationResult
+from lightweight_evaluation import JUDGE_MODES
+from enhanced_workflow_evaluation import JudgeEngine, aevaluate_end_to_end_workflow
 
 router = APIRouter(prefix="/api/evaluations", tags=["evaluation"])
 
@@ -56,6 +57,30 @@ def _save_evaluation_runs(runs):
         json.dump(runs, f, indent=2)
 
 
+def _get_execution_or_404(execution_id: str) -> Dict[str, Any]:
+    """Look up an execution for evaluation"""
+    if not execution_id:
+        raise HTTPException(status_code=400, detail="execution_id is required")
+    if not executor:
+        raise HTTPException(status_code=500, detail="Executor not initialized")
+    execution = executor._get_execution_by_id(execution_id)
+    if not execution:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return execution
+
+
+def _judge_mode(request: Dict[str, Any]) -> str:
+    """Judge mode of a run: explicit in the request, else from its saved evaluation case"""
+    judge_mode = request.get("judge_mode")
+    if not judge_mode and request.get("evaluation_case_id"):
+        case = next((c for c in _load_evaluation_cases() if c.get("id") == request["evaluation_case_id"]), None)
+        judge_mode = (case or {}).get("judge_mode")
+    judge_mode = judge_mode or os.getenv("EVALUATION_JUDGE_MODE", "per_criterion")
+    if judge_mode not in JUDGE_MODES:
+        raise HTTPException(status_code=400, detail=f"judge_mode must be one of {', '.join(JUDGE_MODES)}")
+    return judge_mode
+
+
 @router.get("/cases")
 async def get_evaluation_cases():
     """Get all saved evaluation cases"""
@@ -70,6 +95,8 @@ async def get_evaluation_cases():
 @router.post("/cases")
 async def save_evaluation_case(evaluation_case: EvaluationCaseRequest):
     """Save a new evaluation case"""
+    if evaluation_case.judge_mode not in JUDGE_MODES:
+        raise HTTPException(status_code=400, detail=f"judge_mode must be one of {', '.join(JUDGE_MODES)}")
     try:
         cases = _load_evaluation_cases()
         
@@ -81,7 +108,8 @@ async def save_evaluation_case(evaluation_case: EvaluationCaseRequest):
             "checkpoints": [cp.dict() for cp in evaluation_case.checkpoints],
             "ground_truth": [gt.dict() for gt in evaluation_case.ground_truth],
             "final_output_criteria": [fc.dict() for fc in evaluation_case.final_output_criteria],
-            "node_criteria": [nc.dict() for nc in evaluation_case.node_criteria]
+            "node_criteria": [nc.dict() for nc in evaluation_case.node_criteria],
+            "judge_mode": evaluation_case.judge_mode
         }
         
         cases.append(case)
@@ -167,9 +195,17 @@ async def get_evaluation_metrics():
 @router.post("/run-enhanced")
 async def run_enhanced_workflow_evaluation(request: dict):
     """Run enhanced end-to-end workflow evaluation"""
-    workflow = request.get("workflow", {})
-    test_cases = request.get("test_cases", [])
-    evaluation_config = request.get("evaluation_config", {})
+    execution_id = request.get("execution_id")
+    evaluation_criteria = request.get("evaluation_criteria", {})
+    model = request.get("model", "gpt-4o-mini")
+    judge_mode = _judge_mode(request)
+    
+    execution = _get_execution_or_404(execution_id)
+    trace = execution.get("trace", {}) or {}
+    trace_data = {
+        "spans": trace.get("spans", []),
+        "final_output": trace.get("final_output", execution.get("result", ""))
+    }
     
     try:
         # Create evaluation run record
@@ -179,26 +215,31 @@ async def run_enhanced_workflow_evaluation(request: dict):
             "created_at": datetime.now().isoformat(),
             "status": "running",
             "progress": 0,
-            "workflow_id": workflow.get("id", "unknown"),
-            "test_case_count": len(test_cases)
+            "execution_id": execution_id,
+            "workflow_id": execution.get("workflow_id", "unknown")
         }
         
         runs = _load_evaluation_runs()
         runs.append(run)
         _save_evaluation_runs(runs)
         
-        # Run the evaluation
-        result = await evaluate_end_to_end_workflow(
-            workflow=workflow,
-            test_cases=test_cases,
-            evaluation_config=evaluation_config
-        )
+        # Run the evaluation (all judge calls fan out concurrently)
+        result = asdict(await aevaluate_end_to_end_workflow(
+            execution_id=execution_id,
+            trace_data=trace_data,
+            evaluation_criteria=evaluation_criteria,
+            model=model,
+            concurrency=request.get("concurrency"),
+            deadline=request.get("deadline_seconds"),
+            use_cache=request.get("use_cache", True),
+            judge_mode=judge_mode
+        ))
         
         # Update run with results
         run["status"] = "completed"
         run["progress"] = 100
         run["completed_at"] = datetime.now().isoformat()
-        run["results"] = result.dict() if hasattr(result, 'dict') else result
+        run["results"] = {**result, "total_score": result["overall_score"]}
         
         _save_evaluation_runs(runs)
         
@@ -225,36 +266,98 @@ async def run_evaluation(request: dict):
     """Run lightweight workflow evaluation"""
     execution_id = request.get("execution_id")
     evaluation_criteria = request.get("evaluation_criteria", {})
+    model = request.get("model", "gpt-4o-mini")
+    judge_mode = _judge_mode(request)
     
-    if not execution_id:
-        raise HTTPException(status_code=400, detail="execution_id is required")
-    
-    # Get execution from executor
-    if not executor:
-        raise HTTPException(status_code=500, detail="Executor not initialized")
+    # Only final-output criteria are judged here; refuse rather than silently drop the rest
+    unsupported = [field for field in ("checkpoints", "ground_truth") if request.get(field)]
+    if unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{' and '.join(unsupported)} can't be evaluated by this run yet - only final output criteria are judged. "
+                   f"Remove them from the evaluation case or rewrite them as final output criteria."
+        )
     
-    execution = executor._get_execution_by_id(execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
+    execution = _get_execution_or_404(execution_id)
     
     # Get the output to evaluate
-    output = execution.get("result", "")
-    trace = execution.get("trace", {})
+    trace = execution.get("trace", {}) or {}
+    output = trace.get("final_output") or execution.get("result", "")
+    output = output if isinstance(output, str) else json.dumps(output, default=str)
+    
+    # Accept either a list of {criteria, points} or {"final_output_criteria": [...]}
+    if isinstance(evaluation_criteria, dict):
+        evaluation_criteria = evaluation_criteria.get("final_output_criteria", [])
     
     try:
-        # Run evaluation
-        evaluation_result = await evaluate_workflow_output(
-            output=output,
-            trace=trace,
-            evaluation_criteria=evaluation_criteria
-        )
+        # Create evaluation run record
+        run_id = str(uuid.uuid4())
+        started_at = datetime.now()
+        run = {
+            "id": run_id,
+            "name": request.get("name") or f"Evaluation of {execution_id}",
+            "created_at": started_at.isoformat(),
+            "status": "running",
+            "progress": 0,
+            "execution_id": execution_id,
+            "trace_id": execution_id,
+            "workflow_id": execution.get("workflow_id", "unknown"),
+            "evaluation_case_id": request.get("evaluation_case_id"),
+            "judge_mode": judge_mode
+        }
+        
+        runs = _load_evaluation_runs()
+        runs.append(run)
+        _save_evaluation_runs(runs)
+        
+        # Run evaluation - criteria are judged concurrently, or in one call when batched
+        engine = JudgeEngine(model, use_cache=request.get("use_cache", True), judge_mode=judge_mode)
+        results = await engine.judge_all(output, evaluation_criteria)
+        
+        total_points = sum(c["points"] for c in evaluation_criteria)
+        earned_points = sum(r.points for r in results if r.passed)
+        evaluation = {
+            "score": earned_points / total_points if total_points > 0 else 0,
+            "total_points": total_points,
+            "earned_points": earned_points,
+            "results": [asdict(r) for r in results]
+        }
+        
+        # Update run with results
+        completed_at = datetime.now()
+        run["status"] = "completed"
+        run["progress"] = 100
+        run["completed_at"] = completed_at.isoformat()
+        run["duration_ms"] = int((completed_at - started_at).total_seconds() * 1000)
+        run["results"] = {**evaluation, "total_score": evaluation["score"]}
+        run["result"] = {
+            "trace": None,
+            "hypothesis_answer": output,
+            "score": evaluation["score"],
+            "total_points": total_points,
+            "earned_points": earned_points,
+            "checkpoint_results": [],
+            "ground_truth_results": [],
+            "final_output_results": evaluation["results"]
+        }
+        
+        _save_evaluation_runs(runs)
         
         return {
+            "run_id": run_id,
             "execution_id": execution_id,
-            "evaluation": evaluation_result
+            "judge_mode": judge_mode,
+            "evaluation": evaluation
         }
     except Exception as e:
         print(f"Error running evaluation: {e}")
+        
+        # Update run as failed
+        if 'run' in locals():
+            run["status"] = "failed"
+            run["error"] = str(e)
+            _save_evaluation_runs(runs)
+        
         raise HTTPException(status_code=500, detail=str(e))
 
 
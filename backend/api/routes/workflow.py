@@ -1,9 +1,13 @@
 """
 Workflow execution and management routes.
 """
-from typing import Dict, Any
+import asyncio
+import json
+import os
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from sse_starlette.sse import EventSourceResponse
 
 from models import ExecutionRequest, ExecutionResponse, UserInputRequest
 
@@ -94,6 +98,61 @@ async def get_execution(execution_id: str):
     }
 
 
+def _parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """Sequence number from a Last-Event-ID header (None when absent or malformed)"""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _streamed_status(event: Dict[str, Any], current: Optional[str]) -> Optional[str]:
+    """Execution status as seen by a client after applying this event"""
+    if event.get("type") == "status":
+        return event.get("status")
+    if event.get("type") == "execution_delta":
+        for op in event.get("ops", []):
+            if op.get("path") == "/status":
+                current = op.get("value")
+    return current
+
+
+@router.get("/executions/{execution_id}/events")
+async def stream_execution_events(execution_id: str, request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events stream of execution status, deltas and node events, resumable via Last-Event-ID"""
+    if not executor:
+        raise HTTPException(status_code=500, detail="Executor not initialized")
+    if not executor._get_execution_by_id(execution_id) and not executor.event_hub.last_seq(execution_id):
+        raise HTTPException(status_code=404, detail="Execution not found")
+    
+    # EventSource sends the header on reconnect; the query parameter serves clients that can't set headers
+    last_seq = _parse_last_event_id(request.headers.get("last-event-id") or last_event_id)
+    
+    snapshot = executor._execution_snapshot(execution_id)
+    if snapshot.get("status") in ("completed", "failed"):
+        if last_seq is not None and last_seq >= snapshot["seq"]:
+            # Client already has the final state: 204 stops EventSource from reconnecting
+            return Response(status_code=204)
+        
+        async def final_state():
+            yield {"id": str(snapshot["seq"]), "event": "status", "data": json.dumps(snapshot, default=str)}
+        
+        return EventSourceResponse(final_state(), headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    
+    async def event_stream():
+        status = None
+        async for event in executor.stream_execution_events(execution_id, last_seq=last_seq):
+            yield {"id": str(event["seq"]), "event": event.get("type", "message"), "data": json.dumps(event, default=str)}
+            status = _streamed_status(event, status)
+            if status in ("completed", "failed"):
+                # The final state (including the result) has been sent
+                break
+    
+    # ping sends ':' comment lines so proxies keep idle streams open
+    heartbeat = int(os.getenv("EXECUTION_SSE_HEARTBEAT", "15"))
+    return EventSourceResponse(event_stream(), ping=heartbeat, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @router.get("/executions/{execution_id}/trace")
 async def get_execution_trace(execution_id: str):
     """Get execution trace by ID"""
@@ -148,35 +207,30 @@ async def websocket_execution_status(websocket: WebSocket, execution_id: str):
     
     await websocket.accept()
     
-    # Store the websocket connection
-    executor.websocket_connections[execution_id] = websocket
+    async def forward_events():
+        # Full status first, then sequence-numbered execution_delta and event messages
+        async for event in executor.stream_execution_events(execution_id):
+            await websocket.send_json(event)
     
+    sender = asyncio.create_task(forward_events())
     try:
-        # Send initial status
-        execution = executor._get_execution_by_id(execution_id)
-        if execution:
-            await websocket.send_json({
-                "type": "status",
-                "status": execution.get("status", "unknown"),
-                "result": execution.get("result"),
-                "error": execution.get("error"),
-                "progress": execution.get("progress", {})
-            })
-        
         # Keep connection open for updates
         while True:
             try:
-                # Wait for any message from client (heartbeat)
-                await websocket.receive_text()
+                # Wait for any message from client (heartbeat, or "resync" after a sequence gap)
+                message = await websocket.receive_text()
             except WebSocketDisconnect:
                 break
+            if message == "resync":
+                # Restart the stream, which begins with a fresh snapshot
+                sender.cancel()
+                sender = asyncio.create_task(forward_events())
                 
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
-        # Clean up connection
-        if execution_id in executor.websocket_connections:
-            del executor.websocket_connections[execution_id]
+        # Unsubscribe this viewer; other viewers of the execution are unaffected
+        sender.cancel()
 
 
 # Workflow-related analytics routes (keeping them here as they're tightly coupled)
@@ -7,13 +7,18 @@ Each user has isolated Composio connections and permissions.
 """
 
 import asyncio
+import concurrent.futures
+import contextvars
 import json
 import os
 import sys
 import logging
-from typing import Dict, List, Any, Optional
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from dataclasses import dataclass
 
+from swr_cache import SWRCache
+
 # Import encryption service for handling encrypted API keys
 try:
     from encryption_service import get_encryption_service
@@ -31,6 +36,11 @@ except ImportError:
     COMPOSIO_AVAILABLE = False
     logging.warning("Composio integration disabled")
 
+COMPOSIO_API_BASE = 'https://backend.composio.dev'
+
+# Set while running on a private, short-lived event loop (see ComposioHttpClient.run_sync)
+_private_loop: contextvars.ContextVar = contextvars.ContextVar("composio_private_loop", default=False)
+
 @dataclass
 class UserContext:
     """User execution context"""
@@ -47,9 +57,111 @@ class ComposioHttpClient:
         self.user_api_keys: Dict[str, str] = {}  # user_id -> api_key
         self.available_tools = {}
         self._discover_base_tools()
-        self._dynamic_discovery_cache = {}
+        # Discovered actions per user: served stale while a single background refresh runs
+        self._discovery_cache = SWRCache(
+            "composio_discovery",
+            max_entries=int(os.getenv("COMPOSIO_DISCOVERY_CACHE_SIZE", "256")),
+            ttl=float(os.getenv("COMPOSIO_DISCOVERY_TTL", "3600")),
+            stale_ttl=float(os.getenv("COMPOSIO_DISCOVERY_STALE_TTL", "86400"))
+        )
+        
+        # One long-lived HTTP session per client, reused across calls (keep-alive + DNS cache)
+        self._session = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_stats = {"requests": 0, "in_flight": 0, "sessions_created": 0, "transient_sessions": 0}
         logging.info("🚀 Composio manager initialized with HTTP-only approach")
     
+    def _create_connector(self):
+        """Connection pool tuned for many calls to a single API host"""
+        import aiohttp
+        return aiohttp.TCPConnector(
+            limit=int(os.getenv("COMPOSIO_HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("COMPOSIO_HTTP_POOL_PER_HOST", "20")),
+            ttl_dns_cache=int(os.getenv("COMPOSIO_HTTP_DNS_TTL", "300")),
+            keepalive_timeout=float(os.getenv("COMPOSIO_HTTP_KEEPALIVE", "30")),
+            enable_cleanup_closed=True
+        )
+    
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Pin the shared session to the application's event loop (called from the FastAPI lifespan)"""
+        self._session_loop = loop
+    
+    @asynccontextmanager
+    async def _http_session(self):
+        """Yield the shared session; callers on a private event loop get a short-lived one"""
+        import aiohttp
+        loop = asyncio.get_running_loop()
+        if not _private_loop.get() and (self._session_loop is None or self._session_loop.is_closed()):
+            self._session_loop = loop
+            self._session = None
+        
+        self._http_stats["requests"] += 1
+        self._http_stats["in_flight"] += 1
+        try:
+            if loop is self._session_loop:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession(connector=self._create_connector())
+                    self._http_stats["sessions_created"] += 1
+                yield self._session
+            else:
+                # Sessions are bound to their event loop, so other loops cannot share it
+                self._http_stats["transient_sessions"] += 1
+                async with aiohttp.ClientSession() as session:
+                    yield session
+        finally:
+            self._http_stats["in_flight"] -= 1
+    
+    async def close(self):
+        """Close the shared HTTP session (called on app shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logging.info("🔌 Composio HTTP session closed")
+        self._session = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection-pool statistics for the shared session plus discovery-cache metrics"""
+        stats = dict(self._http_stats)
+        session = self._session
+        if session is not None and not session.closed:
+            connector = session.connector
+            stats.update({
+                "connection_limit": connector.limit,
+                "connection_limit_per_host": connector.limit_per_host,
+                "idle_connections": sum(len(conns) for conns in getattr(connector, "_conns", {}).values()),
+                "active_connections": len(getattr(connector, "_acquired", ())),
+            })
+        stats["session_open"] = session is not None and not session.closed
+        stats["discovery_cache"] = self._discovery_cache.get_stats()
+        return stats
+    
+    def run_sync(self, coro_factory: Callable[[], Awaitable[Any]], timeout: float = 30) -> Any:
+        """Run a client coroutine from synchronous code, e.g. a tool call on a worker thread"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        home_loop = self._session_loop
+        if home_loop is not None and home_loop.is_running() and running_loop is not home_loop:
+            # Hand the call to the application loop so it shares the pooled session
+            future = asyncio.run_coroutine_threadsafe(coro_factory(), home_loop)
+            try:
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+        
+        async def run_private():
+            _private_loop.set(True)
+            return await coro_factory()
+        
+        if running_loop is None:
+            return asyncio.run(run_private())
+        
+        # Called on the loop thread itself: run on a private loop in a helper thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run_private()).result(timeout)
+    
     def _discover_base_tools(self):
         """Discover popular Composio tools (lightweight subset)"""
         popular_tools = {
@@ -185,6 +297,14 @@ class ComposioHttpClient:
         
         self.available_tools = popular_tools
     
+    def _discovery_cache_key(self, user_context: UserContext, api_key: str) -> str:
+        return f"{user_context.user_id}_{hash(api_key)}"
+    
+    def _discovery_loader(self, user_context: UserContext, api_key: str):
+        async def load():
+            return await self._discover_actions_uncached(user_context, api_key)
+        return load
+    
     async def discover_actions_for_user(self, user_context: UserContext) -> Dict[str, Dict[str, Any]]:
         """Dynamically discover real actions from Composio API for user's connected apps"""
         # Get decrypted API key for discovery
@@ -197,105 +317,153 @@ class ComposioHttpClient:
             logging.info("No decrypted API key available, using fallback tools")
             return self.available_tools
         
-        # Check cache first (cache for 1 hour per user)
-        cache_key = f"{user_context.user_id}_{hash(actual_api_key)}"
-        if cache_key in self._dynamic_discovery_cache:
-            cached_data = self._dynamic_discovery_cache[cache_key]
-            if cached_data.get('timestamp', 0) > asyncio.get_event_loop().time() - 3600:  # 1 hour cache
-                logging.info(f"Using cached actions for user {user_context.user_id}")
-                return cached_data['tools']
-        
-        discovered_tools = {}
-        
         try:
-            # Dynamic import to avoid startup issues
-            import aiohttp
-            
-            async with aiohttp.ClientSession() as session:
-                # First, get connected accounts
-                try:
-                    async with session.get(
-                        'https://backend.composio.dev/api/v1/connectedAccounts',
-                        headers={'x-api-key': actual_api_key, 'Content-Type': 'application/json'},
-                        timeout=aiohttp.ClientTimeout(total=15)
-                    ) as response:
-                        connected_apps = []
-                        if response.status == 200:
-                            accounts_data = await response.json(content_type=None)
-                            
-                            if accounts_data.get('items'):
-                                connected_apps = [
-                                    item.get('appName') or item.get('name') or item.get('slug') 
-                                    for item in accounts_data['items']
-                                ]
-                                connected_apps = [app for app in connected_apps if app]
-                            
-                            logging.info(f"🔍 User {user_context.user_id} connected apps: {connected_apps}")
-                        else:
-                            logging.warning(f"Failed to fetch connected accounts: {response.status}")
-                            
-                except Exception as e:
-                    logging.warning(f"Error fetching connected accounts: {e}")
-                    connected_apps = []
-                
-                # If no connected apps found, use common ones
-                if not connected_apps:
-                    connected_apps = ['googledocs', 'github', 'gmail', 'slack', 'notion']
-                    logging.info(f"Using fallback apps for user {user_context.user_id}")
-                
-                # Fetch actions for each connected app
-                for app_name in connected_apps[:5]:  # Limit to 5 apps for performance
-                    try:
-                        async with session.get(
-                            f'https://backend.composio.dev/api/v1/actions?appNames={app_name}',
-                            headers={'x-api-key': actual_api_key, 'Content-Type': 'application/json'},
-                            timeout=aiohttp.ClientTimeout(total=10)
-                        ) as actions_response:
-                            if actions_response.status == 200:
-                                actions_data = await actions_response.json(content_type=None)
-                                
-                                if actions_data.get('items'):
-                                    for action in actions_data['items']:
-                                        action_name = action.get('name')
-                                        if action_name:
-                                            discovered_tools[action_name] = {
-                                                "description": action.get('description', f"Action for {app_name}"),
-                                                "category": self._categorize_app(app_name),
-                                                "parameters": action.get('parameters', {}),
-                                                "app_name": app_name,
-                                                "display_name": action.get('displayName', action_name),
-                                                "source": "dynamic_discovery"
-                                            }
-                                    
-                                    logging.info(f"✅ Discovered {len(actions_data['items'])} actions for {app_name}")
-                            else:
-                                logging.warning(f"Failed to fetch actions for {app_name}: {actions_response.status}")
-                    except Exception as e:
-                        logging.warning(f"Error fetching actions for {app_name}: {e}")
-                        
+            discovery = await self._discovery_cache.get(
+                self._discovery_cache_key(user_context, actual_api_key),
+                self._discovery_loader(user_context, actual_api_key)
+            )
         except ImportError:
             logging.warning("aiohttp not available, using fallback tools")
             return self.available_tools
         except Exception as e:
             logging.error(f"Error during dynamic action discovery: {e}")
             return self.available_tools
+        return discovery['tools']
+    
+    def _cached_actions_for_user(self, user_context: UserContext) -> tuple:
+        """Discovered actions from the cache without waiting on discovery; returns (tools, complete)"""
+        api_key = self._get_decrypted_api_key(user_context)
+        if not api_key:
+            return self.available_tools, True
         
-        # If we discovered any tools, merge with fallback tools and cache
-        if discovered_tools:
-            # Merge discovered tools with fallback tools (discovered takes priority)
-            final_tools = {**self.available_tools, **discovered_tools}
+        # Refresh in the background when missing or stale; a private loop would not outlive the refresh
+        loader = None if _private_loop.get() else self._discovery_loader(user_context, api_key)
+        discovery = self._discovery_cache.peek(self._discovery_cache_key(user_context, api_key), loader)
+        if discovery is None:
+            return self.available_tools, False
+        return discovery['tools'], not discovery['partial']
+    
+    async def _discover_actions_uncached(self, user_context: UserContext, actual_api_key: str) -> tuple:
+        """Query Composio for the user's actions; returns (discovery, cache ttl)"""
+        discovered_tools = {}
+        partial = False
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + float(os.getenv("COMPOSIO_DISCOVERY_DEADLINE", "12"))
+        
+        # Dynamic import to avoid startup issues
+        import aiohttp
+        
+        async with self._http_session() as session:
+            # First, get connected accounts
+            try:
+                async with session.get(
+                    f'{COMPOSIO_API_BASE}/api/v1/connectedAccounts',
+                    headers={'x-api-key': actual_api_key, 'Content-Type': 'application/json'},
+                    timeout=aiohttp.ClientTimeout(total=max(0.1, min(15, deadline - loop.time())))
+                ) as response:
+                    connected_apps = []
+                    if response.status == 200:
+                        accounts_data = await response.json(content_type=None)
+                        
+                        if accounts_data.get('items'):
+                            connected_apps = [
+                                item.get('appName') or item.get('name') or item.get('slug') 
+                                for item in accounts_data['items']
+                            ]
+                            connected_apps = list(dict.fromkeys(app for app in connected_apps if app))
+                        
+                        logging.info(f"🔍 User {user_context.user_id} connected apps: {connected_apps}")
+                    else:
+                        logging.warning(f"Failed to fetch connected accounts: {response.status}")
+                        
+            except Exception as e:
+                logging.warning(f"Error fetching connected accounts: {e}")
+                connected_apps = []
             
-            # Cache the result
-            self._dynamic_discovery_cache[cache_key] = {
-                'tools': final_tools,
-                'timestamp': asyncio.get_event_loop().time()
-            }
+            # If no connected apps found, use common ones
+            if not connected_apps:
+                connected_apps = ['googledocs', 'github', 'gmail', 'slack', 'notion']
+                logging.info(f"Using fallback apps for user {user_context.user_id}")
             
-            logging.info(f"🎉 Successfully discovered {len(discovered_tools)} real actions for user {user_context.user_id}")
-            return final_tools
-        else:
-            logging.info(f"No dynamic actions discovered for user {user_context.user_id}, using fallback")
-            return self.available_tools
+            # Fetch actions for all connected apps concurrently, bounded by a semaphore
+            # and the overall discovery deadline
+            max_apps = int(os.getenv("COMPOSIO_DISCOVERY_MAX_APPS", "50"))  # 0 = no cap
+            if max_apps > 0 and len(connected_apps) > max_apps:
+                logging.warning(f"Discovering actions for the first {max_apps} of {len(connected_apps)} connected apps")
+                connected_apps = connected_apps[:max_apps]
+            
+            semaphore = asyncio.Semaphore(int(os.getenv("COMPOSIO_DISCOVERY_CONCURRENCY", "8")))
+            fetches = [
+                asyncio.create_task(self._fetch_app_actions(session, app_name, actual_api_key, semaphore))
+                for app_name in connected_apps
+            ]
+            done, pending = await asyncio.wait(fetches, timeout=max(0.0, deadline - loop.time()))
+            
+            if pending:
+                partial = True
+                timed_out = [app for app, task in zip(connected_apps, fetches) if task in pending]
+                logging.warning(f"⏱️  Action discovery deadline hit; returning partial results (timed out: {timed_out})")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            
+            # Merge in app order so results are deterministic
+            for task in fetches:
+                if task in done:
+                    app_actions, complete = task.result()
+                    discovered_tools.update(app_actions)
+                    partial = partial or not complete
+        
+        partial_ttl = float(os.getenv("COMPOSIO_DISCOVERY_PARTIAL_TTL", "60"))
+        
+        # If we discovered any tools, merge with fallback tools (discovered takes priority)
+        if discovered_tools:
+            final_tools = {**self.available_tools, **discovered_tools}
+            logging.info(f"🎉 Successfully discovered {len(discovered_tools)} real actions for user {user_context.user_id}{' (partial)' if partial else ''}")
+            # Partial results are retried sooner
+            return {'tools': final_tools, 'partial': partial}, partial_ttl if partial else self._discovery_cache.ttl
+        
+        logging.info(f"No dynamic actions discovered for user {user_context.user_id}, using fallback")
+        # Remember the miss briefly so repeated lookups don't hammer the API
+        return {'tools': self.available_tools, 'partial': True}, partial_ttl
+    
+    async def _fetch_app_actions(self, session, app_name: str, api_key: str, semaphore: asyncio.Semaphore) -> tuple:
+        """Fetch the actions of one connected app; returns (actions, complete)"""
+        import aiohttp
+        
+        async with semaphore:
+            try:
+                async with session.get(
+                    f'{COMPOSIO_API_BASE}/api/v1/actions?appNames={app_name}',
+                    headers={'x-api-key': api_key, 'Content-Type': 'application/json'},
+                    timeout=aiohttp.ClientTimeout(total=10)
+                ) as actions_response:
+                    if actions_response.status != 200:
+                        logging.warning(f"Failed to fetch actions for {app_name}: {actions_response.status}")
+                        return {}, False
+                    
+                    actions_data = await actions_response.json(content_type=None)
+                    app_actions = {}
+                    for action in actions_data.get('items') or []:
+                        action_name = action.get('name')
+                        if action_name:
+                            app_actions[action_name] = {
+                                "description": action.get('description', f"Action for {app_name}"),
+                                "category": self._categorize_app(app_name),
+                                "parameters": action.get('parameters', {}),
+                                "app_name": app_name,
+                                "display_name": action.get('displayName', action_name),
+                                "source": "dynamic_discovery"
+                            }
+                    
+                    if app_actions:
+                        logging.info(f"✅ Discovered {len(app_actions)} actions for {app_name}")
+                    return app_actions, True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Error fetching actions for {app_name}: {e}")
+                return {}, False
     
     def _categorize_app(self, app_name: str) -> str:
         """Categorize app by name"""
@@ -359,19 +527,15 @@ class ComposioHttpClient:
                 "available_tools": user_context.enabled_tools
             }
         
-        # Get available tools for this user (includes dynamic discovery)
-        try:
-            available_tools = await self.discover_actions_for_user(user_context)
-        except Exception as e:
-            logging.warning(f"Dynamic discovery failed for execution, using fallback: {e}")
-            available_tools = self.available_tools
+        # Known tools come from the discovery cache; discovery itself never runs on this path
+        available_tools, discovery_complete = self._cached_actions_for_user(user_context)
         
-        # Check if tool exists
-        if tool_name not in available_tools:
+        # Only reject unknown tools against a complete catalog; otherwise let the API decide
+        if tool_name not in available_tools and discovery_complete:
             return {"error": f"Tool '{tool_name}' not found in available tools: {list(available_tools.keys())[:10]}"}
         
         # Get app name from tool info (for HTTP API)
-        tool_info = available_tools[tool_name]
+        tool_info = available_tools.get(tool_name, {})
         app_name = tool_info.get('app_name', self._extract_app_name_from_tool(tool_name))
         
         # Get user's API key (HTTP-only approach)
@@ -388,10 +552,10 @@ class ComposioHttpClient:
             # Execute with direct HTTP API only
             import aiohttp
             
-            async with aiohttp.ClientSession() as session:
+            async with self._http_session() as session:
                 # Use direct HTTP API approach (no SDK)
                 async with session.post(
-                    f'https://backend.composio.dev/api/v2/actions/{tool_name}/execute',
+                    f'{COMPOSIO_API_BASE}/api/v2/actions/{tool_name}/execute',
                     headers={'x-api-key': actual_api_key, 'Content-Type': 'application/json'},
                     json={
                         "input": params,
@@ -680,9 +844,9 @@ class PerUserComposioManager:
             # Test the key by making a simple API call
             import aiohttp
             
-            async with aiohttp.ClientSession() as session:
+            async with self.user_manager._http_session() as session:
                 async with session.get(
-                    'https://backend.composio.dev/api/v1/connectedAccounts',
+                    f'{COMPOSIO_API_BASE}/api/v1/connectedAccounts',
                     headers={'x-api-key': decrypted_api_key, 'Content-Type': 'application/json'},
                     timeout=aiohttp.ClientTimeout(total=10)
                 ) as response:
@@ -731,9 +895,9 @@ class PerUserComposioManager:
             if actual_api_key:
                 import aiohttp
                 
-                async with aiohttp.ClientSession() as session:
+                async with self.user_manager._http_session() as session:
                     async with session.get(
-                        'https://backend.composio.dev/api/v1/connectedAccounts',
+                        f'{COMPOSIO_API_BASE}/api/v1/connectedAccounts',
                         headers={'x-api-key': actual_api_key, 'Content-Type': 'application/json'},
                         timeout=aiohttp.ClientTimeout(total=10)
                     ) as response:
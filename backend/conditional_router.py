@@ -0,0 +1,148 @@
+"""
+Compiled Conditional Routers
+
+A conditional node's rules are compiled once per workflow plan: JSONPath
+expressions are parsed (simple dotted paths become plain key lookups),
+numeric comparands are coerced up front, and each condition is bound to the
+edge leaving its handle. Routing an input is then a few dict lookups and
+comparisons instead of re-parsing every rule and scanning the edge list.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonpath_ng import parse
+
+# $.a.b.c - resolvable by walking dict keys
+_SIMPLE_PATH = re.compile(r"^\$(\.[A-Za-z_][A-Za-z0-9_]*)+$")
+_RESERVED_WORDS = {"where", "wherenot"}
+_NO_MATCH = object()
+
+
+@lru_cache(maxsize=1024)
+def _compile_path(jsonpath: str) -> Tuple[Optional[Tuple[str, ...]], Any]:
+    """(keys, None) for simple dotted paths, (None, parsed expression) otherwise"""
+    jsonpath = jsonpath.strip()
+    if _SIMPLE_PATH.match(jsonpath):
+        keys = tuple(jsonpath[2:].split("."))
+        # Reserved words get jsonpath_ng's own handling
+        if not _RESERVED_WORDS.intersection(keys):
+            return keys, None
+    return None, parse(jsonpath)
+
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class CompiledRule:
+    """A condition rule with its path parsed and comparand pre-coerced"""
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.jsonpath = rule['jsonpath']
+        self.operator = rule['operator']
+        self.value = rule['value']
+        self.number = _to_number(self.value)
+        self.keys, self.expression = _compile_path(self.jsonpath)
+
+    def extract(self, data: Any) -> Any:
+        """First value at the rule's path, or _NO_MATCH"""
+        if self.keys is not None:
+            for key in self.keys:
+                if not isinstance(data, dict) or key not in data:
+                    return _NO_MATCH
+                data = data[key]
+            return data
+        match = self.expression.find(data)
+        return match[0].value if match else _NO_MATCH
+
+    def matches(self, data: Any) -> bool:
+        """Evaluate the rule; unknown operators and missing values never match"""
+        extracted_value = self.extract(data)
+        if extracted_value is _NO_MATCH:
+            return False
+
+        operator = self.operator
+        if operator == 'equals':
+            return str(extracted_value) == self.value
+        if operator == 'contains':
+            return self.value in str(extracted_value)
+        if operator == 'not_equals':
+            return str(extracted_value) != self.value
+        if operator in ('greater_than', 'less_than'):
+            # Compare as numbers when both sides are numeric, otherwise as strings
+            number = _to_number(extracted_value) if self.number is not None else None
+            if number is not None:
+                left, right = number, self.number
+            else:
+                left, right = str(extracted_value), self.value
+            return left > right if operator == 'greater_than' else left < right
+        return False
+
+
+@dataclass
+class ConditionalRouter:
+    """Ordered (rule, edge) branches of one conditional node plus its default edge"""
+    node_id: str
+    branches: List[Tuple[CompiledRule, Dict[str, Any]]]
+    default_edge: Optional[Dict[str, Any]] = None
+
+    def route(self, data: Any) -> Optional[Dict[str, Any]]:
+        """Edge of the first matching condition, else the default edge (None when nothing applies)"""
+        for rule, edge in self.branches:
+            try:
+                if rule.matches(data):
+                    return edge
+            except Exception as e:
+                print(f"Error evaluating condition: {e}")
+        return self.default_edge
+
+
+def compile_router(node: Dict[str, Any], edges_by_handle: Dict[Any, Dict[str, Any]]) -> ConditionalRouter:
+    """Compile a conditional node's rules against its outgoing edges (keyed by sourceHandle)"""
+    branches = []
+    default_edge = None
+    has_default = False
+    for condition in node.get('data', {}).get('conditions', []):
+        edge = edges_by_handle.get(condition.get('id'))
+        if condition.get('is_default') and not has_default:
+            # Only the first default condition counts, connected or not
+            has_default = True
+            default_edge = edge
+        # Conditions without a rule or a connected handle can never be taken
+        if 'rule' not in condition or edge is None:
+            continue
+        try:
+            rule = CompiledRule(condition['rule'])
+        except Exception as e:
+            print(f"Error compiling condition {condition.get('id')} of {node.get('id')}: {e}")
+            continue
+        branches.append((rule, edge))
+    return ConditionalRouter(node_id=node.get('id'), branches=branches, default_edge=default_edge)
+
+
+def router_input(node_input: Any, json_cache: Optional[Dict[int, Tuple[Any, Any]]] = None) -> Any:
+    """Dict view of a router's input; parsed JSON is shared through json_cache by chained routers"""
+    if isinstance(node_input, dict):
+        return node_input
+    if not isinstance(node_input, str):
+        return {}
+    if json_cache is not None:
+        cached = json_cache.get(id(node_input))
+        # The cache keeps the string alive, so an id match is the same object
+        if cached is not None and cached[0] is node_input:
+            return cached[1]
+    try:
+        parsed = json.loads(node_input)
+    except json.JSONDecodeError:
+        # Plain text can still be matched as $.result
+        parsed = {"result": node_input}
+    if json_cache is not None:
+        json_cache[id(node_input)] = (node_input, parsed)
+    return parsed
@@ -7,11 +7,28 @@ This module extends the existing evaluation system to provide:
 3. Comprehensive workflow performance analysis
 
 IMPORTANT: This enhances existing functionality without breaking it.
+
+All LLM-as-judge calls of a run are independent, so the async functions
+(aevaluate_*) fan them out through a JudgeEngine: litellm.acompletion calls
+under a concurrency limit (EVALUATION_JUDGE_CONCURRENCY) and a per-run
+deadline (EVALUATION_DEADLINE_SECONDS). In "batched" judge mode all criteria
+for one output are scored by a single structured call, falling back to one
+call per criterion when the response can't be parsed. The synchronous
+functions keep their signatures for scripts and worker threads.
 """
 
+import asyncio
+import os
+import time
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from lightweight_evaluation import evaluate_workflow_output, EvaluationResult
+from lightweight_evaluation import (
+    aevaluate_workflow_output,
+    aevaluate_workflow_output_batch,
+    EvaluationResult,
+    JUDGE_MODE_BATCHED,
+    JUDGE_MODES,
+)
 
 
 @dataclass
@@ -59,6 +76,140 @@ class WorkflowEvaluationResult:
     efficiency_score: float
 
 
+class JudgeEngine:
+    """Runs LLM-as-judge calls concurrently under a concurrency limit and a per-run deadline"""
+
+    def __init__(self, model: str = "gpt-4o-mini", concurrency: int = None, deadline: float = None,
+                 use_cache: bool = True, judge_mode: str = None):
+        self.model = model
+        self.use_cache = use_cache
+        self.judge_mode = judge_mode or os.getenv("EVALUATION_JUDGE_MODE", "per_criterion")
+        if self.judge_mode not in JUDGE_MODES:
+            raise ValueError(f"Unknown judge mode '{self.judge_mode}' (expected one of {', '.join(JUDGE_MODES)})")
+        self.concurrency = max(1, concurrency if concurrency is not None else int(os.getenv("EVALUATION_JUDGE_CONCURRENCY", "8")))
+        self.deadline = deadline if deadline is not None else float(os.getenv("EVALUATION_DEADLINE_SECONDS", "120"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._deadline_at = time.monotonic() + self.deadline
+        self.calls = 0
+        self.batch_calls = 0
+        self.batch_fallbacks = 0
+        self.timed_out = 0
+
+    async def _judge(self, workflow_output: str, criteria: str, points: int) -> EvaluationResult:
+        async with self._semaphore:
+            self.calls += 1
+            return await aevaluate_workflow_output(
+                workflow_output=workflow_output,
+                criteria=criteria,
+                points=points,
+                model=self.model,
+                use_cache=self.use_cache
+            )
+
+    async def _judge_batch(self, workflow_output: str, criteria_list: List[Dict[str, Any]]) -> Optional[List[EvaluationResult]]:
+        async with self._semaphore:
+            self.batch_calls += 1
+            return await aevaluate_workflow_output_batch(
+                workflow_output=workflow_output,
+                criteria_list=criteria_list,
+                model=self.model,
+                use_cache=self.use_cache,
+                fallback=False
+            )
+
+    def _deadline_result(self, criteria: str, points: int) -> EvaluationResult:
+        self.timed_out += 1
+        return EvaluationResult(
+            passed=False,
+            reason=f"Evaluation deadline of {self.deadline:.0f}s exceeded",
+            criteria=criteria,
+            points=points
+        )
+
+    async def _before_deadline(self, coroutine):
+        """Await a judgment within the run's deadline (raises asyncio.TimeoutError)"""
+        remaining = self._deadline_at - time.monotonic()
+        if remaining <= 0:
+            coroutine.close()
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(coroutine, remaining)
+
+    async def judge(self, workflow_output: str, criteria: str, points: int) -> EvaluationResult:
+        """Judge one criterion; judgments still queued or running at the deadline fail"""
+        try:
+            return await self._before_deadline(self._judge(workflow_output, criteria, points))
+        except asyncio.TimeoutError:
+            return self._deadline_result(criteria, points)
+
+    async def judge_all(self, workflow_output: str, criteria_list: List[Dict[str, Any]]) -> List[EvaluationResult]:
+        """Judge several criteria against the same output - in one call when batched, else concurrently"""
+        if self.judge_mode == JUDGE_MODE_BATCHED and len(criteria_list) > 1:
+            try:
+                results = await self._before_deadline(self._judge_batch(workflow_output, criteria_list))
+            except asyncio.TimeoutError:
+                return [self._deadline_result(c["criteria"], c["points"]) for c in criteria_list]
+            if results is not None:
+                return results
+            # Unparseable batched verdict - judge each criterion on its own
+            self.batch_fallbacks += 1
+        return list(await asyncio.gather(*(
+            self.judge(workflow_output, criterion["criteria"], criterion["points"]) for criterion in criteria_list
+        )))
+
+
+def _run_sync(coroutine):
+    """Run an evaluation coroutine from synchronous code (not from inside an event loop)"""
+    return asyncio.run(coroutine)
+
+
+def _pending_step(span: Dict[str, Any]) -> StepEvaluationResult:
+    """Step result with everything but its judgments, which only need the span"""
+    attributes = span.get("attributes", {})
+    return StepEvaluationResult(
+        # Extract step information - support both old and new span formats
+        step_name=attributes.get("node.name") or attributes.get("workflow_node", "Unknown Step"),
+        node_id=attributes.get("node.id") or attributes.get("workflow_node_id", "unknown"),
+        # Get input/output from span events or attributes
+        step_input=_extract_step_input(span),
+        step_output=_extract_step_output(span),
+        evaluation_results=[],
+        step_score=0.0,
+        duration_ms=_extract_duration(span),
+        cost=_extract_cost(span)
+    )
+
+
+def _score_step(step: StepEvaluationResult, step_criteria: List[Dict[str, Any]], evaluation_results: List[EvaluationResult]):
+    step.evaluation_results = evaluation_results
+    total_points = sum(c["points"] for c in step_criteria)
+    earned_points = sum(r.points for r in evaluation_results if r.passed)
+    step.step_score = earned_points / total_points if total_points > 0 else 0
+
+
+async def aevaluate_workflow_step(
+    span: Dict[str, Any],
+    step_criteria: List[Dict[str, Any]],
+    model: str = "gpt-4o-mini",
+    engine: Optional[JudgeEngine] = None
+) -> StepEvaluationResult:
+    """
+    Evaluate an individual workflow step using LLM as judge, all criteria concurrently
+    
+    Args:
+        span: Trace span representing a workflow step
+        step_criteria: Evaluation criteria specific to this step type
+        model: LLM model to use for evaluation
+        engine: Shared judge engine (a run-local one is created if omitted)
+        
+    Returns:
+        StepEvaluationResult with detailed evaluation
+    """
+    engine = engine or JudgeEngine(model)
+    step = _pending_step(span)
+    _score_step(step, step_criteria, await engine.judge_all(step.step_output, step_criteria))
+    return step
+
+
 def evaluate_workflow_step(
     span: Dict[str, Any],
     step_criteria: List[Dict[str, Any]],
@@ -75,58 +226,58 @@ def evaluate_workflow_step(
     Returns:
         StepEvaluationResult with detailed evaluation
     """
-    attributes = span.get("attributes", {})
-    
-    # Extract step information - support both old and new span formats
-    step_name = attributes.get("node.name") or attributes.get("workflow_node", "Unknown Step")
-    node_id = attributes.get("node.id") or attributes.get("workflow_node_id", "unknown")
-    
-    # Get input/output from span events or attributes
-    step_input = _extract_step_input(span)
-    step_output = _extract_step_output(span) 
-    
-    # Run evaluation for each criterion
-    evaluation_results = []
-    for criterion in step_criteria:
-        result = evaluate_workflow_output(
-            workflow_output=step_output,
-            criteria=criterion["criteria"],
-            points=criterion["points"],
-            model=model
-        )
-        evaluation_results.append(result)
-    
-    # Calculate step score
-    total_points = sum(c["points"] for c in step_criteria)
-    earned_points = sum(r.points for r in evaluation_results if r.passed)
-    step_score = earned_points / total_points if total_points > 0 else 0
+    return _run_sync(aevaluate_workflow_step(span, step_criteria, model))
+
+
+async def _judge_transition(current_step: StepEvaluationResult, next_step: StepEvaluationResult,
+                            engine: JudgeEngine) -> Dict[str, Any]:
+    # Evaluate transition coherence
+    coherence_criterion = f"""
+        Evaluate if the output from '{current_step.step_name}' provides appropriate 
+        input for '{next_step.step_name}'. The workflow should flow logically.
+        """
     
-    # Extract performance metrics
-    duration_ms = _extract_duration(span)
-    cost = _extract_cost(span)
+    # Evaluate information preservation
+    preservation_criterion = f"""
+        Evaluate if important information from '{current_step.step_name}' output 
+        is preserved and utilized in '{next_step.step_name}'. No critical data should be lost.
+        """
     
-    return StepEvaluationResult(
-        step_name=step_name,
-        node_id=node_id,
-        step_input=step_input,
-        step_output=step_output,
-        evaluation_results=evaluation_results,
-        step_score=step_score,
-        duration_ms=duration_ms,
-        cost=cost
+    coherence_result, preservation_result = await asyncio.gather(
+        engine.judge(
+            f"Step 1 Output: {current_step.step_output}\nStep 2 Input: {next_step.step_input}",
+            coherence_criterion,
+            1
+        ),
+        engine.judge(
+            f"Previous: {current_step.step_output}\nCurrent: {next_step.step_output}",
+            preservation_criterion,
+            1
+        )
     )
+    
+    return {
+        "from_step": current_step.step_name,
+        "to_step": next_step.step_name,
+        "coherence_score": 1.0 if coherence_result.passed else 0.0,
+        "preservation_score": 1.0 if preservation_result.passed else 0.0,
+        "coherence_reason": coherence_result.reason,
+        "preservation_reason": preservation_result.reason
+    }
 
 
-def evaluate_workflow_flow(
+async def aevaluate_workflow_flow(
     step_evaluations: List[StepEvaluationResult],
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    engine: Optional[JudgeEngine] = None
 ) -> FlowEvaluationResult:
     """
-    Evaluate how well workflow steps connect and flow together
+    Evaluate how well workflow steps connect and flow together, all transitions concurrently
     
     Args:
-        step_evaluations: Results from individual step evaluations
+        step_evaluations: Steps to evaluate (only names, inputs and outputs are used)
         model: LLM model to use for evaluation
+        engine: Shared judge engine (a run-local one is created if omitted)
         
     Returns:
         FlowEvaluationResult with flow analysis
@@ -139,53 +290,15 @@ def evaluate_workflow_flow(
             transition_quality=[]
         )
     
-    transition_quality = []
-    coherence_scores = []
-    preservation_scores = []
+    engine = engine or JudgeEngine(model)
     
     # Evaluate each step transition
-    for i in range(len(step_evaluations) - 1):
-        current_step = step_evaluations[i]
-        next_step = step_evaluations[i + 1]
-        
-        # Evaluate transition coherence
-        coherence_criterion = f"""
-        Evaluate if the output from '{current_step.step_name}' provides appropriate 
-        input for '{next_step.step_name}'. The workflow should flow logically.
-        """
-        
-        coherence_result = evaluate_workflow_output(
-            workflow_output=f"Step 1 Output: {current_step.step_output}\nStep 2 Input: {next_step.step_input}",
-            criteria=coherence_criterion,
-            points=1,
-            model=model
-        )
-        
-        # Evaluate information preservation
-        preservation_criterion = f"""
-        Evaluate if important information from '{current_step.step_name}' output 
-        is preserved and utilized in '{next_step.step_name}'. No critical data should be lost.
-        """
-        
-        preservation_result = evaluate_workflow_output(
-            workflow_output=f"Previous: {current_step.step_output}\nCurrent: {next_step.step_output}",
-            criteria=preservation_criterion,
-            points=1,
-            model=model
-        )
-        
-        transition = {
-            "from_step": current_step.step_name,
-            "to_step": next_step.step_name,
-            "coherence_score": 1.0 if coherence_result.passed else 0.0,
-            "preservation_score": 1.0 if preservation_result.passed else 0.0,
-            "coherence_reason": coherence_result.reason,
-            "preservation_reason": preservation_result.reason
-        }
-        
-        transition_quality.append(transition)
-        coherence_scores.append(transition["coherence_score"])
-        preservation_scores.append(transition["preservation_score"])
+    transition_quality = list(await asyncio.gather(*(
+        _judge_transition(step_evaluations[i], step_evaluations[i + 1], engine)
+        for i in range(len(step_evaluations) - 1)
+    )))
+    coherence_scores = [t["coherence_score"] for t in transition_quality]
+    preservation_scores = [t["preservation_score"] for t in transition_quality]
     
     # Calculate overall flow metrics
     flow_coherence = sum(coherence_scores) / len(coherence_scores) if coherence_scores else 1.0
@@ -202,37 +315,97 @@ def evaluate_workflow_flow(
     )
 
 
-def evaluate_end_to_end_workflow(
+def evaluate_workflow_flow(
+    step_evaluations: List[StepEvaluationResult],
+    model: str = "gpt-4o-mini"
+) -> FlowEvaluationResult:
+    """
+    Evaluate how well workflow steps connect and flow together
+    
+    Args:
+        step_evaluations: Results from individual step evaluations
+        model: LLM model to use for evaluation
+        
+    Returns:
+        FlowEvaluationResult with flow analysis
+    """
+    return _run_sync(aevaluate_workflow_flow(step_evaluations, model))
+
+
+def _criteria_for_steps(spans: List[Dict[str, Any]], step_criteria: Dict[str, Any]) -> List[tuple]:
+    """(span, criteria) for every Node span that has criteria for its type or name"""
+    planned = []
+    for span in spans:
+        # Filter for Node spans only
+        span_name = span.get("name", "")
+        if not span_name.startswith("Node:"):
+            continue
+            
+        # Get criteria for this step type
+        attributes = span.get("attributes", {})
+        step_type = attributes.get("node.type") or attributes.get("workflow_node", "generic")
+        node_name = attributes.get("node.name") or attributes.get("workflow_node", "")
+        
+        # Try to match criteria by node type or name
+        criteria_for_step = (
+            step_criteria.get(step_type, []) or 
+            step_criteria.get(node_name, []) or
+            step_criteria.get("generic", [])
+        )
+        
+        if criteria_for_step:
+            planned.append((span, criteria_for_step))
+    return planned
+
+
+async def aevaluate_end_to_end_workflow(
     execution_id: str,
     trace_data: Dict[str, Any],
     evaluation_criteria: Dict[str, Any],
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    concurrency: int = None,
+    deadline: float = None,
+    use_cache: bool = True,
+    judge_mode: str = None
 ) -> WorkflowEvaluationResult:
     """
     Perform comprehensive end-to-end workflow evaluation
     
+    Final-output, step and transition judgments only depend on the trace, so
+    they all run at once (bounded by the engine's concurrency and deadline).
+    
     Args:
         execution_id: ID of the workflow execution
         trace_data: Complete trace data with spans
         evaluation_criteria: Evaluation criteria for different aspects
         model: LLM model to use for evaluation
+        concurrency: Maximum judge calls in flight (EVALUATION_JUDGE_CONCURRENCY)
+        deadline: Seconds for the whole run (EVALUATION_DEADLINE_SECONDS)
+        use_cache: Reuse cached verdicts for unchanged outputs (EVALUATION_JUDGE_CACHE)
+        judge_mode: "per_criterion" or "batched" (EVALUATION_JUDGE_MODE)
         
     Returns:
         WorkflowEvaluationResult with comprehensive analysis
     """
-    # 1. EXISTING: Evaluate final output (enhanced)
+    engine = JudgeEngine(model, concurrency, deadline, use_cache, judge_mode)
+    
     final_output = trace_data.get("final_output", "")
     final_criteria = evaluation_criteria.get("final_output_criteria", [])
     
-    final_evaluation_results = []
-    for criterion in final_criteria:
-        result = evaluate_workflow_output(
-            workflow_output=final_output,
-            criteria=criterion["criteria"],
-            points=criterion["points"],
-            model=model
-        )
-        final_evaluation_results.append(result)
+    planned_steps = _criteria_for_steps(trace_data.get("spans", []), evaluation_criteria.get("step_criteria", {}))
+    step_evaluations = [_pending_step(span) for span, _ in planned_steps]
+    
+    # 1-3. Final output, individual steps and flow, judged concurrently
+    final_evaluation_results, step_results, flow_evaluation = await asyncio.gather(
+        engine.judge_all(final_output, final_criteria),
+        asyncio.gather(*(
+            engine.judge_all(step.step_output, criteria)
+            for step, (_, criteria) in zip(step_evaluations, planned_steps)
+        )),
+        aevaluate_workflow_flow(step_evaluations, model, engine)
+    )
+    for step, (_, criteria), results in zip(step_evaluations, planned_steps, step_results):
+        _score_step(step, criteria, results)
     
     # Calculate final output score
     final_total_points = sum(c["points"] for c in final_criteria)
@@ -254,36 +427,6 @@ def evaluate_end_to_end_workflow(
         ]
     }
     
-    # 2. NEW: Evaluate individual steps
-    spans = trace_data.get("spans", [])
-    step_criteria = evaluation_criteria.get("step_criteria", {})
-    
-    step_evaluations = []
-    for span in spans:
-        # Filter for Node spans only
-        span_name = span.get("name", "")
-        if not span_name.startswith("Node:"):
-            continue
-            
-        # Get criteria for this step type
-        attributes = span.get("attributes", {})
-        step_type = attributes.get("node.type") or attributes.get("workflow_node", "generic")
-        node_name = attributes.get("node.name") or attributes.get("workflow_node", "")
-        
-        # Try to match criteria by node type or name
-        criteria_for_step = (
-            step_criteria.get(step_type, []) or 
-            step_criteria.get(node_name, []) or
-            step_criteria.get("generic", [])
-        )
-        
-        if criteria_for_step:
-            step_eval = evaluate_workflow_step(span, criteria_for_step, model)
-            step_evaluations.append(step_eval)
-    
-    # 3. NEW: Evaluate workflow flow
-    flow_evaluation = evaluate_workflow_flow(step_evaluations, model)
-    
     # 4. Calculate comprehensive scores
     step_scores = [s.step_score for s in step_evaluations]
     average_step_score = sum(step_scores) / len(step_scores) if step_scores else 0
@@ -297,6 +440,8 @@ def evaluate_end_to_end_workflow(
     
     # 5. Identify bottlenecks
     bottleneck_analysis = _identify_bottlenecks(step_evaluations, flow_evaluation)
+    if engine.timed_out:
+        bottleneck_analysis.append(f"{engine.timed_out} judgments missed the {engine.deadline:.0f}s evaluation deadline")
     
     # 6. Calculate performance metrics
     total_duration = sum(s.duration_ms for s in step_evaluations)
@@ -317,6 +462,27 @@ def evaluate_end_to_end_workflow(
     )
 
 
+def evaluate_end_to_end_workflow(
+    execution_id: str,
+    trace_data: Dict[str, Any],
+    evaluation_criteria: Dict[str, Any],
+    model: str = "gpt-4o-mini"
+) -> WorkflowEvaluationResult:
+    """
+    Perform comprehensive end-to-end workflow evaluation
+    
+    Args:
+        execution_id: ID of the workflow execution
+        trace_data: Complete trace data with spans
+        evaluation_criteria: Evaluation criteria for different aspects
+        model: LLM model to use for evaluation
+        
+    Returns:
+        WorkflowEvaluationResult with comprehensive analysis
+    """
+    return _run_sync(aevaluate_end_to_end_workflow(execution_id, trace_data, evaluation_criteria, model))
+
+
 # Helper functions
 def _extract_step_input(span: Dict[str, Any]) -> str:
     """Extract input for this step from span data"""
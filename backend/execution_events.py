@@ -0,0 +1,297 @@
+"""
+Execution Event Hub
+
+In-process pub/sub for execution events (state deltas, node paths, input
+requests). Any number of subscribers can watch an execution; each gets its
+own bounded queue, so one slow viewer never holds up the run or the other
+viewers. Events carry a per-execution sequence number and the last events
+are kept in a bounded replay buffer, so a reconnecting client resumes from
+the last sequence it saw instead of missing everything in between. Streamed
+agent output deltas are numerous, so they get a replay buffer of their own
+and never push state events out of the main one.
+
+Hubs publish through a pluggable EventBroker. The default LocalBroker
+delivers within the process; several hubs attached to one broker behave
+like several backend workers sharing a message bus.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"    # keep the newest events; the subscriber sees a sequence gap
+DROP_NEWEST = "drop_newest"    # keep what is queued; new events are lost to this subscriber
+DISCONNECT = "disconnect"      # close the subscription; the client reconnects and replays
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+OUTPUT_DELTA_EVENT = "node_output_delta"  # streamed agent text, buffered apart from state events
+
+
+class SubscriptionClosed(Exception):
+    """Raised when reading from a closed, drained subscription"""
+
+
+class Subscription:
+    """One subscriber's bounded view of an execution's event stream"""
+
+    def __init__(self, hub: "ExecutionEventHub", execution_id: str, max_queue: int, policy: str):
+        self.hub = hub
+        self.execution_id = execution_id
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.replay_complete = True   # False when requested events had already left the replay buffer
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.dropped = 0
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+
+    def _offer(self, event: Dict[str, Any]):
+        if self.closed:
+            return
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            self.hub.dropped += 1
+            if self.policy == DISCONNECT:
+                self.close("slow_consumer")
+                self.hub.slow_disconnects += 1
+                return
+            if self.policy == DROP_NEWEST:
+                return
+            self._queue.popleft()
+        self._queue.append(event)
+        self._ready.set()
+
+    async def next_event(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within the timeout"""
+        while not self._queue:
+            if self.closed:
+                raise SubscriptionClosed(self.close_reason)
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        try:
+            return await self.next_event()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    def close(self, reason: str = "closed"):
+        """Stop receiving events; queued events can still be drained"""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self._ready.set()
+        self.hub._forget(self)
+
+
+class _ExecutionStream:
+    def __init__(self, replay_size: int, output_replay_size: int):
+        self.last_seq = 0        # latest sequence delivered to this hub
+        self.published_seq = 0   # latest sequence assigned by this hub (it may run ahead of delivery)
+        self.evicted_seq = 0     # latest state event sequence pushed out of the replay buffer
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=replay_size)
+        self.output_buffer: Deque[Dict[str, Any]] = deque(maxlen=output_replay_size)
+        self.subscribers: Set[Subscription] = set()
+        self.updated_at = time.time()
+
+    def remember(self, event: Dict[str, Any]):
+        if event.get("type") == OUTPUT_DELTA_EVENT:
+            self.output_buffer.append(event)
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.evicted_seq = self.buffer[0]["seq"]
+        self.buffer.append(event)
+
+    def replay(self, after_seq: int):
+        """Buffered events newer than after_seq, in sequence order"""
+        return (
+            event for event in heapq.merge(self.buffer, self.output_buffer, key=lambda e: e["seq"])
+            if event["seq"] > after_seq
+        )
+
+
+class EventBroker(ABC):
+    """Transport that carries events between hubs (one hub per backend worker)"""
+
+    @abstractmethod
+    def attach(self, hub: "ExecutionEventHub"):
+        """Start delivering published events to the hub"""
+
+    @abstractmethod
+    def detach(self, hub: "ExecutionEventHub"):
+        """Stop delivering events to the hub"""
+
+    @abstractmethod
+    def publish(self, execution_id: str, event: Dict[str, Any]):
+        """Deliver a sequenced event to every attached hub (via hub._deliver)"""
+
+
+class LocalBroker(EventBroker):
+    """In-process broker delivering to every attached hub (stand-in for an external message bus)"""
+
+    def __init__(self):
+        self._hubs: List["ExecutionEventHub"] = []
+        self._lock = threading.Lock()
+
+    def attach(self, hub: "ExecutionEventHub"):
+        with self._lock:
+            if hub not in self._hubs:
+                self._hubs.append(hub)
+
+    def detach(self, hub: "ExecutionEventHub"):
+        with self._lock:
+            if hub in self._hubs:
+                self._hubs.remove(hub)
+
+    def publish(self, execution_id: str, event: Dict[str, Any]):
+        with self._lock:
+            hubs = list(self._hubs)
+        for hub in hubs:
+            hub._deliver(execution_id, event)
+
+
+class ExecutionEventHub:
+    """Per-worker fan-out of execution events with replay and slow-consumer handling"""
+
+    def __init__(self, broker: EventBroker = None, replay_size: int = None, max_queue: int = None, policy: str = None,
+                 output_replay_size: int = None):
+        self.replay_size = max(1, replay_size if replay_size is not None else int(os.getenv("EXECUTION_EVENT_REPLAY_SIZE", "256")))
+        if output_replay_size is None:
+            output_replay_size = int(os.getenv("EXECUTION_OUTPUT_REPLAY_SIZE", "256"))
+        self.output_replay_size = max(1, output_replay_size)
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("EXECUTION_EVENT_QUEUE_SIZE", "256"))
+        policy = policy or os.getenv("EXECUTION_EVENT_DROP_POLICY", DROP_OLDEST)
+        if policy not in DROP_POLICIES:
+            logger.warning(f"⚠️  Unknown EXECUTION_EVENT_DROP_POLICY '{policy}', using {DROP_OLDEST}")
+            policy = DROP_OLDEST
+        self.policy = policy
+
+        self._streams: Dict[str, _ExecutionStream] = {}
+        self.broker = broker or LocalBroker()
+        self.broker.attach(self)
+
+        self.published = 0
+        self.delivered = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+
+    def _stream(self, execution_id: str) -> _ExecutionStream:
+        stream = self._streams.get(execution_id)
+        if stream is None:
+            stream = self._streams[execution_id] = _ExecutionStream(self.replay_size, self.output_replay_size)
+        return stream
+
+    def publish(self, execution_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a message with the execution's next sequence number and broadcast it"""
+        stream = self._stream(execution_id)
+        stream.published_seq = max(stream.published_seq, stream.last_seq) + 1
+        event = {**message, "execution_id": execution_id, "seq": stream.published_seq}
+        self.published += 1
+        self.broker.publish(execution_id, event)
+        return event
+
+    def _deliver(self, execution_id: str, event: Dict[str, Any]):
+        """Broker callback: buffer the event and hand it to local subscribers"""
+        stream = self._stream(execution_id)
+        if event["seq"] <= stream.last_seq:
+            return  # duplicate delivery
+        stream.last_seq = event["seq"]
+        stream.updated_at = time.time()
+        stream.remember(event)
+        for subscription in list(stream.subscribers):
+            subscription._offer(event)
+            self.delivered += 1
+
+    def last_seq(self, execution_id: str) -> int:
+        """Sequence number of the latest event for an execution (0 if none)"""
+        stream = self._streams.get(execution_id)
+        return stream.last_seq if stream else 0
+
+    def subscribe(self, execution_id: str, after_seq: int = None, max_queue: int = None, policy: str = None) -> Subscription:
+        """Subscribe to an execution, first replaying buffered events newer than after_seq"""
+        stream = self._stream(execution_id)
+        subscription = Subscription(self, execution_id, max_queue or self.max_queue, policy or self.policy)
+        if after_seq is not None and after_seq < stream.last_seq:
+            # Lost output deltas only leave a gap in a node's streamed text, which the viewer resyncs
+            subscription.replay_complete = stream.evicted_seq <= after_seq
+            for event in stream.replay(after_seq):
+                subscription._offer(event)
+                self.replayed += 1
+        stream.subscribers.add(subscription)
+        return subscription
+
+    def _forget(self, subscription: Subscription):
+        stream = self._streams.get(subscription.execution_id)
+        if stream is not None:
+            stream.subscribers.discard(subscription)
+
+    def discard(self, execution_id: str):
+        """Drop an execution's buffer and close its subscribers"""
+        stream = self._streams.pop(execution_id, None)
+        if stream is not None:
+            for subscription in list(stream.subscribers):
+                subscription.close("execution_removed")
+
+    def sweep(self, max_idle_seconds: float) -> int:
+        """Drop buffers of executions nobody watches that saw no events for max_idle_seconds"""
+        cutoff = time.time() - max_idle_seconds
+        idle = [
+            execution_id for execution_id, stream in self._streams.items()
+            if not stream.subscribers and stream.updated_at < cutoff
+        ]
+        for execution_id in idle:
+            del self._streams[execution_id]
+        return len(idle)
+
+    def subscriber_count(self, execution_id: str = None) -> int:
+        if execution_id is not None:
+            stream = self._streams.get(execution_id)
+            return len(stream.subscribers) if stream else 0
+        return sum(len(stream.subscribers) for stream in self._streams.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Stream, subscriber and delivery metrics"""
+        return {
+            "executions": len(self._streams),
+            "subscribers": self.subscriber_count(),
+            "replay_size": self.replay_size,
+            "output_replay_size": self.output_replay_size,
+            "max_queue": self.max_queue,
+            "drop_policy": self.policy,
+            "broker": type(self.broker).__name__,
+            "published": self.published,
+            "delivered": self.delivered,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "slow_disconnects": self.slow_disconnects,
+        }
+
+
+# Global event hub instance
+_execution_event_hub: Optional[ExecutionEventHub] = None
+
+
+def get_execution_event_hub() -> ExecutionEventHub:
+    """Get or create the global execution event hub"""
+    global _execution_event_hub
+    if _execution_event_hub is None:
+        _execution_event_hub = ExecutionEventHub()
+    return _execution_event_hub
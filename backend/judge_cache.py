@@ -0,0 +1,201 @@
+"""
+LLM-Judge Verdict Cache
+
+Judging the same output against the same criterion with the same judge model
+gives (for our purposes) the same verdict, so verdicts are persisted in SQLite
+keyed by a hash of (judge model, criterion text, ground truth, output hash,
+evidence hash). Re-running an evaluation on an unchanged execution - or on a
+workflow whose output did not change - then costs no judge calls.
+
+The cache is bounded (least recently used verdicts are evicted past
+EVALUATION_JUDGE_CACHE_MAX_ENTRIES) and can be turned off with
+EVALUATION_JUDGE_CACHE=false or per call with use_cache=False. Lookups and
+writes for several criteria go through get_many/put_many, one transaction
+each; async callers run them off the event loop.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAX_SQL_PARAMS = 500  # keys per IN (...) query, well below SQLite's variable limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judge_verdicts (
+    cache_key    TEXT PRIMARY KEY,
+    model        TEXT NOT NULL,
+    passed       INTEGER NOT NULL,
+    reason       TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_judge_verdicts_used ON judge_verdicts (last_used_at);
+"""
+
+
+def _default_db_path() -> str:
+    return os.path.join(os.getcwd(), "data", "judge_cache.db")
+
+
+def _digest(text: Any) -> str:
+    return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()
+
+
+def verdict_key(model: str, criteria: str, ground_truth_output: Any = None,
+                hypothesis_final_output: Any = None, evidence: Any = None) -> str:
+    """Content address of one judgment"""
+    return _digest(json.dumps([
+        model,
+        criteria,
+        json.dumps(ground_truth_output, sort_keys=True, default=str) if ground_truth_output else None,
+        _digest(hypothesis_final_output),
+        _digest(evidence),
+    ]))
+
+
+class JudgeVerdictCache:
+    """Size-bounded persistent (passed, reason) verdicts by content address"""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.db_path = db_path or os.getenv("EVALUATION_JUDGE_CACHE_DB") or _default_db_path()
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("EVALUATION_JUDGE_CACHE_MAX_ENTRIES", "50000"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+            self._entries = self._conn.execute("SELECT COUNT(*) FROM judge_verdicts").fetchone()[0]
+        logger.info(f"⚖️  Judge verdict cache: Using {self.db_path} - {self._entries} verdicts stored")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[Tuple[bool, str]]:
+        """(passed, reason) for a cached judgment, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[bool, str]]:
+        """(passed, reason) by key for the cached judgments among keys, touching them in one transaction"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Tuple[bool, str]] = {}
+        if not keys:
+            return found
+        with self._lock:
+            for start in range(0, len(keys), _MAX_SQL_PARAMS):
+                chunk = keys[start:start + _MAX_SQL_PARAMS]
+                rows = self._conn.execute(
+                    f"SELECT cache_key, passed, reason FROM judge_verdicts WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, passed, reason in rows:
+                    found[key] = (bool(passed), reason)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE judge_verdicts SET last_used_at = ? WHERE cache_key = ?",
+                        [(now, key) for key in found]
+                    )
+        return found
+
+    def put(self, key: str, model: str, passed: bool, reason: str):
+        """Store a verdict, evicting the least recently used ones beyond max_entries"""
+        self.put_many([(key, model, passed, reason)])
+
+    def put_many(self, verdicts: List[Tuple[str, str, bool, str]]):
+        """Store (key, model, passed, reason) verdicts in one transaction, then evict beyond max_entries"""
+        if not verdicts:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                inserted = 0
+                for key, model, passed, reason in verdicts:
+                    inserted += self._conn.execute(
+                        "INSERT OR IGNORE INTO judge_verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, model, int(bool(passed)), str(reason), now, now)
+                    ).rowcount
+                self._entries += inserted
+                self.writes += inserted
+                if self.max_entries > 0 and self._entries > self.max_entries:
+                    evicted = self._conn.execute(
+                        """DELETE FROM judge_verdicts WHERE cache_key IN (
+                               SELECT cache_key FROM judge_verdicts ORDER BY last_used_at LIMIT ?)""",
+                        (self._entries - self.max_entries,)
+                    ).rowcount
+                    self._entries -= evicted
+                    self.evictions += evicted
+
+    def clear(self) -> int:
+        """Drop every cached verdict"""
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute("DELETE FROM judge_verdicts").rowcount
+            self._entries = 0
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and hit-rate metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "db_path": self.db_path,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+def is_judge_cache_enabled() -> bool:
+    """Whether judge verdicts are cached (EVALUATION_JUDGE_CACHE)"""
+    return os.getenv("EVALUATION_JUDGE_CACHE", "true").lower() == "true"
+
+
+# Global verdict cache instance; judge calls on executor threads may race to create it
+_judge_cache: Optional[JudgeVerdictCache] = None
+_judge_cache_lock = threading.Lock()
+
+
+def get_judge_cache() -> Optional[JudgeVerdictCache]:
+    """Get or create the global verdict cache; None when caching is disabled"""
+    global _judge_cache
+    if not is_judge_cache_enabled():
+        return None
+    if _judge_cache is None:
+        with _judge_cache_lock:
+            if _judge_cache is None:
+                _judge_cache = JudgeVerdictCache()
+    return _judge_cache
+
+
+def close_judge_cache():
+    """Close the global verdict cache if it was opened (called on app shutdown)"""
+    global _judge_cache
+    with _judge_cache_lock:
+        if _judge_cache is not None:
+            _judge_cache.close()
+            _judge_cache = None
@@ -2,11 +2,25 @@
 Lightweight evaluation module that provides core evaluation functionality
 without requiring heavy ML dependencies like HuggingFace datasets or evaluate.
 """
+import asyncio
 import json
+import logging
 import re
-from typing import Dict, List, Any, Optional
+import sqlite3
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from litellm import completion
+from litellm import acompletion, completion
+
+from judge_cache import JudgeVerdictCache, get_judge_cache, verdict_key
+
+logger = logging.getLogger(__name__)
+
+# Cache failures (locked or corrupt database, unwritable directory) only bypass the cache
+_CACHE_ERRORS = (sqlite3.Error, OSError)
+
+JUDGE_MODE_PER_CRITERION = "per_criterion"
+JUDGE_MODE_BATCHED = "batched"
+JUDGE_MODES = (JUDGE_MODE_PER_CRITERION, JUDGE_MODE_BATCHED)
 
 
 @dataclass
@@ -18,15 +32,13 @@ class EvaluationResult:
     points: int
 
 
-def llm_evaluate_with_criterion(
-    model: str,
+def _judge_prompt(
     criteria: str,
-    points: int,
     ground_truth_output: Optional[List[Dict[str, Any]]] = None,
     hypothesis_final_output: Optional[str] = None,
     evidence: Optional[str] = None,
-) -> EvaluationResult:
-    """Evaluate a single criterion using LLM."""
+) -> str:
+    """Prompt asking the judge model whether a criterion was met."""
     prompt = f"""
 Evaluate if the following criterion was met {"based on the provided evidence" if evidence else "in the agent's answer"}.
 
@@ -61,44 +73,351 @@ Output valid JSON with these fields only, in the format:
     "reason": "Brief explanation"
 }}
 """
+    return prompt
+
 
+def _judge_result(content: str, criteria: str, points: int) -> EvaluationResult:
+    """Parse the judge model's JSON verdict; raises ValueError unless it has a boolean "passed"."""
+    # Extract JSON from the response
+    json_match = re.search(
+        r"```(?:json)?\s*(\{.*?\})\s*```|(\{.*?\})",
+        content,
+        re.DOTALL,
+    )
+
+    if json_match:
+        json_str = next(group for group in json_match.groups() if group)
+        evaluation = json.loads(json_str)
+    else:
+        evaluation = json.loads(content)
+
+    # A verdict without a decision must not be defaulted to a (cacheable) failure
+    if not isinstance(evaluation, dict) or not isinstance(evaluation.get("passed"), bool):
+        raise ValueError("Judge response has no boolean verdict")
+
+    return EvaluationResult(
+        passed=evaluation["passed"],
+        reason=evaluation.get("reason", "No reason provided"),
+        criteria=criteria,
+        points=points
+    )
+
+
+def _judge_error(error: Exception, criteria: str, points: int) -> EvaluationResult:
+    return EvaluationResult(
+        passed=False,
+        reason=f"Failed to evaluate due to error: {str(error)}",
+        criteria=criteria,
+        points=points
+    )
+
+
+def _cache_lookup(
+    use_cache: bool,
+    model: str,
+    criteria: str,
+    points: int,
+    ground_truth_output: Optional[List[Dict[str, Any]]],
+    hypothesis_final_output: Optional[str],
+    evidence: Optional[str],
+) -> Tuple[Optional[JudgeVerdictCache], Optional[str], Optional[EvaluationResult]]:
+    """(cache, key, cached result) for a judgment; cache is None when caching is off or unavailable."""
+    try:
+        cache = get_judge_cache() if use_cache else None
+        if cache is None:
+            return None, None, None
+        key = verdict_key(model, criteria, ground_truth_output, hypothesis_final_output, evidence)
+        cached = cache.get(key)
+    except _CACHE_ERRORS as e:
+        logger.warning(f"⚠️  Judge cache lookup failed, judging without cache: {e}")
+        return None, None, None
+    if cached is None:
+        return cache, key, None
+    return cache, key, EvaluationResult(passed=cached[0], reason=cached[1], criteria=criteria, points=points)
+
+
+def _cache_store(cache: Optional[JudgeVerdictCache], key: Optional[str], model: str, result: EvaluationResult):
+    # Only fully parsed verdicts reach here - failed or unparseable judge calls are never cached
+    if cache is None:
+        return
+    try:
+        cache.put(key, model, result.passed, result.reason)
+    except _CACHE_ERRORS as e:
+        logger.warning(f"⚠️  Judge cache write failed, verdict not cached: {e}")
+
+
+async def _off_loop(func, *args):
+    """Run blocking cache I/O (SQLite reads and commits) on the default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def llm_evaluate_with_criterion(
+    model: str,
+    criteria: str,
+    points: int,
+    ground_truth_output: Optional[List[Dict[str, Any]]] = None,
+    hypothesis_final_output: Optional[str] = None,
+    evidence: Optional[str] = None,
+    use_cache: bool = True,
+) -> EvaluationResult:
+    """Evaluate a single criterion using LLM."""
+    cache, key, cached = _cache_lookup(
+        use_cache, model, criteria, points, ground_truth_output, hypothesis_final_output, evidence
+    )
+    if cached is not None:
+        return cached
+    prompt = _judge_prompt(criteria, ground_truth_output, hypothesis_final_output, evidence)
     try:
         response = completion(
             model=model,
             messages=[{"role": "user", "content": prompt}],
         )
-        content = response.choices[0].message.content
+        result = _judge_result(response.choices[0].message.content, criteria, points)
+        _cache_store(cache, key, model, result)
+        return result
+    except Exception as e:
+        return _judge_error(e, criteria, points)
+
 
-        # Extract JSON from the response
-        json_match = re.search(
-            r"```(?:json)?\s*(\{.*?\})\s*```|(\{.*?\})",
-            content,
-            re.DOTALL,
+async def allm_evaluate_with_criterion(
+    model: str,
+    criteria: str,
+    points: int,
+    ground_truth_output: Optional[List[Dict[str, Any]]] = None,
+    hypothesis_final_output: Optional[str] = None,
+    evidence: Optional[str] = None,
+    use_cache: bool = True,
+) -> EvaluationResult:
+    """Evaluate a single criterion using LLM without blocking the event loop."""
+    cache, key, cached = await _off_loop(
+        _cache_lookup, use_cache, model, criteria, points, ground_truth_output, hypothesis_final_output, evidence
+    )
+    if cached is not None:
+        return cached
+    prompt = _judge_prompt(criteria, ground_truth_output, hypothesis_final_output, evidence)
+    try:
+        response = await acompletion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
         )
+        result = _judge_result(response.choices[0].message.content, criteria, points)
+        await _off_loop(_cache_store, cache, key, model, result)
+        return result
+    except Exception as e:
+        return _judge_error(e, criteria, points)
+
 
-        if json_match:
-            json_str = next(group for group in json_match.groups() if group)
-            evaluation = json.loads(json_str)
-        else:
-            evaluation = json.loads(content)
+def _batch_judge_prompt(
+    criteria_list: List[Dict[str, Any]],
+    ground_truth_output: Optional[List[Dict[str, Any]]] = None,
+    hypothesis_final_output: Optional[str] = None,
+    evidence: Optional[str] = None,
+) -> str:
+    """Prompt asking the judge model to score several criteria against one answer."""
+    numbered = "\n".join(f"{i}. {c['criteria']}" for i, c in enumerate(criteria_list, 1))
+    prompt = f"""
+Evaluate each of the following criteria independently {"based on the provided evidence" if evidence else "against the agent's answer"}.
 
-        evaluation["criteria"] = criteria
-        evaluation["points"] = points
+Criteria:
+{numbered}
+"""
 
-        return EvaluationResult(
-            passed=evaluation.get("passed", False),
-            reason=evaluation.get("reason", "No reason provided"),
-            criteria=criteria,
-            points=points
+    if ground_truth_output:
+        prompt += f"""
+Expected output: {json.dumps(ground_truth_output)}
+"""
+    if hypothesis_final_output:
+        prompt += f"""
+Agent's answer: {hypothesis_final_output}
+"""
+
+    if evidence:
+        prompt += f"""
+Trace evidence:
+{evidence}
+"""
+
+    prompt += f"""
+
+For every criterion decide whether it was satisfied. Output valid JSON only, with
+exactly one entry per criterion, using the criterion's number as "index":
+{{
+    "results": [
+        {{"index": 1, "passed": true, "reason": "Brief explanation"}}
+    ]
+}}
+"""
+    return prompt
+
+
+def _batch_judge_results(content: str, criteria_list: List[Dict[str, Any]]) -> List[EvaluationResult]:
+    """Parse a batched verdict; raises ValueError unless every criterion got exactly one boolean verdict."""
+    # The object nests, so take everything from the first "{" to the last "}"
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("No JSON object in batched judge response")
+    verdicts = json.loads(content[start:end + 1]).get("results")
+    if not isinstance(verdicts, list):
+        raise ValueError("Batched judge response has no results list")
+
+    by_index = {}
+    for verdict in verdicts:
+        index = verdict.get("index") if isinstance(verdict, dict) else None
+        if not isinstance(index, int) or not 1 <= index <= len(criteria_list) or index in by_index:
+            raise ValueError(f"Unexpected criterion index in batched judge response: {index!r}")
+        if not isinstance(verdict.get("passed"), bool):
+            raise ValueError(f"Criterion {index} has no boolean verdict")
+        by_index[index] = verdict
+    if len(by_index) != len(criteria_list):
+        raise ValueError(f"Batched judge scored {len(by_index)} of {len(criteria_list)} criteria")
+
+    return [
+        EvaluationResult(
+            passed=by_index[i]["passed"],
+            reason=by_index[i].get("reason", "No reason provided"),
+            criteria=criterion["criteria"],
+            points=criterion["points"]
         )
+        for i, criterion in enumerate(criteria_list, 1)
+    ]
+
+
+def _batch_cache_lookup(
+    use_cache: bool,
+    model: str,
+    criteria_list: List[Dict[str, Any]],
+    ground_truth_output: Optional[List[Dict[str, Any]]],
+    hypothesis_final_output: Optional[str],
+    evidence: Optional[str],
+) -> Tuple[Optional[JudgeVerdictCache], List[Optional[str]], List[Optional[EvaluationResult]]]:
+    """(cache, keys, cached results) per criterion; verdicts are shared with per-criterion judging."""
+    keys: List[Optional[str]] = [None] * len(criteria_list)
+    results: List[Optional[EvaluationResult]] = [None] * len(criteria_list)
+    try:
+        cache = get_judge_cache() if use_cache else None
+        if cache is None:
+            return None, keys, results
+        cache_keys = [
+            verdict_key(model, criterion["criteria"], ground_truth_output, hypothesis_final_output, evidence)
+            for criterion in criteria_list
+        ]
+        cached = cache.get_many(cache_keys)
+    except _CACHE_ERRORS as e:
+        logger.warning(f"⚠️  Judge cache lookup failed, judging without cache: {e}")
+        return None, keys, results
+    keys = cache_keys
+    for i, (key, criterion) in enumerate(zip(keys, criteria_list)):
+        if key in cached:
+            passed, reason = cached[key]
+            results[i] = EvaluationResult(passed=passed, reason=reason, criteria=criterion["criteria"], points=criterion["points"])
+    return cache, keys, results
+
+
+def _batch_cache_store(cache: Optional[JudgeVerdictCache], keys: List[Optional[str]], model: str,
+                       judged: List[Tuple[int, EvaluationResult]]):
+    # One transaction for every newly judged criterion of the batch
+    if cache is None:
+        return
+    try:
+        cache.put_many([(keys[i], model, result.passed, result.reason) for i, result in judged])
+    except _CACHE_ERRORS as e:
+        logger.warning(f"⚠️  Judge cache write failed, {len(judged)} verdicts not cached: {e}")
 
+
+def llm_evaluate_criteria_batch(
+    model: str,
+    criteria_list: List[Dict[str, Any]],
+    ground_truth_output: Optional[List[Dict[str, Any]]] = None,
+    hypothesis_final_output: Optional[str] = None,
+    evidence: Optional[str] = None,
+    use_cache: bool = True,
+    fallback: bool = True,
+) -> Optional[List[EvaluationResult]]:
+    """
+    Evaluate several criteria in one LLM call.
+    If the response can't be parsed, falls back to one call per criterion
+    (or returns None when fallback is False).
+    """
+    cache, keys, results = _batch_cache_lookup(
+        use_cache, model, criteria_list, ground_truth_output, hypothesis_final_output, evidence
+    )
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    pending_criteria = [criteria_list[i] for i in pending]
+    prompt = _batch_judge_prompt(pending_criteria, ground_truth_output, hypothesis_final_output, evidence)
+    try:
+        response = completion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        judged = _batch_judge_results(response.choices[0].message.content, pending_criteria)
     except Exception as e:
-        return EvaluationResult(
-            passed=False,
-            reason=f"Failed to evaluate due to error: {str(e)}",
-            criteria=criteria,
-            points=points
+        print(f"⚠️  Batched judging of {len(pending)} criteria failed ({e})" + (", judging one by one" if fallback else ""))
+        if not fallback:
+            return None
+        judged = [
+            llm_evaluate_with_criterion(
+                model, c["criteria"], c["points"], ground_truth_output, hypothesis_final_output, evidence, use_cache
+            )
+            for c in pending_criteria
+        ]
+        cache = None  # per-criterion calls cache their own verdicts
+
+    judged = list(zip(pending, judged))
+    _batch_cache_store(cache, keys, model, judged)
+    for i, result in judged:
+        results[i] = result
+    return results
+
+
+async def allm_evaluate_criteria_batch(
+    model: str,
+    criteria_list: List[Dict[str, Any]],
+    ground_truth_output: Optional[List[Dict[str, Any]]] = None,
+    hypothesis_final_output: Optional[str] = None,
+    evidence: Optional[str] = None,
+    use_cache: bool = True,
+    fallback: bool = True,
+) -> Optional[List[EvaluationResult]]:
+    """
+    Evaluate several criteria in one LLM call without blocking the event loop.
+    If the response can't be parsed, falls back to concurrent per-criterion calls
+    (or returns None when fallback is False).
+    """
+    cache, keys, results = await _off_loop(
+        _batch_cache_lookup, use_cache, model, criteria_list, ground_truth_output, hypothesis_final_output, evidence
+    )
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    pending_criteria = [criteria_list[i] for i in pending]
+    prompt = _batch_judge_prompt(pending_criteria, ground_truth_output, hypothesis_final_output, evidence)
+    try:
+        response = await acompletion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
         )
+        judged = _batch_judge_results(response.choices[0].message.content, pending_criteria)
+    except Exception as e:
+        print(f"⚠️  Batched judging of {len(pending)} criteria failed ({e})" + (", judging one by one" if fallback else ""))
+        if not fallback:
+            return None
+        judged = await asyncio.gather(*(
+            allm_evaluate_with_criterion(
+                model, c["criteria"], c["points"], ground_truth_output, hypothesis_final_output, evidence, use_cache
+            )
+            for c in pending_criteria
+        ))
+        cache = None  # per-criterion calls cache their own verdicts
+
+    judged = list(zip(pending, judged))
+    await _off_loop(_batch_cache_store, cache, keys, model, judged)
+    for i, result in judged:
+        results[i] = result
+    return results
 
 
 def simple_text_match_evaluation(
@@ -149,7 +468,8 @@ def evaluate_workflow_output(
     workflow_output: str,
     criteria: str,
     points: int,
-    model: str = "gpt-4o-mini"
+    model: str = "gpt-4o-mini",
+    use_cache: bool = True
 ) -> EvaluationResult:
     """
     Evaluate workflow output against specific criteria using LLM.
@@ -159,5 +479,61 @@ def evaluate_workflow_output(
         model=model,
         criteria=criteria,
         points=points,
-        hypothesis_final_output=workflow_output
-    ) 
\ No newline at end of file
+        hypothesis_final_output=workflow_output,
+        use_cache=use_cache
+    ) 
+
+async def aevaluate_workflow_output(
+    workflow_output: str,
+    criteria: str,
+    points: int,
+    model: str = "gpt-4o-mini",
+    use_cache: bool = True
+) -> EvaluationResult:
+    """
+    Async variant of evaluate_workflow_output for use from the event loop.
+    """
+    return await allm_evaluate_with_criterion(
+        model=model,
+        criteria=criteria,
+        points=points,
+        hypothesis_final_output=workflow_output,
+        use_cache=use_cache
+    )
+
+
+def evaluate_workflow_output_batch(
+    workflow_output: str,
+    criteria_list: List[Dict[str, Any]],
+    model: str = "gpt-4o-mini",
+    use_cache: bool = True
+) -> List[EvaluationResult]:
+    """
+    Evaluate workflow output against several criteria in a single judge call.
+    """
+    return llm_evaluate_criteria_batch(
+        model=model,
+        criteria_list=criteria_list,
+        hypothesis_final_output=workflow_output,
+        use_cache=use_cache
+    )
+
+
+async def aevaluate_workflow_output_batch(
+    workflow_output: str,
+    criteria_list: List[Dict[str, Any]],
+    model: str = "gpt-4o-mini",
+    use_cache: bool = True,
+    fallback: bool = True
+) -> Optional[List[EvaluationResult]]:
+    """
+    Async variant of evaluate_workflow_output_batch; with fallback=False a
+    response that can't be parsed returns None instead of judging one by one.
+    """
+    return await allm_evaluate_criteria_batch(
+        model=model,
+        criteria_list=criteria_list,
+        hypothesis_final_output=workflow_output,
+        use_cache=use_cache,
+        fallback=fallback
+    )
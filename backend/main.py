@@ -69,6 +69,10 @@ import ai_workflow_refiner
 
 # Import services
 from services import WorkflowExecutor, WorkflowStore
+from agent_worker_pool import shutdown_agent_worker_pool
+from agent_pool import get_agent_instance_pool
+from model_prices import get_model_price_table
+from judge_cache import close_judge_cache
 
 
 # Initialize services
@@ -101,8 +105,26 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"❌ MCP setup failed: {e}")
     
+    # Share one pooled Composio HTTP session on the application loop
+    if COMPOSIO_AVAILABLE:
+        from composio_http_manager import user_manager as composio_user_manager
+        composio_user_manager.bind_loop(asyncio.get_running_loop())
+    
+    # Load model prices once so finalizing executions never calls LiteLLM per span
+    get_model_price_table()
+    
+    # Periodically reclaim expired executions of idle users
+    executor.start_sweeper()
+    
     yield
     print("🛑 any-agent Workflow Composer Backend shutting down...")
+    await executor.stop_sweeper()
+    if COMPOSIO_AVAILABLE:
+        await composio_user_manager.close()
+    get_agent_instance_pool().clear()
+    shutdown_agent_worker_pool()
+    workflow_store.close()
+    close_judge_cache()
 
 
 # Create FastAPI app
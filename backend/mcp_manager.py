@@ -67,6 +67,7 @@ class MCPServerManager:
         self.servers: Dict[str, MCPServerConfig] = {}
         self.active_sessions: Dict[str, Any] = {}  # server_id -> session
         self.tools_cache: Dict[str, List[MCPTool]] = {}  # server_id -> tools
+        self.tools_version = 0  # bumped whenever the exposed tool set may change
         
         # Ensure config directory exists
         os.makedirs(self.config_dir, exist_ok=True)
@@ -90,6 +91,10 @@ class MCPServerManager:
             except Exception as e:
                 logging.error(f"Failed to load MCP server configs: {e}")
     
+    def _mark_tools_changed(self):
+        """Signal the shared tool registry that MCP tools changed"""
+        self.tools_version += 1
+
     def _save_server_configs(self):
         """Save server configurations to disk"""
         config_file = os.path.join(self.config_dir, "servers.json")
@@ -135,6 +140,7 @@ class MCPServerManager:
             self.servers[server_config.id] = server_config
             
             success = await self._connect_server(server_config.id)
+            self._mark_tools_changed()
             if success:
                 server_config.status = "connected"
                 self._save_server_configs()
@@ -184,6 +190,7 @@ class MCPServerManager:
                     
                     # Update server capabilities
                     config.capabilities = [tool.name for tool in tools]
+                    self._mark_tools_changed()
                     
                     logging.info(f"Connected to MCP server {config.name} with {len(tools)} tools")
                     return True
@@ -303,6 +310,7 @@ class MCPServerManager:
             if server_id in self.servers:
                 del self.servers[server_id]
                 self._save_server_configs()
+            self._mark_tools_changed()
             
             logging.info(f"Removed MCP server: {server_id}")
             return True
@@ -373,6 +381,7 @@ class MCPServerManager:
             updated_config.status = "configured"  # Mark as configured but not connected
             self.servers[server_id] = updated_config
             self._save_server_configs()
+            self._mark_tools_changed()
             
             logging.info(f"✅ Updated MCP server '{server_id}' configuration (connection will be established when needed)")
             return True
@@ -390,6 +399,7 @@ class MCPServerManager:
             # Store the configuration
             self.servers[server_config.id] = server_config
             self._save_server_configs()
+            self._mark_tools_changed()
             
             logging.info(f"✅ Created/updated MCP server '{server_config.id}' configuration (connection will be established when needed)")
             return True
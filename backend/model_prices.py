@@ -0,0 +1,123 @@
+"""
+Model Price Table
+
+Per-token prices keyed by normalized model name, loaded once from LiteLLM's
+model cost map (at startup) instead of calling litellm.cost_per_token for
+every span. Lookups - including misses for unknown models - are memoized,
+so pricing a trace costs a dict lookup and two multiplications per model.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Rates = Tuple[float, float]  # (input cost per token, output cost per token)
+
+
+def normalize_model_name(model_name: Any) -> str:
+    return str(model_name or "").strip().lower()
+
+
+class ModelPriceTable:
+    """Memoized per-token prices by model name"""
+
+    def __init__(self, cost_map: Dict[str, Dict[str, Any]] = None):
+        self._lock = threading.Lock()
+        self._prices: Dict[str, Rates] = {}
+        self._resolved: Dict[str, Optional[Rates]] = {}
+        self.source: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.lookups = 0
+        self.misses = 0
+        if cost_map is not None:
+            self.load(cost_map, source="custom")
+
+    def load(self, cost_map: Dict[str, Dict[str, Any]], source: str) -> int:
+        """Replace the table with the priced entries of a LiteLLM-style cost map"""
+        prices = {}
+        for model_name, entry in cost_map.items():
+            if not isinstance(entry, dict):
+                continue
+            input_rate = entry.get("input_cost_per_token")
+            output_rate = entry.get("output_cost_per_token")
+            if input_rate is None and output_rate is None:
+                continue
+            prices[normalize_model_name(model_name)] = (float(input_rate or 0.0), float(output_rate or 0.0))
+        with self._lock:
+            self._prices = prices
+            self._resolved = {}
+            self.source = source
+            self.loaded_at = time.time()
+        return len(prices)
+
+    def refresh(self) -> int:
+        """Reload prices from LiteLLM's model cost map; keeps the current table if LiteLLM is unavailable"""
+        try:
+            import litellm
+            count = self.load(litellm.model_cost, source="litellm")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not load model prices from LiteLLM: {e}")
+            return len(self._prices)
+        logger.info(f"💲 Loaded prices for {count} models from LiteLLM")
+        return count
+
+    def _resolve(self, name: str) -> Optional[Rates]:
+        rates = self._prices.get(name)
+        if rates is not None:
+            return rates
+        # Provider-prefixed names ("openai/gpt-4o", "openrouter/anthropic/claude-3") fall back to shorter suffixes
+        parts = name.split("/")
+        for start in range(1, len(parts)):
+            rates = self._prices.get("/".join(parts[start:]))
+            if rates is not None:
+                return rates
+        return None
+
+    def rates(self, model_name: Any) -> Optional[Rates]:
+        """Per-token (input, output) prices for a model, or None when unknown"""
+        name = normalize_model_name(model_name)
+        self.lookups += 1
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        rates = self._resolve(name) if name else None
+        if rates is None:
+            self.misses += 1
+        self._resolved[name] = rates
+        return rates
+
+    def price(self, model_name: Any, input_tokens: int, output_tokens: int) -> Tuple[float, float]:
+        """(input_cost, output_cost); zeros for unknown models"""
+        rates = self.rates(model_name)
+        if rates is None:
+            return 0.0, 0.0
+        return input_tokens * rates[0], output_tokens * rates[1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Table size and lookup metrics"""
+        return {
+            "models": len(self._prices),
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "memoized_lookups": len(self._resolved),
+            "lookups": self.lookups,
+            "unknown_models": self.misses,
+        }
+
+
+# Global price table instance
+_model_price_table: Optional[ModelPriceTable] = None
+
+
+def get_model_price_table() -> ModelPriceTable:
+    """Get or create the global price table, loading LiteLLM's prices on first use"""
+    global _model_price_table
+    if _model_price_table is None:
+        table = ModelPriceTable()
+        table.refresh()
+        _model_price_table = table
+    return _model_price_table
@@ -30,4 +30,5 @@ class EvaluationCaseRequest(BaseModel):
     checkpoints: List[CheckpointCriteria]
     ground_truth: List[GroundTruthAnswer]
     final_output_criteria: List[CheckpointCriteria] = []
-    node_criteria: List[NodeCriteria] = []  # NEW: Node-level evaluation criteria
\ No newline at end of file
+    node_criteria: List[NodeCriteria] = []  # NEW: Node-level evaluation criteria
+    judge_mode: str = "per_criterion"  # 'per_criterion' or 'batched' (all criteria of an output in one judge call)
\ No newline at end of file
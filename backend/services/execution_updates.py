@@ -0,0 +1,114 @@
+"""
+Execution update publishing.
+
+Each running execution gets one publisher. State changes only mark it
+dirty; a single flush per coalescing window diffs the execution's public
+state against what was last published and publishes a list of JSON-patch
+style operations to the execution event hub, which numbers, buffers and
+fans them out to every viewer. Unchanged fields - in particular the large
+final result - are never resent.
+"""
+import asyncio
+import copy
+import os
+from typing import Any, Dict, List, Optional
+
+from execution_events import ExecutionEventHub
+
+
+def execution_state(execution: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-visible view of an execution record"""
+    return {
+        "status": execution.get("status", "unknown"),
+        "progress": execution.get("progress", {}),
+        "result": execution.get("result"),
+        "error": execution.get("error"),
+        "workflow_name": execution.get("workflow_name"),
+        "workflow_identity": execution.get("workflow_identity", {}),
+    }
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON-patch style operations (add/replace/remove) turning old into new; dicts are diffed per key"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_state(old[key], value, child))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path or "", "value": new}]
+
+
+class ExecutionUpdatePublisher:
+    """Coalescing, delta-encoding state publisher for one execution"""
+
+    def __init__(self, execution_id: str, hub: ExecutionEventHub, window: float = None):
+        self.execution_id = execution_id
+        self.hub = hub
+        self.window = window if window is not None else float(os.getenv("EXECUTION_UPDATE_WINDOW_MS", "50")) / 1000
+        self._published: Optional[Dict[str, Any]] = None  # state as of the hub's latest event
+        self._execution: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.updates_coalesced = 0
+
+    def mark_dirty(self, execution: Dict[str, Any]):
+        """Schedule a flush within the coalescing window"""
+        self._execution = execution
+        self._dirty = True
+        if self._flush_task is not None and not self._flush_task.done():
+            self.updates_coalesced += 1
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+        except RuntimeError:
+            # No running loop (synchronous caller): publish right away
+            self._flush_task = None
+            self.flush()
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.window)
+        self.flush()
+
+    def flush(self):
+        """Publish whatever changed since the last event"""
+        if self._execution is None or not self._dirty:
+            return
+        self._dirty = False
+        # Copy: the live record keeps changing after this event is published
+        state = copy.deepcopy(execution_state(self._execution))
+        if self._published is None:
+            self.hub.publish(self.execution_id, {"type": "status", **state})
+        else:
+            ops = diff_state(self._published, state)
+            if not ops:
+                return
+            self.hub.publish(self.execution_id, {"type": "execution_delta", "ops": ops})
+        self._published = state
+
+    def snapshot(self, execution: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Full 'status' message consistent with the hub's latest sequence number"""
+        if self._published is not None:
+            state = self._published
+        else:
+            state = execution_state(execution) if execution else {"status": "unknown"}
+        return {"type": "status", "execution_id": self.execution_id, "seq": self.hub.last_seq(self.execution_id), **state}
+
+    def close(self):
+        """Stop the pending flush"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
@@ -0,0 +1,110 @@
+"""
+Mergeable streaming quantile sketch.
+
+A DDSketch-style log-bucketed histogram: every value lands in the bucket
+ceil(log_gamma(value)), so any quantile is answered with a bounded relative
+error (1% by default) from a few hundred counters, whatever the number of
+values. Sketches with the same accuracy merge by adding bucket counts, which
+makes them safe to combine across time buckets, workflows and replicas.
+"""
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch with exact count, sum, min and max"""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0  # values <= 0 (e.g. zero-length spans)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1):
+        """Record a value"""
+        if value <= 0:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update(self, values: Iterable[float]):
+        """Record several values"""
+        for value in values:
+            self.add(value)
+
+    def _collapse(self):
+        """Fold the lowest buckets together to respect max_bins (keeps upper quantiles accurate)"""
+        indexes = sorted(self.bins)
+        keep = indexes[len(indexes) - self.max_bins + 1:]
+        folded = sum(self.bins.pop(index) for index in indexes[:len(indexes) - self.max_bins + 1])
+        self.bins[keep[0]] += folded
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's values into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0..1), or None for an empty sketch"""
+        if self.count == 0:
+            return None
+        rank = min(int(q * self.count), self.count - 1)  # nearest rank, as sorted(values)[int(q * n)]
+        if rank < self.zero_count:
+            return self.min if self.min < 0 else 0.0
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact JSON-serialisable form (for storage or shipping to another replica)"""
+        return {
+            "a": self.relative_accuracy,
+            "b": {str(index): count for index, count in self.bins.items()},
+            "z": self.zero_count,
+            "n": self.count,
+            "s": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(relative_accuracy=data.get("a", 0.01))
+        sketch.bins = {int(index): count for index, count in data.get("b", {}).items()}
+        sketch.zero_count = data.get("z", 0)
+        sketch.count = data.get("n", 0)
+        sketch.sum = data.get("s", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
@@ -8,9 +8,10 @@ import logging
 import os
 import time
 import uuid
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
-from fastapi import HTTPException, WebSocket
+from fastapi import HTTPException
 
 from models import (
     WorkflowDefinition,
@@ -20,26 +21,63 @@ from models import (
 
 # Import visual-to-anyagent translator
 from visual_to_anyagent_translator import execute_visual_workflow_with_anyagent
+from workflow_graph import GraphAnalysis, analyze_graph
+from workflow_plan import CompiledWorkflowPlan, get_workflow_plan_cache
+from trace_summary import summarize_trace
+
+from execution_events import SubscriptionClosed, get_execution_event_hub
+
+from .execution_updates import ExecutionUpdatePublisher
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_execution_id() -> str:
+    """Unique, time-sortable execution ID: "exec_" + ULID (48-bit ms timestamp, 80 random bits)"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    chars = []
+    for _ in range(26):
+        value, digit = divmod(value, 32)
+        chars.append(_CROCKFORD_BASE32[digit])
+    return "exec_" + "".join(reversed(chars))
+
+
+class ExecutionEventSink:
+    """WebSocket-shaped sink handed to the graph runner: send_json publishes to all viewers"""
+
+    def __init__(self, executor: "WorkflowExecutor", execution_id: str):
+        self.executor = executor
+        self.execution_id = execution_id
+
+    async def send_json(self, message: Dict[str, Any]):
+        self.executor.publish_execution_event(self.execution_id, message)
 
 
 class WorkflowExecutor:
     """Execute workflows using any-agent's native multi-agent orchestration"""
     
     def __init__(self, workflow_store=None):
-        # User-isolated executions: {user_id: {execution_id: execution_data}}
-        self.user_executions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # User-isolated executions: {user_id: OrderedDict(execution_id -> execution_data)}, oldest first
+        self.user_executions: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._execution_owners: Dict[str, str] = {}  # execution_id -> user_id, for O(1) lookup by ID
         self._generating_identity = False  # Protection against infinite loops
-        self._validation_cache = {}  # Cache for validation results
-        self._last_validation_time = {}  # Track validation timing
         # New: Track pending user inputs for interactive workflows
         self.pending_inputs: Dict[str, Dict[str, Any]] = {}  # execution_id -> input_request_data
-        self.websocket_connections: Dict[str, WebSocket] = {}  # execution_id -> websocket
+        # Live updates: every viewer subscribes to the event hub; one publisher per execution feeds it
+        self.event_hub = get_execution_event_hub()
+        self._update_publishers: Dict[str, ExecutionUpdatePublisher] = {}  # execution_id -> coalescing delta publisher
         # New: Store for webhook triggers
         self.webhook_workflows: Dict[str, Dict[str, Any]] = {}
         
         # Memory management settings
         self.max_executions_per_user = 100
         self.execution_ttl_hours = 24
+        self.sweep_interval_seconds = float(os.getenv("EXECUTION_SWEEP_INTERVAL", "300"))
+        self._sweeper_task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.swept_executions = 0
+        self.swept_orphans = 0
+        self.evicted_executions = 0
         
         # Store reference to WorkflowStore
         self.workflow_store = workflow_store
@@ -52,7 +90,7 @@ class WorkflowExecutor:
     def _get_user_executions(self, user_id: str) -> Dict[str, Dict[str, Any]]:
         """Get executions for a specific user, creating if needed"""
         if user_id not in self.user_executions:
-            self.user_executions[user_id] = {}
+            self.user_executions[user_id] = OrderedDict()
         return self.user_executions[user_id]
     
     def _add_execution(self, user_id: str, execution_id: str, data: dict):
@@ -63,39 +101,45 @@ class WorkflowExecutor:
         if "created_at" not in data:
             data["created_at"] = time.time()
         
-        # Store execution
+        # Store execution as the newest entry (re-adding an ID under another user moves it)
+        previous_owner = self._execution_owners.get(execution_id)
+        if previous_owner is not None and previous_owner != user_id:
+            self.user_executions.get(previous_owner, {}).pop(execution_id, None)
         user_execs[execution_id] = data
+        user_execs.move_to_end(execution_id)
+        self._execution_owners[execution_id] = user_id
         
         # Cleanup old executions for this user
         self._cleanup_user_executions(user_id)
     
+    def _remove_execution(self, execution_id: str):
+        """Drop an execution and its per-execution state"""
+        user_id = self._execution_owners.pop(execution_id, None)
+        if user_id is not None:
+            self.user_executions.get(user_id, {}).pop(execution_id, None)
+        self.pending_inputs.pop(execution_id, None)
+        publisher = self._update_publishers.pop(execution_id, None)
+        if publisher is not None:
+            publisher.close()
+        self.event_hub.discard(execution_id)
+    
+    def _clear_user_executions(self, user_id: str) -> int:
+        """Drop every execution of a user, returning how many were removed"""
+        execution_ids = list(self.user_executions.get(user_id, {}))
+        for execution_id in execution_ids:
+            self._remove_execution(execution_id)
+        return len(execution_ids)
+    
     def _get_user_id_from_execution_id(self, execution_id: str) -> Optional[str]:
-        """Extract user_id from execution_id"""
-        if "_" in execution_id and execution_id.startswith("exec_"):
-            parts = execution_id.split("_", 2)
-            if len(parts) >= 3:
-                return parts[1]
-        # Fallback: search all users
-        for user_id, user_execs in self.user_executions.items():
-            if execution_id in user_execs:
-                return user_id
-        return None
+        """Owner of an execution"""
+        return self._execution_owners.get(execution_id)
     
     def _get_execution_by_id(self, execution_id: str) -> Optional[Dict[str, Any]]:
-        """Get an execution by ID from any user (used for backward compatibility)"""
-        # Extract user_id from execution_id if possible
-        if "_" in execution_id and execution_id.startswith("exec_"):
-            parts = execution_id.split("_", 2)
-            if len(parts) >= 3:
-                user_id = parts[1]
-                if user_id in self.user_executions:
-                    return self.user_executions[user_id].get(execution_id)
-        
-        # Fallback: search all users (for old execution IDs)
-        for user_id, user_execs in self.user_executions.items():
-            if execution_id in user_execs:
-                return user_execs[execution_id]
-        return None
+        """Get an execution by ID from any user"""
+        user_id = self._execution_owners.get(execution_id)
+        if user_id is None:
+            return None
+        return self.user_executions.get(user_id, {}).get(execution_id)
     
     def _update_execution(self, execution_id: str, updates: dict):
         """Update an execution by ID"""
@@ -105,39 +149,98 @@ class WorkflowExecutor:
             
             # Send WebSocket update if status changed or final result/error
             if any(key in updates for key in ['status', 'result', 'error', 'completed_at']):
-                if execution_id in self.websocket_connections:
-                    websocket = self.websocket_connections[execution_id]
-                    asyncio.create_task(self._send_websocket_update(websocket, execution_id, execution))
+                self._notify_execution_update(execution_id, execution)
     
-    def _cleanup_user_executions(self, user_id: str):
-        """Remove expired executions and enforce max limit per user"""
-        user_execs = self.user_executions.get(user_id, {})
-        current_time = time.time()
-        ttl_seconds = self.execution_ttl_hours * 3600
+    def _cleanup_user_executions(self, user_id: str, now: float = None) -> int:
+        """Remove expired executions and enforce max limit per user (O(1) amortized per insert)"""
+        user_execs = self.user_executions.get(user_id)
+        if not user_execs:
+            return 0
+        cutoff = (now or time.time()) - self.execution_ttl_hours * 3600
+        removed = 0
         
-        # Remove expired executions
-        expired = [
-            exec_id for exec_id, data in user_execs.items()
-            if current_time - data.get("created_at", 0) > ttl_seconds
-        ]
-        for exec_id in expired:
-            del user_execs[exec_id]
-            # Also cleanup related data
-            self.pending_inputs.pop(exec_id, None)
-            self.websocket_connections.pop(exec_id, None)
+        # Entries are kept oldest first, so expired ones sit at the front
+        while user_execs:
+            exec_id, data = next(iter(user_execs.items()))
+            if data.get("created_at", 0) >= cutoff:
+                break
+            self._remove_execution(exec_id)  # also cleans up related data
+            removed += 1
         
         # Keep only most recent N executions
-        if len(user_execs) > self.max_executions_per_user:
-            sorted_execs = sorted(
-                user_execs.items(),
-                key=lambda x: x[1].get("created_at", 0),
-                reverse=True
-            )
-            # Remove oldest executions
-            for exec_id, _ in sorted_execs[self.max_executions_per_user:]:
-                del user_execs[exec_id]
-                self.pending_inputs.pop(exec_id, None)
-                self.websocket_connections.pop(exec_id, None)
+        while len(user_execs) > self.max_executions_per_user:
+            self._remove_execution(next(iter(user_execs)))
+            self.evicted_executions += 1
+            removed += 1
+        
+        return removed
+
+    def sweep_executions(self) -> Dict[str, int]:
+        """Reclaim expired executions of all users, empty user maps and orphaned inputs/connections"""
+        now = time.time()
+        expired = 0
+        for user_id in list(self.user_executions):
+            expired += self._cleanup_user_executions(user_id, now)
+            if not self.user_executions.get(user_id):
+                self.user_executions.pop(user_id, None)
+        
+        orphans = 0
+        for registry in (self.pending_inputs, self._update_publishers):
+            for exec_id in [exec_id for exec_id in registry if exec_id not in self._execution_owners]:
+                entry = registry.pop(exec_id, None)
+                if isinstance(entry, ExecutionUpdatePublisher):
+                    entry.close()
+                orphans += 1
+        # Event buffers relayed from other workers have no local execution record
+        orphans += self.event_hub.sweep(self.execution_ttl_hours * 3600)
+        
+        self.sweeps += 1
+        self.swept_executions += expired
+        self.swept_orphans += orphans
+        return {"expired": expired, "orphans": orphans}
+
+    async def _run_sweeper(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                result = self.sweep_executions()
+                if result["expired"] or result["orphans"]:
+                    print(f"🧹 Execution sweep: {result['expired']} expired, {result['orphans']} orphaned entries removed")
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️  Execution sweep failed: {e}")
+
+    def start_sweeper(self):
+        """Start the periodic execution sweeper on the running loop (called from the app lifespan)"""
+        if self.sweep_interval_seconds > 0 and (self._sweeper_task is None or self._sweeper_task.done()):
+            self._sweeper_task = asyncio.get_running_loop().create_task(self._run_sweeper())
+
+    async def stop_sweeper(self):
+        """Cancel the periodic execution sweeper"""
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """In-memory execution counts and sweeper metrics"""
+        return {
+            "users": len(self.user_executions),
+            "executions": len(self._execution_owners),
+            "pending_inputs": len(self.pending_inputs),
+            "update_publishers": len(self._update_publishers),
+            "viewers": self.event_hub.subscriber_count(),
+            "max_executions_per_user": self.max_executions_per_user,
+            "execution_ttl_hours": self.execution_ttl_hours,
+            "sweep_interval_seconds": self.sweep_interval_seconds,
+            "sweeper_running": self._sweeper_task is not None and not self._sweeper_task.done(),
+            "sweeps": self.sweeps,
+            "swept_executions": self.swept_executions,
+            "swept_orphans": self.swept_orphans,
+            "evicted_executions": self.evicted_executions,
+        }
 
     async def register_webhook(self, workflow: WorkflowDefinition) -> Dict[str, str]:
         """Register a workflow to be triggered by a webhook."""
@@ -197,8 +300,8 @@ class WorkflowExecutor:
         if request.user_context and request.user_context.get("user_id"):
             user_id = request.user_context["user_id"]
         
-        # Generate unique execution ID across all users
-        execution_id = f"exec_{user_id}_{int(time.time() * 1000)}"
+        # Generate unique execution ID across all users (safe for bursts within one millisecond)
+        execution_id = new_execution_id()
         start_time = time.time()
         
         # Minimal debug - avoid excessive logging that might cause issues
@@ -247,14 +350,10 @@ class WorkflowExecutor:
                 for edge in request.workflow.edges
             ]
 
-            # DEBUG: Log the actual workflow structure for Designer debugging
-            print(f"🔍 DEBUG: Workflow from Designer has {len(nodes)} nodes")
-            for i, node in enumerate(nodes):
-                node_data = node.get("data", {})
-                print(f"  Node {i+1}: id={node.get('id')}, type={node.get('type')}, data.type={node_data.get('type')}, data.name={node_data.get('name')}")
-            
-            # Validate workflow structure before execution with caching
-            validation_result = self._validate_workflow_structure_cached(nodes, edges)
+            # Validate and index the workflow once per distinct definition
+            plan = self._get_workflow_plan(nodes, edges)
+            nodes, edges = plan.nodes, plan.edges
+            validation_result = plan.validation
             if not validation_result["valid"]:
                 print(f"❌ Workflow validation failed: {validation_result['error']}")
                 print(f"🔍 Nodes received: {[{'id': n.get('id'), 'type': n.get('type'), 'data_type': n.get('data', {}).get('type')} for n in nodes]}")
@@ -280,10 +379,16 @@ class WorkflowExecutor:
                 if "description" not in workflow_identity:
                     workflow_identity["description"] = "A custom workflow"
             else:
-                # Generate intelligent workflow identity
-                print(f"🏷️  Generating intelligent workflow name for {execution_id}...")
-                workflow_identity = await self._generate_workflow_identity(nodes, edges, request.input_data)
-                print(f"✨ Generated workflow: {workflow_identity['name']} ({workflow_identity['category']})")
+                # Structural identity only depends on the definition, so the plan keeps it
+                workflow_identity = plan.identity
+                if workflow_identity is None:
+                    print(f"🏷️  Generating intelligent workflow name for {execution_id}...")
+                    workflow_identity = await self._generate_workflow_identity(nodes, edges, request.input_data)
+                    print(f"✨ Generated workflow: {workflow_identity['name']} ({workflow_identity['category']})")
+                    # A placeholder from loop protection or a naming error must not stick to later runs
+                    if not workflow_identity.get("fallback"):
+                        plan.identity = workflow_identity
+                workflow_identity = dict(workflow_identity)
             
             # Update execution record with complete workflow information
             self._update_execution(execution_id, {
@@ -326,13 +431,11 @@ class WorkflowExecutor:
             # Start background execution task
             import asyncio
             asyncio.create_task(self._execute_workflow_async(
-                execution_id, nodes, edges, request.input_data, request.framework, workflow_identity, user_id
+                execution_id, nodes, edges, request.input_data, request.framework, workflow_identity, user_id, plan
             ))
             
-            # Send initial WebSocket update if connection exists
-            if execution_id in self.websocket_connections:
-                websocket = self.websocket_connections[execution_id]
-                asyncio.create_task(self._send_websocket_update(websocket, execution_id, execution_data))
+            # Send initial update to anyone already watching
+            self._notify_execution_update(execution_id, execution_data)
             
             # Return immediately with running status (workflow identity will be sent via WebSocket)
             return ExecutionResponse(
@@ -365,7 +468,8 @@ class WorkflowExecutor:
             )
 
     async def _execute_workflow_async(self, execution_id: str, nodes: List[Dict], edges: List[Dict], 
-                                     input_data: str, framework: str, workflow_identity: Dict[str, Any], user_id: str):
+                                     input_data: str, framework: str, workflow_identity: Dict[str, Any], user_id: str,
+                                     plan: Optional[CompiledWorkflowPlan] = None):
         """Background execution method with progress tracking"""
         start_time = time.time()
         
@@ -375,53 +479,20 @@ class WorkflowExecutor:
             # Update progress: Starting execution
             self._update_execution_progress(execution_id, 0, "Initializing agents...")
             
-            # Simulate some progress steps for better UX (since any-agent executes internally)
             executable_nodes = [n for n in nodes if n.get("type") in ["agent", "tool"]]
             
-            # Step 1: Mark first executable node as running
-            if executable_nodes:
-                first_node = executable_nodes[0]
-                self._update_node_status(execution_id, first_node["id"], "running")
-                self._update_execution_progress(execution_id, 10, f"Executing {first_node.get('data', {}).get('name', 'first node')}...")
-                
-                # Small delay for visual feedback
-                await asyncio.sleep(0.5)
-            
-            # Execute the actual workflow
-            self._update_execution_progress(execution_id, 25, "Running AI agents...")
-            
-            websocket = self.websocket_connections.get(execution_id)
+            # Execute the actual workflow; node status is driven by the runner's start/finish events
             workflow_result = await execute_visual_workflow_with_anyagent(
                 nodes=nodes,
                 edges=edges,
                 input_data=input_data,
                 framework=framework,
                 execution_id=execution_id,
-                websocket=websocket
+                websocket=ExecutionEventSink(self, execution_id),
+                on_node_event=self._make_node_event_handler(execution_id, executable_nodes),
+                plan=plan
             )
             
-            # Update progress through remaining nodes
-            completed_nodes = 0
-            for i, node in enumerate(executable_nodes):
-                node_id = node["id"]
-                
-                # Mark previous node as completed and current as running
-                if i > 0:
-                    prev_node_id = executable_nodes[i-1]["id"]
-                    self._update_node_status(execution_id, prev_node_id, "completed")
-                
-                if i < len(executable_nodes) - 1:  # Not the last node
-                    self._update_node_status(execution_id, node_id, "running")
-                    completed_nodes = i + 1
-                    progress = 25 + (completed_nodes / len(executable_nodes)) * 65  # 25% to 90%
-                    self._update_execution_progress(execution_id, progress, f"Processing {node.get('data', {}).get('name', node_id)}...")
-                    await asyncio.sleep(0.3)  # Brief delay for visual feedback
-            
-            # Mark last node as completed
-            if executable_nodes:
-                last_node_id = executable_nodes[-1]["id"]
-                self._update_node_status(execution_id, last_node_id, "completed")
-            
             self._update_execution_progress(execution_id, 95, "Finalizing results...")
             
             # Handle execution results
@@ -496,13 +567,30 @@ class WorkflowExecutor:
                     print("⚠️  Warning: Workflow completed but produced no output")
                     final_output = "Workflow completed successfully but produced no output."
                 
-                # Mark all remaining nodes as completed
+                # Nodes the runner never started were not on the executed path
+                execution = self._get_execution_by_id(execution_id)
                 for node in executable_nodes:
                     node_id = node["id"]
-                    self._update_node_status(execution_id, node_id, "completed")
+                    if execution and execution["progress"]["node_status"][node_id]["status"] in ["pending", "running"]:
+                        self._update_node_status(execution_id, node_id, "skipped")
                 
-                # Extract cost info for both trace and top-level storage
-                cost_info = self._extract_cost_info_from_trace(workflow_result.get("agent_trace"))
+                # One pass over the spans yields cost, performance and per-node aggregates
+                trace_summary = summarize_trace(workflow_result.get("agent_trace"), completion_time - start_time)
+                cost_info = trace_summary.cost_info
+                trace = {
+                    "final_output": final_output,
+                    "execution_pattern": workflow_result.get("execution_pattern", "unknown"),
+                    "main_agent": workflow_result.get("main_agent", "unknown"),
+                    "managed_agents": workflow_result.get("managed_agents", []),
+                    "framework_used": workflow_result.get("framework_used", framework),
+                    "agent_trace": trace_summary.agent_trace(),
+                    "execution_time": completion_time - start_time,
+                    "cost_info": cost_info,  # Keep in trace for backward compatibility
+                    "performance": trace_summary.performance,
+                    "spans": trace_summary.spans,
+                    "node_metrics": trace_summary.node_metrics,
+                    "workflow_identity": workflow_identity
+                }
                 
                 self._update_execution(execution_id, {
                     "status": "completed",
@@ -510,19 +598,7 @@ class WorkflowExecutor:
                     "completed_at": completion_time,
                     "execution_time": completion_time - start_time,
                     "cost_info": cost_info,  # Store at top level for analytics
-                    "trace": {
-                        "final_output": final_output,
-                        "execution_pattern": workflow_result.get("execution_pattern", "unknown"),
-                        "main_agent": workflow_result.get("main_agent", "unknown"),
-                        "managed_agents": workflow_result.get("managed_agents", []),
-                        "framework_used": workflow_result.get("framework_used", framework),
-                        "agent_trace": self._serialize_agent_trace(workflow_result.get("agent_trace")),
-                        "execution_time": completion_time - start_time,
-                        "cost_info": cost_info,  # Keep in trace for backward compatibility
-                        "performance": self._extract_performance_metrics(workflow_result.get("agent_trace"), completion_time - start_time),
-                        "spans": self._extract_spans_from_trace(workflow_result.get("agent_trace")),
-                        "workflow_identity": workflow_identity
-                    }
+                    "trace": trace
                 })
                 
                 self._update_execution_progress(execution_id, 100, "Completed successfully!")
@@ -548,15 +624,12 @@ class WorkflowExecutor:
                         "completed_at": completion_time,
                         "execution_time": completion_time - start_time,
                         "cost_info": cost_info,
+                        # Shares the span list and metrics with the execution record
                         "trace": {
-                            "final_output": final_output,
-                            "execution_pattern": workflow_result.get("execution_pattern", "unknown"),
-                            "main_agent": workflow_result.get("main_agent", "unknown"),
-                            "managed_agents": workflow_result.get("managed_agents", []),
-                            "framework_used": workflow_result.get("framework_used", framework),
-                            "performance": self._extract_performance_metrics(workflow_result.get("agent_trace"), completion_time - start_time),
-                            "spans": self._extract_spans_from_trace(workflow_result.get("agent_trace")),
-                            "workflow_identity": workflow_identity
+                            key: trace[key] for key in (
+                                "final_output", "execution_pattern", "main_agent", "managed_agents", "framework_used",
+                                "performance", "spans", "node_metrics", "workflow_identity"
+                            )
                         }
                     }
                     self.workflow_store.add_execution(execution_data_for_store)
@@ -637,16 +710,44 @@ class WorkflowExecutor:
                 "current_activity": activity
             })
             
-            # Send WebSocket update if connection exists
-            if execution_id in self.websocket_connections:
-                websocket = self.websocket_connections[execution_id]
-                asyncio.create_task(self._send_websocket_update(websocket, execution_id, execution))
+            # Send update to viewers
+            self._notify_execution_update(execution_id, execution)
+
+    def _make_node_event_handler(self, execution_id: str, executable_nodes: List[Dict]):
+        """Create the callback the graph runner invokes when a node starts or finishes"""
+        node_names = {n["id"]: n.get("data", {}).get("name", n["id"]) for n in executable_nodes}
+        finished_nodes = set()
+        
+        def on_node_event(node_id: str, status: str):
+            self._update_node_status(execution_id, node_id, status)
+            if node_id not in node_names:
+                return
+            
+            if status == "running":
+                activity = f"Executing {node_names[node_id]}..."
+            else:
+                finished_nodes.add(node_id)
+                activity = f"{node_names[node_id]} {status}"
+            
+            progress = 5 + (len(finished_nodes) / len(node_names)) * 90  # 5% to 95%
+            self._update_execution_progress(execution_id, progress, activity)
+        
+        return on_node_event
 
     def _update_node_status(self, execution_id: str, node_id: str, status: str):
         """Update individual node status"""
         execution = self._get_execution_by_id(execution_id)
         if execution and node_id in execution["progress"]["node_status"]:
-            execution["progress"]["node_status"][node_id]["status"] = status
+            node_status = execution["progress"]["node_status"][node_id]
+            node_status["status"] = status
+            
+            # Record real timings for the node
+            now = time.time()
+            if status == "running":
+                node_status["started_at"] = now
+            elif status in ["completed", "failed"] and "started_at" in node_status:
+                node_status["completed_at"] = now
+                node_status["duration"] = now - node_status["started_at"]
             
             # Update current step count
             completed_count = sum(1 for node_status in execution["progress"]["node_status"].values() 
@@ -654,26 +755,64 @@ class WorkflowExecutor:
             execution["progress"]["current_step"] = completed_count
             
             # Send WebSocket update for node status change
-            if execution_id in self.websocket_connections:
-                websocket = self.websocket_connections[execution_id]
-                asyncio.create_task(self._send_websocket_update(websocket, execution_id, execution))
+            self._notify_execution_update(execution_id, execution)
+    
+    def _notify_execution_update(self, execution_id: str, execution: Dict[str, Any]):
+        """Queue a coalesced delta update for everyone watching the execution"""
+        publisher = self._update_publishers.get(execution_id)
+        if publisher is None:
+            publisher = self._update_publishers[execution_id] = ExecutionUpdatePublisher(execution_id, self.event_hub)
+        publisher.mark_dirty(execution)
+    
+    def publish_execution_event(self, execution_id: str, message: Dict[str, Any]):
+        """Publish a one-off event (path taken, input request...) after any pending state delta"""
+        publisher = self._update_publishers.get(execution_id)
+        if publisher is not None:
+            publisher.flush()
+        self.event_hub.publish(execution_id, message)
+    
+    def _execution_snapshot(self, execution_id: str) -> Dict[str, Any]:
+        """Full 'status' message matching the latest published sequence number"""
+        execution = self._get_execution_by_id(execution_id)
+        publisher = self._update_publishers.get(execution_id)
+        if publisher is None:
+            publisher = ExecutionUpdatePublisher(execution_id, self.event_hub)
+        return publisher.snapshot(execution)
     
-    async def _send_websocket_update(self, websocket, execution_id: str, execution: Dict[str, Any]):
-        """Send execution update via WebSocket"""
+    async def stream_execution_events(self, execution_id: str, last_seq: Optional[int] = None, heartbeat: Optional[float] = None):
+        """
+        Events for one viewer: a full 'status' snapshot (or a replay from last_seq),
+        then live events in sequence order. Yields None after `heartbeat` idle seconds.
+        """
+        subscription = self.event_hub.subscribe(execution_id, after_seq=last_seq)
         try:
-            await websocket.send_json({
-                "type": "execution_update",
-                "execution_id": execution_id,
-                "status": execution.get("status", "unknown"),
-                "progress": execution.get("progress", {}),
-                "result": execution.get("result"),
-                "error": execution.get("error"),
-                "workflow_name": execution.get("workflow_name"),
-                "workflow_identity": execution.get("workflow_identity", {})
-            })
-        except Exception as e:
-            print(f"❌ Failed to send WebSocket update: {e}")
-
+            if last_seq is None or last_seq > self.event_hub.last_seq(execution_id) or not subscription.replay_complete:
+                snapshot = self._execution_snapshot(execution_id)
+                last_seq = snapshot["seq"]
+                yield snapshot
+            while True:
+                try:
+                    event = await subscription.next_event(heartbeat)
+                except SubscriptionClosed:
+                    return
+                if event is None:
+                    yield None
+                    continue
+                is_state_event = event.get("type") in ("status", "execution_delta")
+                if is_state_event and event["seq"] <= last_seq:
+                    continue  # already covered by the snapshot
+                if is_state_event and event["seq"] > last_seq + 1:
+                    # Deltas were dropped for this slow viewer: resend the full state instead
+                    snapshot = self._execution_snapshot(execution_id)
+                    last_seq = snapshot["seq"]
+                    yield snapshot
+                    continue
+                # One-off events (paths, input requests) are delivered even if a snapshot overtook them
+                last_seq = max(last_seq, event["seq"])
+                yield event
+        finally:
+            subscription.close()
+    
     async def _detect_user_input_request(self, execution_id: str, agent_output: str) -> Optional[Dict[str, Any]]:
         """Detect if agent is asking for user input based on output content"""
         if not agent_output:
@@ -720,30 +859,28 @@ class WorkflowExecutor:
         return None
 
     async def _send_input_request_to_frontend(self, execution_id: str, input_request: Dict[str, Any]):
-        """Send input request message to frontend via WebSocket"""
-        if execution_id in self.websocket_connections:
-            websocket = self.websocket_connections[execution_id]
-            try:
-                await websocket.send_json({
-                    "type": "input_request",
-                    "execution_id": execution_id,
-                    "status": "waiting_for_input",
-                    "input_request": input_request
-                })
-                
-                # Store the pending input request
-                self.pending_inputs[execution_id] = input_request
-                
-                # Update execution status
-                execution = self._get_execution_by_id(execution_id)
-                if execution:
-                    execution["status"] = "waiting_for_input"
-                    execution["progress"]["current_activity"] = f"Waiting for user input: {input_request['question']}"
-                    
-                print(f"📝 Sent input request to frontend for execution {execution_id}")
+        """Send input request message to every viewer of the execution"""
+        try:
+            self.publish_execution_event(execution_id, {
+                "type": "input_request",
+                "status": "waiting_for_input",
+                "input_request": input_request
+            })
+            
+            # Store the pending input request
+            self.pending_inputs[execution_id] = input_request
+            
+            # Update execution status
+            execution = self._get_execution_by_id(execution_id)
+            if execution:
+                execution["status"] = "waiting_for_input"
+                execution["progress"]["current_activity"] = f"Waiting for user input: {input_request['question']}"
+                self._notify_execution_update(execution_id, execution)
                 
-            except Exception as e:
-                print(f"❌ Failed to send input request to frontend: {e}")
+            print(f"📝 Sent input request to frontend for execution {execution_id}")
+            
+        except Exception as e:
+            print(f"❌ Failed to send input request to frontend: {e}")
                 
     async def provide_user_input(self, execution_id: str, input_text: str) -> Dict[str, Any]:
         """Process user input and resume workflow execution"""
@@ -764,18 +901,12 @@ class WorkflowExecutor:
             execution["user_input"] = input_text
             
             # Send update to frontend
-            if execution_id in self.websocket_connections:
-                websocket = self.websocket_connections[execution_id]
-                try:
-                    await websocket.send_json({
-                        "type": "input_received",
-                        "execution_id": execution_id,
-                        "status": "running",
-                        "user_input": input_text,
-                        "message": "User input received, resuming execution..."
-                    })
-                except Exception as e:
-                    print(f"❌ Failed to send input confirmation to frontend: {e}")
+            self.publish_execution_event(execution_id, {
+                "type": "input_received",
+                "status": "running",
+                "user_input": input_text,
+                "message": "User input received, resuming execution..."
+            })
             
             print(f"✅ User input received for execution {execution_id}: {input_text}")
             
@@ -787,9 +918,7 @@ class WorkflowExecutor:
             execution["progress"]["percentage"] = 100
             
             # Send WebSocket update for completion
-            if execution_id in self.websocket_connections:
-                websocket = self.websocket_connections[execution_id]
-                await self._send_websocket_update(websocket, execution_id, execution)
+            self._notify_execution_update(execution_id, execution)
             
             return {"success": True, "message": "User input processed successfully"}
             
@@ -797,264 +926,6 @@ class WorkflowExecutor:
             print(f"❌ Error processing user input for execution {execution_id}: {e}")
             return {"success": False, "error": str(e)}
     
-    def _serialize_agent_trace(self, agent_trace) -> Dict[str, Any]:
-        """Serialize any-agent's AgentTrace object for storage/transmission"""
-        if not agent_trace:
-            return {}
-        
-        try:
-            # If agent_trace is already a dictionary (from our new extraction), use it directly
-            if isinstance(agent_trace, dict):
-                return agent_trace
-            
-            # Legacy handling for raw agent trace objects
-            return {
-                "final_output": getattr(agent_trace, 'final_output', ''),
-                "spans": [self._serialize_span(span) for span in getattr(agent_trace, 'spans', [])],
-                "cost_info": self._extract_cost_info(agent_trace),
-                "metadata": {
-                    "total_spans": len(getattr(agent_trace, 'spans', [])),
-                    "has_cost_info": hasattr(agent_trace, 'get_total_cost')
-                }
-            }
-        except Exception as e:
-            return {"serialization_error": str(e)}
-    
-    def _serialize_span(self, span) -> Dict[str, Any]:
-        """Serialize individual span from any-agent trace"""
-        try:
-            return {
-                "name": getattr(span, 'name', ''),
-                "kind": str(getattr(span, 'kind', '')),
-                "start_time": getattr(span, 'start_time', 0),
-                "end_time": getattr(span, 'end_time', 0),
-                "attributes": dict(getattr(span, 'attributes', {})),
-                "status": str(getattr(span, 'status', '')),
-                "events": [str(event) for event in getattr(span, 'events', [])]
-            }
-        except Exception as e:
-            return {"span_error": str(e)}
-    
-    def _extract_cost_info(self, agent_trace) -> Dict[str, Any]:
-        """Extract cost information from any-agent trace"""
-        print(f"🔍 Legacy cost extraction: agent_trace type = {type(agent_trace)}")
-        print(f"🔍 Legacy cost extraction: has get_total_cost = {hasattr(agent_trace, 'get_total_cost')}")
-        
-        if not agent_trace:
-            print(f"⚠️  Legacy cost extraction: agent_trace is None")
-            return {}
-            
-        if not hasattr(agent_trace, 'get_total_cost'):
-            print(f"⚠️  Legacy cost extraction: agent_trace has no get_total_cost method")
-            # Try alternative methods to extract cost data
-            if hasattr(agent_trace, 'spans'):
-                print(f"🔍 Legacy cost extraction: Found spans attribute, extracting manually")
-                spans = getattr(agent_trace, 'spans', [])
-                total_cost = 0.0
-                total_tokens = 0
-                input_tokens = 0
-                output_tokens = 0
-                
-                for i, span in enumerate(spans):
-                    if hasattr(span, 'attributes'):
-                        attrs = getattr(span, 'attributes', {})
-                        input_cost = attrs.get("gen_ai.usage.input_cost", attrs.get("cost_prompt", 0.0))
-                        output_cost = attrs.get("gen_ai.usage.output_cost", attrs.get("cost_completion", 0.0))
-                        span_input_tokens = attrs.get("gen_ai.usage.input_tokens", attrs.get("llm.token_count.prompt", 0))
-                        span_output_tokens = attrs.get("gen_ai.usage.output_tokens", attrs.get("llm.token_count.completion", 0))
-                        
-                        span_cost = float(input_cost) + float(output_cost)
-                        span_tokens = int(span_input_tokens) + int(span_output_tokens)
-                        
-                        print(f"   Legacy span {i}: cost=${span_cost:.6f}, tokens={span_tokens}")
-                        
-                        total_cost += span_cost
-                        input_tokens += int(span_input_tokens)
-                        output_tokens += int(span_output_tokens)
-                        total_tokens += span_tokens
-                
-                result = {
-                    "total_cost": total_cost,
-                    "total_tokens": total_tokens,
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens
-                }
-                print(f"💰 Legacy manual extraction result: {result}")
-                return result
-            
-            return {}
-        
-        try:
-            print(f"🔍 Legacy cost extraction: Calling get_total_cost()")
-            cost_info = agent_trace.get_total_cost()
-            print(f"🔍 Legacy cost extraction: cost_info = {cost_info}, type = {type(cost_info)}")
-            
-            result = {
-                "total_cost": getattr(cost_info, 'total_cost', 0),
-                "total_tokens": getattr(cost_info, 'total_tokens', 0),
-                "input_tokens": getattr(cost_info, 'input_tokens', 0),
-                "output_tokens": getattr(cost_info, 'output_tokens', 0)
-            }
-            print(f"💰 Legacy cost extraction result: {result}")
-            return result
-        except Exception as e:
-            print(f"❌ Legacy cost extraction error: {e}")
-            return {"cost_extraction_error": str(e)}
-    
-    def _extract_cost_info_from_trace(self, agent_trace) -> Dict[str, Any]:
-        """Extract cost information from trace data using GenAI semantic convention"""
-        if not agent_trace:
-            print(f"⚠️  Cost extraction: agent_trace is None or empty")
-            return {}
-        
-        try:
-            # If it's our new dictionary structure, check for spans with cost data
-            if isinstance(agent_trace, dict):
-                spans = agent_trace.get("spans", [])
-                print(f"🔍 Cost extraction: Found {len(spans)} spans in agent_trace")
-                
-                total_cost = 0.0
-                total_tokens = 0
-                input_tokens = 0
-                output_tokens = 0
-                
-                for i, span in enumerate(spans):
-                    attributes = span.get("attributes", {})
-                    
-                    # Debug: Log all attributes to see what's actually available
-                    print(f"🔍 Span {i} all attributes: {list(attributes.keys())}")
-                    cost_related = {k: v for k, v in attributes.items() if any(word in k.lower() for word in ['cost', 'token', 'usage'])}
-                    model_name = attributes.get("llm.model_name") or attributes.get("gen_ai.request.model") or "unknown"
-                    print(f"🔍 Span {i} model_name: '{model_name}'")
-                    if cost_related:
-                        print(f"🔍 Span {i} cost/token attributes: {cost_related}")
-                    else:
-                        print(f"⚠️  Span {i} has NO cost or token attributes!")
-                    
-                    # Extract costs using GenAI semantic convention or fallback to OpenInference names
-                    input_cost = attributes.get("gen_ai.usage.input_cost", attributes.get("cost_prompt", 0.0))
-                    output_cost = attributes.get("gen_ai.usage.output_cost", attributes.get("cost_completion", 0.0))
-                    
-                    # Extract token counts using GenAI semantic convention or fallback to OpenInference names
-                    span_input_tokens = attributes.get("gen_ai.usage.input_tokens", attributes.get("llm.token_count.prompt", 0))
-                    span_output_tokens = attributes.get("gen_ai.usage.output_tokens", attributes.get("llm.token_count.completion", 0))
-                    
-                    span_total_cost = float(input_cost) + float(output_cost)
-                    span_total_tokens = int(span_input_tokens) + int(span_output_tokens)
-                    
-                    # If we have tokens but no cost, try to calculate cost using LiteLLM
-                    if span_total_tokens > 0 and span_total_cost == 0 and model_name != "unknown":
-                        try:
-                            import litellm
-                            print(f"🔧 Attempting to calculate cost for model '{model_name}' with {span_input_tokens} input + {span_output_tokens} output tokens")
-                            
-                            # Calculate cost using LiteLLM - correctly using prompt_tokens and completion_tokens
-                            cost_result = litellm.cost_per_token(
-                                model=model_name,
-                                prompt_tokens=int(span_input_tokens),
-                                completion_tokens=int(span_output_tokens)
-                            )
-                            
-                            # Handle different return formats from LiteLLM
-                            if isinstance(cost_result, tuple) and len(cost_result) == 2:
-                                input_cost_calc, output_cost_calc = cost_result
-                            else:
-                                # If it returns a single value or different format
-                                input_cost_calc = cost_result or 0.0
-                                output_cost_calc = 0.0
-                            
-                            # Handle None values
-                            input_cost_calc = input_cost_calc or 0.0
-                            output_cost_calc = output_cost_calc or 0.0
-                            calculated_cost = input_cost_calc + output_cost_calc
-                            if calculated_cost > 0:
-                                print(f"✅ Calculated cost: ${calculated_cost:.6f} (${input_cost_calc:.6f} input + ${output_cost_calc:.6f} output)")
-                                span_total_cost = calculated_cost
-                                input_cost = input_cost_calc
-                                output_cost = output_cost_calc
-                            else:
-                                print(f"⚠️  LiteLLM returned $0.00 for model '{model_name}' - model may not be supported")
-                        except Exception as e:
-                            print(f"❌ Failed to calculate cost with LiteLLM: {e}")
-                    
-                    print(f"   Span {i}: cost=${span_total_cost:.6f}, tokens={span_total_tokens}")
-                    if span_total_tokens > 0 and span_total_cost == 0:
-                        print(f"⚠️  Span {i} has tokens but ZERO cost - model '{model_name}' may not be supported by LiteLLM!")
-                    
-                    total_cost += span_total_cost
-                    input_tokens += int(span_input_tokens)
-                    output_tokens += int(span_output_tokens)
-                    total_tokens += span_total_tokens
-                
-                cost_result = {
-                    "total_cost": total_cost,
-                    "total_tokens": total_tokens,
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens
-                }
-                
-                print(f"💰 Cost extraction result: {cost_result}")
-                
-                # Always return extracted cost data if we have any spans
-                return cost_result
-                
-            # Fallback to legacy method for AgentTrace objects
-            print(f"⚠️  Cost extraction: agent_trace is not dict, using legacy extraction method")
-            return self._extract_cost_info(agent_trace)
-        except Exception as e:
-            print(f"❌ Error extracting cost info: {e}")
-            return {"cost_extraction_error": str(e)}
-    
-    def _extract_performance_metrics(self, agent_trace, execution_time: float) -> Dict[str, Any]:
-        """Extract performance metrics from trace data, including cost information"""
-        if not agent_trace:
-            return {"total_duration_ms": execution_time * 1000}
-        
-        try:
-            # If it's our new dictionary structure
-            if isinstance(agent_trace, dict):
-                performance = agent_trace.get("performance", {})
-                # Ensure we have execution time
-                performance["total_duration_ms"] = performance.get("total_duration_ms", execution_time * 1000)
-                
-                # Also include cost information in performance for analytics compatibility
-                # Extract cost info using the same method as cost_info
-                cost_info = self._extract_cost_info_from_trace(agent_trace)
-                print(f"📊 Performance metrics: Including cost_info in performance: {cost_info}")
-                if cost_info:
-                    performance["total_cost"] = cost_info.get("total_cost", 0)
-                    performance["total_tokens"] = cost_info.get("total_tokens", 0)
-                    performance["input_tokens"] = cost_info.get("input_tokens", 0)
-                    performance["output_tokens"] = cost_info.get("output_tokens", 0)
-                    print(f"📊 Performance metrics: Added cost data to performance: total_cost={performance.get('total_cost', 0)}")
-                else:
-                    print(f"⚠️  Performance metrics: cost_info is empty, no cost data added to performance")
-                
-                return performance
-            
-            # Legacy fallback
-            return {"total_duration_ms": execution_time * 1000}
-        except Exception as e:
-            return {"performance_extraction_error": str(e), "total_duration_ms": execution_time * 1000}
-    
-    def _extract_spans_from_trace(self, agent_trace) -> List[Dict[str, Any]]:
-        """Extract spans from trace data"""
-        if not agent_trace:
-            return []
-        
-        try:
-            # If it's our new dictionary structure
-            if isinstance(agent_trace, dict):
-                return agent_trace.get("spans", [])
-            
-            # Legacy fallback
-            if hasattr(agent_trace, 'spans'):
-                return [self._serialize_span(span) for span in getattr(agent_trace, 'spans', [])]
-            
-            return []
-        except Exception as e:
-            return []
-
     def _extract_node_metrics_for_workflow(self, executions: List[tuple]) -> Dict[str, Any]:
         """Extract aggregated node-level metrics for a workflow"""
         node_stats = {}
@@ -1133,23 +1004,11 @@ class WorkflowExecutor:
                 "confidence": 0.5,
                 "alternatives": [],
                 "auto_generated": True,
+                "fallback": True,  # placeholder, not cached on the plan
                 "structure_hash": self._generate_structure_hash(nodes, edges)
             }
         
-        # Check if we've generated identity for this exact structure recently
-        structure_hash = self._generate_structure_hash(nodes, edges)
-        current_time = time.time()
-        cache_key = f"identity_{structure_hash}"
-        
-        # Only use rate limiting for identical requests within 30 seconds (allow for real use)
-        if cache_key in self._last_validation_time:
-            time_since_last = current_time - self._last_validation_time[cache_key]
-            if time_since_last < 30.0:
-                print(f"🔄 Recent identity generation for structure {structure_hash[:8]}, using simple naming")
-                # Use simple naming for recent duplicates
-                return self._generate_simple_workflow_identity(nodes, edges, input_data, structure_hash)
-        
-        self._last_validation_time[cache_key] = current_time
+        # Repeat runs reuse the identity cached on their compiled plan, so no rate limiting here
         self._generating_identity = True
         try:
             # Analyze workflow structure
@@ -1223,70 +1082,12 @@ class WorkflowExecutor:
                 "confidence": 0.5,
                 "alternatives": [],
                 "auto_generated": True,
+                "fallback": True,  # placeholder, not cached on the plan
                 "structure_hash": self._generate_structure_hash(nodes, edges)
             }
         finally:
             self._generating_identity = False
 
-    def _generate_simple_workflow_identity(self, nodes: List[Dict], edges: List[Dict], input_data: str, structure_hash: str) -> Dict[str, Any]:
-        """Generate workflow identity using simple structural analysis"""
-        workflow_name = "Custom Workflow"
-        workflow_category = "general"
-        workflow_description = "A custom workflow"
-        confidence = 0.6
-        
-        # Check for system workflows first
-        system_workflow_detected = False
-        for node in nodes:
-            if node.get("type") == "agent":
-                agent_data = node.get("data", {})
-                agent_name = agent_data.get("name", "").lower()
-                if agent_name in ["contextextractor", "contextgenerator"]:
-                    system_workflow_detected = True
-                    break
-        
-        if system_workflow_detected:
-            workflow_name = "System Workflow"
-            workflow_description = "Internal system processing"
-            workflow_category = "system"
-            confidence = 0.9
-        else:
-            # Use structural naming based on node types and counts
-            agent_count = len([n for n in nodes if n.get("type") == "agent"])
-            tool_count = len([n for n in nodes if n.get("type") == "tool"])
-            
-            # Generate descriptive name based on structure
-            if agent_count > 1:
-                workflow_name = f"{agent_count}-Agent Workflow"
-                workflow_description = f"A workflow with {agent_count} AI agents"
-            elif agent_count == 1 and tool_count > 0:
-                workflow_name = "Agent-Tool Workflow"
-                workflow_description = f"A workflow with {tool_count} tool{'s' if tool_count > 1 else ''}"
-            elif agent_count == 1:
-                workflow_name = "Single Agent Workflow"
-                workflow_description = "A workflow with one AI agent"
-            else:
-                workflow_name = "Custom Workflow"
-                workflow_description = "A custom workflow"
-            
-            # Simple category assignment based on structure
-            if tool_count > agent_count:
-                workflow_category = "automation"
-            elif agent_count >= 2:
-                workflow_category = "multi-agent"
-            else:
-                workflow_category = "general"
-        
-        return {
-            "name": workflow_name,
-            "description": workflow_description,
-            "category": workflow_category,
-            "confidence": confidence,
-            "alternatives": [],
-            "auto_generated": True,
-            "structure_hash": structure_hash
-        }
-
     def _validate_workflow_structure(self, nodes: List[Dict], edges: List[Dict]) -> Dict[str, Any]:
         """Enhanced workflow structure validation before execution"""
         try:
@@ -1380,12 +1181,18 @@ class WorkflowExecutor:
             if not flow_validation["valid"]:
                 return flow_validation
             
+            # One O(V+E) pass: cycles, longest path and path count
+            analysis = analyze_graph(
+                (node["id"] for node in nodes),
+                ((edge["source"], edge["target"]) for edge in edges)
+            )
+            
             # Check for circular dependencies
-            if self._has_circular_dependency(nodes, edges):
+            if analysis.has_cycle:
                 return {"valid": False, "error": "Workflow contains circular dependencies"}
             
             # Validate execution paths
-            path_validation = self._validate_execution_paths(nodes, edges)
+            path_validation = self._validate_execution_paths(analysis)
             if not path_validation["valid"]:
                 return path_validation
             
@@ -1394,7 +1201,8 @@ class WorkflowExecutor:
                 "edge_count": len(edges),
                 "agent_count": len(agent_nodes),
                 "has_cycles": False,
-                "execution_paths": len(self._find_execution_paths(nodes, edges))
+                "execution_paths": analysis.path_count,
+                "longest_path": analysis.longest_path
             }}
             
         except Exception as e:
@@ -1484,167 +1292,26 @@ class WorkflowExecutor:
         
         return visited
     
-    def _validate_execution_paths(self, nodes: List[Dict], edges: List[Dict]) -> Dict[str, Any]:
+    def _validate_execution_paths(self, analysis: GraphAnalysis) -> Dict[str, Any]:
         """Validate that workflow has valid execution paths"""
-        try:
-            if len(nodes) == 1:
-                return {"valid": True, "message": "Single-node execution path is valid"}
-            
-            # Build graph
-            node_ids = set(node["id"] for node in nodes)
-            outgoing = {node_id: [] for node_id in node_ids}
-            incoming = {node_id: [] for node_id in node_ids}
-            
-            for edge in edges:
-                outgoing[edge["source"]].append(edge["target"])
-                incoming[edge["target"]].append(edge["source"])
-            
-            # Find execution paths
-            paths = self._find_execution_paths(nodes, edges)
-            
-            if not paths:
-                return {"valid": False, "error": "No valid execution paths found in workflow"}
-            
-            # Validate path lengths are reasonable
-            max_path_length = max(len(path) for path in paths) if paths else 0
-            if max_path_length > 20:
-                return {
-                    "valid": False, 
-                    "error": f"Workflow execution path too long ({max_path_length} nodes). Consider breaking into smaller workflows."
-                }
-            
-            return {"valid": True, "message": f"Found {len(paths)} valid execution paths"}
-            
-        except Exception as e:
-            return {"valid": False, "error": f"Execution path validation error: {str(e)}"}
-    
-    def _find_execution_paths(self, nodes: List[Dict], edges: List[Dict]) -> List[List[str]]:
-        """Find all execution paths from start to end nodes"""
-        if len(nodes) == 1:
-            return [[nodes[0]["id"]]]
-        
-        node_ids = set(node["id"] for node in nodes)
-        outgoing = {node_id: [] for node_id in node_ids}
-        incoming = {node_id: [] for node_id in node_ids}
-        
-        for edge in edges:
-            outgoing[edge["source"]].append(edge["target"])
-            incoming[edge["target"]].append(edge["source"])
-        
-        # Find start and end nodes
-        start_nodes = [node_id for node_id in node_ids if not incoming[node_id]]
-        end_nodes = [node_id for node_id in node_ids if not outgoing[node_id]]
-        
-        paths = []
-        
-        def find_paths_dfs(current_node: str, current_path: List[str], visited: set):
-            if current_node in end_nodes:
-                paths.append(current_path + [current_node])
-                return
-            
-            if current_node in visited:
-                return  # Avoid cycles
-            
-            visited.add(current_node)
-            
-            for next_node in outgoing.get(current_node, []):
-                find_paths_dfs(next_node, current_path + [current_node], visited.copy())
+        if analysis.path_count == 0:
+            return {"valid": False, "error": "No valid execution paths found in workflow"}
         
-        # Find all paths from each start node
-        for start_node in start_nodes:
-            find_paths_dfs(start_node, [], set())
+        # Validate path lengths are reasonable
+        if analysis.longest_path > 20:
+            return {
+                "valid": False, 
+                "error": f"Workflow execution path too long ({analysis.longest_path} nodes). Consider breaking into smaller workflows."
+            }
         
-        return paths
-
-    def _has_circular_dependency(self, nodes: List[Dict], edges: List[Dict]) -> bool:
-        """Basic circular dependency detection"""
-        try:
-            # Build adjacency list
-            graph = {}
-            for node in nodes:
-                graph[node["id"]] = []
-            
-            for edge in edges:
-                if edge["source"] in graph:
-                    graph[edge["source"]].append(edge["target"])
-            
-            # DFS to detect cycles
-            visited = set()
-            rec_stack = set()
-            
-            def has_cycle(node_id):
-                if node_id in rec_stack:
-                    return True
-                if node_id in visited:
-                    return False
-                
-                visited.add(node_id)
-                rec_stack.add(node_id)
-                
-                for neighbor in graph.get(node_id, []):
-                    if has_cycle(neighbor):
-                        return True
-                
-                rec_stack.remove(node_id)
-                return False
-            
-            for node_id in graph:
-                if node_id not in visited:
-                    if has_cycle(node_id):
-                        return True
-            
-            return False
-            
-        except Exception:
-            # If validation fails, assume no circular dependency to be safe
-            return False
+        return {"valid": True, "message": f"Found {analysis.path_count} valid execution paths"}
 
-    def _validate_workflow_structure_cached(self, nodes: List[Dict], edges: List[Dict]) -> Dict[str, Any]:
-        """Cached workflow validation with rate limiting"""
-        import time
-        import hashlib
-        
-        # Generate cache key from workflow structure
-        workflow_hash = hashlib.md5(
-            str({"nodes": nodes, "edges": edges}).encode()
-        ).hexdigest()
-        
-        current_time = time.time()
-        
-        # Rate limiting: Don't validate same workflow more than once per 5 seconds
-        if workflow_hash in self._last_validation_time:
-            time_since_last = current_time - self._last_validation_time[workflow_hash]
-            if time_since_last < 5.0:  # 5 second rate limit
-                # Return cached result if available
-                if workflow_hash in self._validation_cache:
-                    print(f"🚀 Using cached validation result for workflow {workflow_hash[:8]}...")
-                    return self._validation_cache[workflow_hash]
-                else:
-                    # Skip validation to prevent spam
-                    print(f"⚠️  Rate limiting validation for workflow {workflow_hash[:8]}")
-                    return {"valid": True, "message": "Validation skipped due to rate limiting"}
-        
-        # Update validation time
-        self._last_validation_time[workflow_hash] = current_time
-        
-        # Perform validation
-        print(f"🔍 Validating workflow structure {workflow_hash[:8]}...")
-        result = self._validate_workflow_structure(nodes, edges)
-        
-        # Cache successful results
-        if result.get("valid"):
-            self._validation_cache[workflow_hash] = result
-            print(f"✅ Workflow validation passed - cached for future use")
-        else:
-            print(f"❌ Workflow validation failed: {result.get('error', 'Unknown error')}")
-        
-        # Clean old cache entries (keep only last 50)
-        if len(self._validation_cache) > 50:
-            oldest_keys = list(self._validation_cache.keys())[:-25]  # Keep newest 25
-            for key in oldest_keys:
-                del self._validation_cache[key]
-                if key in self._last_validation_time:
-                    del self._last_validation_time[key]
-        
-        return result
+    def _get_workflow_plan(self, nodes: List[Dict], edges: List[Dict]) -> CompiledWorkflowPlan:
+        """Compiled plan for a workflow, validating and indexing it only on the first run"""
+        plan, cache_hit = get_workflow_plan_cache().get_or_compile(nodes, edges, self._validate_workflow_structure)
+        if cache_hit:
+            print(f"🚀 Using compiled plan {plan.workflow_hash[:8]} ({len(plan.nodes)} nodes)")
+        elif plan.valid:
+            print(f"✅ Compiled workflow plan {plan.workflow_hash[:8]} ({len(plan.nodes)} nodes, {len(plan.topological_order)} ordered steps)")
+        return plan
 
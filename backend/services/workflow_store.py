@@ -1,166 +1,569 @@
 """
 Workflow storage and analytics service.
 
-This is a placeholder implementation that will be replaced with a proper
-database-backed storage solution in the future.
+Executions are persisted in an embedded SQLite database so history survives
+restarts. The fields analytics filter and aggregate on (user, workflow,
+status, timestamps, cost, error type) are stored as indexed columns next to
+the full execution JSON, and per-node span timings go to their own table.
+Dashboard counters (counts, success/failure, cost, execution time, error
+types) are kept in hourly and daily rollup buckets per user and workflow,
+updated in the same transaction as each insert, so analytics read
+O(buckets) rows instead of scanning executions.
 """
 import json
+import math
 import os
+import sqlite3
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from .quantile_sketch import QuantileSketch
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id   TEXT PRIMARY KEY,
+    user_id        TEXT,
+    workflow_id    TEXT,
+    workflow_name  TEXT,
+    status         TEXT,
+    created_at     REAL NOT NULL DEFAULT 0,
+    completed_at   REAL,
+    execution_time REAL,
+    total_cost     REAL NOT NULL DEFAULT 0,
+    error_type     TEXT,
+    has_decisions  INTEGER NOT NULL DEFAULT 0,
+    data           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_created ON executions (created_at);
+CREATE INDEX IF NOT EXISTS idx_executions_user ON executions (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_executions_workflow ON executions (workflow_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_executions_status ON executions (status, created_at);
+
+CREATE TABLE IF NOT EXISTS node_timings (
+    execution_id TEXT NOT NULL REFERENCES executions (execution_id) ON DELETE CASCADE,
+    node_id      TEXT NOT NULL,
+    duration_ms  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_node_timings_execution ON node_timings (execution_id);
+
+-- Per hour/day bucket x user x workflow (x error type) counters, maintained on
+-- insert and retention; user_id '*' holds the all-users totals
+CREATE TABLE IF NOT EXISTS execution_rollups (
+    granularity   TEXT NOT NULL,
+    bucket_start  INTEGER NOT NULL,
+    user_id       TEXT NOT NULL,
+    workflow_id   TEXT NOT NULL,
+    workflow_name TEXT NOT NULL,
+    error_type    TEXT NOT NULL,
+    executions    INTEGER NOT NULL,
+    successful    INTEGER NOT NULL,
+    failed        INTEGER NOT NULL,
+    total_cost    REAL NOT NULL,
+    time_sum      REAL NOT NULL,
+    time_count    INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket_start, user_id, workflow_id, workflow_name, error_type)
+);
+CREATE INDEX IF NOT EXISTS idx_rollups_user ON execution_rollups (granularity, user_id, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_rollups_workflow ON execution_rollups (granularity, workflow_id, bucket_start);
+
+-- Mergeable latency sketches (QuantileSketch JSON) per hour/day bucket x user x
+-- workflow; '*' rows cover all users / all workflows. metric is 'execution'
+-- (seconds) or 'node:<node id>' (ms)
+CREATE TABLE IF NOT EXISTS latency_sketches (
+    granularity  TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    user_id      TEXT NOT NULL,
+    workflow_id  TEXT NOT NULL,
+    metric       TEXT NOT NULL,
+    sketch       TEXT NOT NULL,
+    PRIMARY KEY (granularity, user_id, workflow_id, bucket_start, metric)
+);
+"""
+
+_ROLLUP_BUCKETS = (("hour", 3600), ("day", 86400))
+_ALL_USERS = "*"
+_ALL_WORKFLOWS = "*"
+
+# Rollup columns of a set of executions; '?' placeholders are bucket width then the filter params
+_ROLLUP_SELECT = """
+    SELECT CAST(created_at / ? AS INTEGER) * ? AS bucket_start,
+           COALESCE(user_id, '') AS user_id,
+           COALESCE(workflow_id, '') AS workflow_id,
+           COALESCE(workflow_name, 'Unknown') AS workflow_name,
+           COALESCE(error_type, '') AS error_type,
+           COUNT(*) AS executions,
+           SUM(status = 'completed') AS successful,
+           SUM(status = 'failed') AS failed,
+           SUM(total_cost) AS total_cost,
+           COALESCE(SUM(NULLIF(execution_time, 0)), 0) AS time_sum,
+           COUNT(NULLIF(execution_time, 0)) AS time_count
+    FROM executions{where}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def _default_db_path() -> str:
+    return os.path.join(os.getcwd(), "data", "workflow_store.db")
+
+
+def _has_decisions(trace: Dict[str, Any]) -> bool:
+    """Whether an execution trace contains decision/conditional data"""
+    if 'decisions' in trace:
+        return True
+    return 'condition' in json.dumps(trace, default=str).lower()
+
+
+def _node_timings(trace: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Per-node durations (ms) from the 'Node:' spans of a trace"""
+    timings = []
+    for span in trace.get('spans', []) or []:
+        node_name = span.get('name', '') or ''
+        if node_name.startswith('Node:'):
+            duration = 0
+            if span.get('start_time') and span.get('end_time'):
+                duration = (span['end_time'] - span['start_time']) / 1_000_000  # Convert to ms
+            timings.append((node_name.replace('Node:', '').strip(), duration))
+    return timings
 
 
 class WorkflowStore:
     """
     Service for storing and retrieving workflow execution data and analytics.
-    
-    This is currently a placeholder implementation with in-memory storage.
-    In production, this should be replaced with a proper database solution
-    (PostgreSQL, MongoDB, etc.)
+
+    Backed by SQLite (WORKFLOW_STORE_DB, ':memory:' for a throwaway store) with
+    a retention policy of WORKFLOW_STORE_RETENTION_DAYS and
+    WORKFLOW_STORE_MAX_EXECUTIONS, enforced on startup and periodically on insert.
     """
-    
-    def __init__(self):
-        # In-memory storage for development
-        self.executions = []
-        self.workflows = {}
-        
-        # File-based persistence disabled for production
-        # TODO: Replace with database storage (PostgreSQL, Redis, etc.)
-        # self.storage_file = "workflow_store.json"
-        # self._load_from_file()
-    
-    def _load_from_file(self):
-        """Load stored data from file if it exists"""
-        if os.path.exists(self.storage_file):
-            try:
-                with open(self.storage_file, 'r') as f:
-                    data = json.load(f)
-                    self.executions = data.get('executions', [])
-                    self.workflows = data.get('workflows', {})
-            except Exception as e:
-                print(f"Error loading workflow store: {e}")
-    
-    def _save_to_file(self):
-        """Save data to file for persistence"""
-        try:
-            data = {
-                'executions': self.executions[-1000:],  # Keep only last 1000 executions
-                'workflows': self.workflows
-            }
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving workflow store: {e}")
-    
+
+    def __init__(self, db_path: Optional[str] = None,
+                 retention_days: Optional[float] = None,
+                 max_executions: Optional[int] = None):
+        self.db_path = db_path or os.getenv("WORKFLOW_STORE_DB") or _default_db_path()
+        self.retention_days = retention_days if retention_days is not None else float(os.getenv("WORKFLOW_STORE_RETENTION_DAYS", "90"))
+        self.max_executions = max_executions if max_executions is not None else int(os.getenv("WORKFLOW_STORE_MAX_EXECUTIONS", "1000000"))
+        self._retention_interval = 500  # inserts between retention passes
+        self._inserts_since_retention = 0
+        self._lock = threading.RLock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+            self._ensure_aggregates()
+
+        removed = self.apply_retention()
+        print(f"📊 WorkflowStore: Using {self.db_path} - {self.count_executions()} executions stored"
+              + (f" ({removed} removed by retention)" if removed else ""))
+
+    def close(self):
+        """Close the database connection (called on app shutdown)"""
+        with self._lock:
+            self._conn.close()
+
     def add_execution(self, execution_data: Dict[str, Any]):
-        """Add a new execution record"""
-        self.executions.append(execution_data)
-        print(f"📊 WorkflowStore: Added execution {execution_data.get('execution_id')} - Total executions in memory: {len(self.executions)}")
-        # Disabled file saving for production - data stays in memory only
-        # self._save_to_file()
-    
-    def get_workflow_analytics(self, user_id: Optional[str] = None, 
-                              start_date: Optional[datetime] = None,
-                              end_date: Optional[datetime] = None,
-                              workflow_id: Optional[str] = None) -> Dict[str, Any]:
-        """Get workflow analytics with optional filtering"""
-        print(f"📊 WorkflowStore: Getting analytics - Total executions in memory: {len(self.executions)}")
-        print(f"📊 WorkflowStore: Instance ID: {id(self)}")
-        print(f"📊 WorkflowStore: Called with user_id={user_id}, start_date={start_date}, end_date={end_date}, workflow_id={workflow_id}")
-        if self.executions:
-            print(f"📊 WorkflowStore: Sample execution: {self.executions[0].get('execution_id')} - user: {self.executions[0].get('user_id')}")
-        filtered_executions = self.executions
-        
-        # Apply filters
+        """Add a new execution record (re-adding an execution id replaces it)"""
+        trace = execution_data.get('trace') or {}
+        execution_id = execution_data.get('execution_id') or f"exec_{time.time_ns()}"
+        row = (
+            execution_id,
+            execution_data.get('user_id'),
+            execution_data.get('workflow_id'),
+            execution_data.get('workflow_name', 'Unknown'),
+            execution_data.get('status'),
+            execution_data.get('created_at', 0) or 0,
+            execution_data.get('completed_at'),
+            execution_data.get('execution_time'),
+            (execution_data.get('cost_info') or {}).get('total_cost', 0) or 0,
+            (execution_data.get('error_details') or {}).get('error_type', 'Unknown') if execution_data.get('status') == 'failed' else None,
+            int(_has_decisions(trace)),
+            json.dumps(execution_data, default=str),
+        )
+        with self._lock:
+            with self._conn:
+                replaced = self._conn.execute(
+                    "SELECT created_at FROM executions WHERE execution_id = ?", (execution_id,)
+                ).fetchone()
+                # A replaced execution first takes its old contribution out of the rollups
+                self._update_rollups(" WHERE execution_id = ?", [execution_id], sign=-1)
+                self._conn.execute("DELETE FROM node_timings WHERE execution_id = ?", (execution_id,))
+                self._conn.execute("INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                self._update_rollups(" WHERE execution_id = ?", [execution_id], sign=1)
+                self._conn.executemany(
+                    "INSERT INTO node_timings (execution_id, node_id, duration_ms) VALUES (?, ?, ?)",
+                    [(execution_id, node_id, duration) for node_id, duration in _node_timings(trace)]
+                )
+                if replaced:
+                    # Sketches cannot subtract, so the affected buckets are rebuilt
+                    self._refresh_sketches(replaced['created_at'], replaced['created_at'])
+                    self._refresh_sketches(row[5], row[5])
+                else:
+                    self._merge_sketches(" WHERE e.execution_id = ?", [execution_id])
+            self._inserts_since_retention += 1
+            if self._inserts_since_retention >= self._retention_interval:
+                self.apply_retention()
+        print(f"📊 WorkflowStore: Added execution {execution_id}")
+
+    def apply_retention(self) -> int:
+        """Delete executions older than the retention window or beyond the max count"""
+        removed = 0
+        with self._lock:
+            self._inserts_since_retention = 0
+            with self._conn:
+                if self.retention_days > 0:
+                    cutoff = time.time() - self.retention_days * 86400
+                    removed += self._delete_executions(" WHERE created_at < ?", [cutoff])
+                if self.max_executions > 0:
+                    removed += self._delete_executions(
+                        """ WHERE execution_id IN (
+                               SELECT execution_id FROM executions
+                               ORDER BY created_at DESC LIMIT -1 OFFSET ?)""",
+                        [self.max_executions]
+                    )
+        return removed
+
+    def _delete_executions(self, where: str, params: list) -> int:
+        """Delete executions matching a filter, keeping the rollups and sketches in step"""
+        oldest, newest = self._conn.execute(f"SELECT MIN(created_at), MAX(created_at) FROM executions{where}", params).fetchone()
+        if oldest is None:
+            return 0
+        self._update_rollups(where, params, sign=-1)
+        removed = self._conn.execute(f"DELETE FROM executions{where}", params).rowcount
+        self._refresh_sketches(oldest, newest)
+        return removed
+
+    def _update_rollups(self, where: str, params: list, sign: int):
+        """Add (sign=1) or subtract (sign=-1) the matching executions from every rollup bucket"""
+        for granularity, width in _ROLLUP_BUCKETS:
+            rows = self._conn.execute(_ROLLUP_SELECT.format(where=where), [width, width] + params).fetchall()
+            if not rows:
+                continue
+            self._conn.executemany(
+                """INSERT INTO execution_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (granularity, bucket_start, user_id, workflow_id, workflow_name, error_type) DO UPDATE SET
+                       executions = executions + excluded.executions,
+                       successful = successful + excluded.successful,
+                       failed = failed + excluded.failed,
+                       total_cost = total_cost + excluded.total_cost,
+                       time_sum = time_sum + excluded.time_sum,
+                       time_count = time_count + excluded.time_count""",
+                [
+                    (granularity, row['bucket_start'], user_key, row['workflow_id'], row['workflow_name'], row['error_type'],
+                     sign * row['executions'], sign * row['successful'], sign * row['failed'],
+                     sign * row['total_cost'], sign * row['time_sum'], sign * row['time_count'])
+                    for row in rows
+                    for user_key in (row['user_id'], _ALL_USERS)
+                ]
+            )
+        if sign < 0:
+            self._conn.execute("DELETE FROM execution_rollups WHERE executions <= 0")
+
+    def _latency_samples(self, where: str, params: list):
+        """(created_at, user_id, workflow_id, metric, value) for the matching executions"""
+        for row in self._conn.execute(f"""
+                SELECT e.created_at, e.user_id, e.workflow_id, e.execution_time
+                FROM executions e{where}{' AND' if where else ' WHERE'} e.execution_time IS NOT NULL AND e.execution_time != 0""", params):
+            yield row[0], row[1], row[2], "execution", row[3]
+        for row in self._conn.execute(f"""
+                SELECT e.created_at, e.user_id, e.workflow_id, n.node_id, n.duration_ms
+                FROM node_timings n JOIN executions e ON e.execution_id = n.execution_id{where}""", params):
+            yield row[0], row[1], row[2], f"node:{row[3]}", row[4]
+
+    def _merge_sketches(self, where: str, params: list, buckets: Tuple[Tuple[str, int], ...] = _ROLLUP_BUCKETS):
+        """Fold the matching executions' latencies into the stored sketches"""
+        pending: Dict[tuple, QuantileSketch] = {}
+        for created_at, user_id, workflow_id, metric, value in self._latency_samples(where, params):
+            for granularity, width in buckets:
+                bucket_start = int(created_at // width) * width
+                for user_key in (user_id or '', _ALL_USERS):
+                    for workflow_key in (workflow_id or '', _ALL_WORKFLOWS):
+                        key = (granularity, user_key, workflow_key, bucket_start, metric)
+                        sketch = pending.get(key)
+                        if sketch is None:
+                            sketch = pending[key] = QuantileSketch()
+                        sketch.add(value)
+
+        for key, sketch in pending.items():
+            stored = self._conn.execute(
+                """SELECT sketch FROM latency_sketches
+                   WHERE granularity = ? AND user_id = ? AND workflow_id = ? AND bucket_start = ? AND metric = ?""",
+                key
+            ).fetchone()
+            if stored:
+                sketch.merge(QuantileSketch.from_dict(json.loads(stored[0])))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO latency_sketches VALUES (?, ?, ?, ?, ?, ?)",
+                (key[0], key[3], key[1], key[2], key[4], json.dumps(sketch.to_dict()))
+            )
+
+    def _refresh_sketches(self, oldest: float, newest: float):
+        """Rebuild every sketch bucket overlapping [oldest, newest] from the remaining executions"""
+        for granularity, width in _ROLLUP_BUCKETS:
+            first_bucket = int(oldest // width) * width
+            last_bucket = int(newest // width) * width
+            self._conn.execute(
+                "DELETE FROM latency_sketches WHERE granularity = ? AND bucket_start BETWEEN ? AND ?",
+                (granularity, first_bucket, last_bucket)
+            )
+            self._merge_sketches(
+                " WHERE e.created_at >= ? AND e.created_at < ?",
+                [first_bucket, last_bucket + width],
+                buckets=((granularity, width),)
+            )
+
+    def _ensure_aggregates(self):
+        """Backfill rollups and sketches for a database written before they existed"""
+        with self._lock:
+            if not self._conn.execute("SELECT 1 FROM executions LIMIT 1").fetchone():
+                return
+            if not self._conn.execute("SELECT 1 FROM execution_rollups LIMIT 1").fetchone():
+                self.rebuild_rollups()
+            if not self._conn.execute("SELECT 1 FROM latency_sketches LIMIT 1").fetchone():
+                self.rebuild_sketches()
+
+    def rebuild_sketches(self):
+        """Recompute every latency sketch from the stored executions"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM latency_sketches")
+                self._merge_sketches("", [])
+        print("📊 WorkflowStore: Rebuilt latency sketches")
+
+    def rebuild_rollups(self):
+        """Recompute every rollup bucket from the stored executions"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM execution_rollups")
+                self._update_rollups("", [], sign=1)
+        print("📊 WorkflowStore: Rebuilt analytics rollups")
+
+    def _where(self, user_id: Optional[str] = None,
+               workflow_id: Optional[str] = None,
+               start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None,
+               extra: Optional[List[str]] = None,
+               extra_params: Optional[list] = None,
+               table: str = "") -> Tuple[str, list]:
+        """SQL WHERE clause and parameters for the common analytics filters"""
+        prefix = f"{table}." if table else ""
+        clauses, params = list(extra or []), list(extra_params or [])
         if user_id:
-            print(f"📊 WorkflowStore: Filtering by user_id={user_id}")
-            filtered_executions = [e for e in filtered_executions if e.get('user_id') == user_id]
-            print(f"📊 WorkflowStore: After user filter: {len(filtered_executions)} executions")
-        
+            clauses.append(f"{prefix}user_id = ?")
+            params.append(user_id)
+        if workflow_id:
+            clauses.append(f"{prefix}workflow_id = ?")
+            params.append(workflow_id)
         if start_date:
-            start_timestamp = start_date.timestamp()
-            print(f"📊 WorkflowStore: Filtering by start_date={start_date} (timestamp={start_timestamp})")
-            before_count = len(filtered_executions)
-            filtered_executions = [e for e in filtered_executions 
-                                 if e.get('created_at', 0) >= start_timestamp]
-            print(f"📊 WorkflowStore: Date filter removed {before_count - len(filtered_executions)} executions")
-        
+            clauses.append(f"{prefix}created_at >= ?")
+            params.append(start_date.timestamp())
         if end_date:
-            end_timestamp = end_date.timestamp()
-            filtered_executions = [e for e in filtered_executions 
-                                 if e.get('created_at', 0) <= end_timestamp]
-        
+            clauses.append(f"{prefix}created_at <= ?")
+            params.append(end_date.timestamp())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql: str, params: list = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def count_executions(self) -> int:
+        """Total number of stored executions"""
+        return self._query("SELECT COUNT(*) FROM executions")[0][0]
+
+    def _rollup_where(self, granularity: str,
+                      user_id: Optional[str] = None,
+                      workflow_id: Optional[str] = None,
+                      bucket_from: Optional[int] = None,
+                      bucket_to: Optional[int] = None) -> Tuple[str, list]:
+        """SQL WHERE clause and parameters selecting rollup buckets in [bucket_from, bucket_to)"""
+        clauses, params = ["granularity = ?", "user_id = ?"], [granularity, user_id or _ALL_USERS]
         if workflow_id:
-            filtered_executions = [e for e in filtered_executions 
-                                 if e.get('workflow_id') == workflow_id]
-        
-        # Calculate analytics
-        total_executions = len(filtered_executions)
-        successful_executions = len([e for e in filtered_executions 
-                                   if e.get('status') == 'completed'])
-        failed_executions = len([e for e in filtered_executions 
-                              if e.get('status') == 'failed'])
-        
-        # Calculate average execution time
-        execution_times = [e.get('execution_time', 0) for e in filtered_executions 
-                         if e.get('execution_time')]
-        avg_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
-        
-        # Calculate total cost
-        total_cost = sum(e.get('cost_info', {}).get('total_cost', 0) 
-                        for e in filtered_executions)
-        
-        # Group by workflow
+            clauses.append("workflow_id = ?")
+            params.append(workflow_id)
+        if bucket_from is not None:
+            clauses.append("bucket_start >= ?")
+            params.append(bucket_from)
+        if bucket_to is not None:
+            clauses.append("bucket_start < ?")
+            params.append(bucket_to)
+        return " WHERE " + " AND ".join(clauses), params
+
+    def _bucket_plan(self, start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None) -> Tuple[list, list]:
+        """Split a time range into aggregate buckets and raw edges.
+
+        Whole days inside the range come from the daily buckets and the whole
+        hours around them from the hourly ones; only the partial hours at the
+        range edges are left to be read from the raw executions, so results
+        stay exact. Returns ([(granularity, from, to)], [(from, to, to_inclusive)]).
+        """
+        start_ts = start_date.timestamp() if start_date else None
+        end_ts = end_date.timestamp() if end_date else None
+        first_hour = math.ceil(start_ts / 3600) * 3600 if start_ts is not None else None
+        end_hour = math.floor(end_ts / 3600) * 3600 if end_ts is not None else None
+
+        buckets, raw = [], []
+        if start_ts is None and end_ts is None:
+            buckets.append(("day", None, None))
+        elif first_hour is not None and end_hour is not None and first_hour >= end_hour:
+            raw.append((start_ts, end_ts, True))
+        else:
+            first_day = -(-first_hour // 86400) * 86400 if first_hour is not None else None
+            end_day = end_hour // 86400 * 86400 if end_hour is not None else None
+            if first_day is not None and end_day is not None and first_day >= end_day:
+                buckets.append(("hour", first_hour, end_hour))
+            else:
+                buckets.append(("day", first_day, end_day))
+                if first_hour is not None and first_hour < first_day:
+                    buckets.append(("hour", first_hour, first_day))
+                if end_hour is not None and end_day < end_hour:
+                    buckets.append(("hour", end_day, end_hour))
+            if start_ts is not None and start_ts < first_hour:
+                raw.append((start_ts, first_hour, False))
+            if end_ts is not None:
+                raw.append((end_hour, end_ts, True))
+        return buckets, raw
+
+    def _raw_range_where(self, user_id: Optional[str], workflow_id: Optional[str],
+                         lo: float, hi: float, hi_inclusive: bool, table: str = "") -> Tuple[str, list]:
+        prefix = f"{table}." if table else ""
+        return self._where(
+            user_id, workflow_id,
+            extra=[f"{prefix}created_at >= ?", f"{prefix}created_at <= ?" if hi_inclusive else f"{prefix}created_at < ?"],
+            extra_params=[lo, hi],
+            table=table
+        )
+
+    def _rollup_summary(self, user_id: Optional[str] = None,
+                        workflow_id: Optional[str] = None,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> List[sqlite3.Row]:
+        """Per-workflow-name counters for a filter, read from the rollups"""
+        buckets, raw = self._bucket_plan(start_date, end_date)
+        parts, params = [], []
+
+        for granularity, lo, hi in buckets:
+            where, rollup_params = self._rollup_where(granularity, user_id, workflow_id, lo, hi)
+            parts.append(f"""
+                SELECT workflow_name, executions, successful, failed, total_cost, time_sum, time_count
+                FROM execution_rollups{where}""")
+            params.extend(rollup_params)
+
+        for lo, hi, hi_inclusive in raw:
+            where, raw_params = self._raw_range_where(user_id, workflow_id, lo, hi, hi_inclusive)
+            parts.append(f"""
+                SELECT COALESCE(workflow_name, 'Unknown') AS workflow_name, COUNT(*) AS executions,
+                       SUM(status = 'completed') AS successful, SUM(status = 'failed') AS failed,
+                       SUM(total_cost) AS total_cost, COALESCE(SUM(NULLIF(execution_time, 0)), 0) AS time_sum,
+                       COUNT(NULLIF(execution_time, 0)) AS time_count
+                FROM executions{where} GROUP BY 1""")
+            params.extend(raw_params)
+
+        return self._query(f"""
+            SELECT workflow_name, SUM(executions) AS executions, SUM(successful) AS successful,
+                   SUM(failed) AS failed, SUM(total_cost) AS total_cost,
+                   SUM(time_sum) AS time_sum, SUM(time_count) AS time_count
+            FROM ({' UNION ALL '.join(parts)})
+            GROUP BY workflow_name""", params)
+
+    def get_latency_sketches(self, user_id: Optional[str] = None,
+                             workflow_id: Optional[str] = None,
+                             start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None) -> Dict[str, QuantileSketch]:
+        """Merged latency sketches per metric ('execution', 'node:<id>') for a filter.
+
+        Serialise with QuantileSketch.to_dict() to merge results across replicas.
+        """
+        buckets, raw = self._bucket_plan(start_date, end_date)
+        merged: Dict[str, QuantileSketch] = {}
+
+        def fold(metric: str, sketch: QuantileSketch):
+            if metric in merged:
+                merged[metric].merge(sketch)
+            else:
+                merged[metric] = sketch
+
+        with self._lock:
+            for granularity, lo, hi in buckets:
+                clauses = ["granularity = ?", "user_id = ?", "workflow_id = ?"]
+                params = [granularity, user_id or _ALL_USERS, workflow_id or _ALL_WORKFLOWS]
+                if lo is not None:
+                    clauses.append("bucket_start >= ?")
+                    params.append(lo)
+                if hi is not None:
+                    clauses.append("bucket_start < ?")
+                    params.append(hi)
+                for metric, data in self._conn.execute(
+                        f"SELECT metric, sketch FROM latency_sketches WHERE {' AND '.join(clauses)}", params):
+                    fold(metric, QuantileSketch.from_dict(json.loads(data)))
+
+            for lo, hi, hi_inclusive in raw:
+                where, params = self._raw_range_where(user_id, workflow_id, lo, hi, hi_inclusive, table="e")
+                edge: Dict[str, QuantileSketch] = {}
+                for _, _, _, metric, value in self._latency_samples(where, params):
+                    edge.setdefault(metric, QuantileSketch()).add(value)
+                for metric, sketch in edge.items():
+                    fold(metric, sketch)
+
+        return merged
+
+    def get_workflow_analytics(self, user_id: Optional[str] = None,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None,
+                              workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get workflow analytics with optional filtering"""
+        print(f"📊 WorkflowStore: Getting analytics for user_id={user_id}, start_date={start_date}, end_date={end_date}, workflow_id={workflow_id}")
+        where, params = self._where(user_id, workflow_id, start_date, end_date)
+
+        # Group by workflow (from the rollups; totals are the sum over workflows)
         workflows_summary = {}
-        for execution in filtered_executions:
-            workflow_name = execution.get('workflow_name', 'Unknown')
-            if workflow_name not in workflows_summary:
-                workflows_summary[workflow_name] = {
-                    'count': 0,
-                    'successful': 0,
-                    'failed': 0,
-                    'total_cost': 0,
-                    'avg_execution_time': 0,
-                    'execution_times': []
-                }
-            
-            workflows_summary[workflow_name]['count'] += 1
-            if execution.get('status') == 'completed':
-                workflows_summary[workflow_name]['successful'] += 1
-            elif execution.get('status') == 'failed':
-                workflows_summary[workflow_name]['failed'] += 1
-            
-            workflows_summary[workflow_name]['total_cost'] += execution.get('cost_info', {}).get('total_cost', 0)
-            if execution.get('execution_time'):
-                workflows_summary[workflow_name]['execution_times'].append(execution['execution_time'])
-        
-        # Calculate average execution times for each workflow
-        for workflow_name, summary in workflows_summary.items():
-            if summary['execution_times']:
-                summary['avg_execution_time'] = sum(summary['execution_times']) / len(summary['execution_times'])
-            del summary['execution_times']  # Remove raw data
-        
+        total_executions = successful_executions = failed_executions = 0
+        total_cost = time_sum = time_count = 0
+        for row in self._rollup_summary(user_id, workflow_id, start_date, end_date):
+            workflows_summary[row['workflow_name']] = {
+                'count': row['executions'],
+                'successful': row['successful'],
+                'failed': row['failed'],
+                'total_cost': row['total_cost'],
+                'avg_execution_time': row['time_sum'] / row['time_count'] if row['time_count'] else 0
+            }
+            total_executions += row['executions']
+            successful_executions += row['successful']
+            failed_executions += row['failed']
+            total_cost += row['total_cost']
+            time_sum += row['time_sum']
+            time_count += row['time_count']
+
         # Get recent executions for the response
-        recent_executions = []
-        sorted_executions = sorted(filtered_executions, key=lambda x: x.get('created_at', 0), reverse=True)
-        for execution in sorted_executions[:10]:  # Get last 10 executions
-            recent_executions.append({
-                'execution_id': execution.get('execution_id', ''),
-                'workflow_id': execution.get('workflow_id', ''),
-                'workflow_name': execution.get('workflow_name', 'Unknown'),
-                'status': execution.get('status', 'unknown'),
-                'cost': execution.get('cost_info', {}).get('total_cost', 0),
-                'duration_ms': execution.get('execution_time', 0),
-                'created_at': execution.get('created_at', 0)
-            })
-        
+        recent_executions = [
+            {
+                'execution_id': row['execution_id'] or '',
+                'workflow_id': row['workflow_id'] or '',
+                'workflow_name': row['workflow_name'] or 'Unknown',
+                'status': row['status'] or 'unknown',
+                'cost': row['total_cost'],
+                'duration_ms': row['execution_time'] or 0,
+                'created_at': row['created_at']
+            }
+            for row in self._query(f"""
+                SELECT execution_id, workflow_id, workflow_name, status, total_cost, execution_time, created_at
+                FROM executions{where}
+                ORDER BY created_at DESC LIMIT 10""", params)
+        ]
+
         return {
             'total_executions': total_executions,
             'successful_executions': successful_executions,
             'failed_executions': failed_executions,
             'success_rate': successful_executions / total_executions if total_executions > 0 else 0,
-            'avg_execution_time': avg_execution_time,
+            'avg_execution_time': time_sum / time_count if time_count else 0,
             'total_cost': total_cost,
             'workflows': workflows_summary,
             'recent_executions': recent_executions,
@@ -169,176 +572,117 @@ class WorkflowStore:
                 'end': end_date.isoformat() if end_date else None
             }
         }
-    
+
     def get_recent_executions(self, workflow_id: Optional[str] = None,
                             user_id: Optional[str] = None,
                             limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent executions with optional filtering"""
-        filtered = self.executions
-        
-        if workflow_id:
-            filtered = [e for e in filtered if e.get('workflow_id') == workflow_id]
-        
-        if user_id:
-            filtered = [e for e in filtered if e.get('user_id') == user_id]
-        
-        # Sort by created_at descending and limit
-        filtered.sort(key=lambda x: x.get('created_at', 0), reverse=True)
-        return filtered[:limit]
-    
+        where, params = self._where(user_id, workflow_id)
+        rows = self._query(f"SELECT data FROM executions{where} ORDER BY created_at DESC LIMIT ?", params + [limit])
+        return [json.loads(row['data']) for row in rows]
+
     def get_executions_with_decisions(self, workflow_id: Optional[str] = None,
                                     user_id: Optional[str] = None,
                                     start_date: Optional[datetime] = None,
                                     end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Get executions that contain decision nodes"""
-        filtered = self.executions
-        
-        # Apply filters
-        if workflow_id:
-            filtered = [e for e in filtered if e.get('workflow_id') == workflow_id]
-        
-        if user_id:
-            filtered = [e for e in filtered if e.get('user_id') == user_id]
-        
-        if start_date:
-            start_timestamp = start_date.timestamp()
-            filtered = [e for e in filtered if e.get('created_at', 0) >= start_timestamp]
-        
-        if end_date:
-            end_timestamp = end_date.timestamp()
-            filtered = [e for e in filtered if e.get('created_at', 0) <= end_timestamp]
-        
-        # Filter for executions with decision nodes
-        decision_executions = []
-        for execution in filtered:
-            trace = execution.get('trace', {})
-            # Check if execution has decision-related data
-            if 'decisions' in trace or any('condition' in str(trace).lower()):
-                decision_executions.append(execution)
-        
-        return decision_executions
-    
+        where, params = self._where(user_id, workflow_id, start_date, end_date, extra=["has_decisions = 1"])
+        rows = self._query(f"SELECT data FROM executions{where} ORDER BY created_at", params)
+        return [json.loads(row['data']) for row in rows]
+
     def get_comprehensive_analytics(self, user_id: Optional[str] = None,
                                   workflow_id: Optional[str] = None) -> Dict[str, Any]:
         """Get comprehensive analytics data"""
         # Get basic analytics
         analytics = self.get_workflow_analytics(user_id=user_id, workflow_id=workflow_id)
-        
-        # Add additional metrics
-        filtered = self.executions
-        if user_id:
-            filtered = [e for e in filtered if e.get('user_id') == user_id]
-        if workflow_id:
-            filtered = [e for e in filtered if e.get('workflow_id') == workflow_id]
-        
+
         # Error analysis
-        errors = {}
-        for execution in filtered:
-            if execution.get('status') == 'failed':
-                error_type = execution.get('error_details', {}).get('error_type', 'Unknown')
-                errors[error_type] = errors.get(error_type, 0) + 1
-        
-        analytics['error_analysis'] = errors
-        
+        where, params = self._rollup_where("day", user_id, workflow_id)
+        analytics['error_analysis'] = {
+            row['error_type']: row['count']
+            for row in self._query(f"""
+                SELECT error_type, SUM(failed) AS count
+                FROM execution_rollups{where} AND error_type != ''
+                GROUP BY 1""", params)
+        }
+
         # Time-based trends (last 7 days)
         now = datetime.now()
+        first_day = (now - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
+        where, params = self._rollup_where("hour", user_id, workflow_id, int(first_day.timestamp()))
+        per_day = {
+            row['day']: row
+            for row in self._query(f"""
+                SELECT date(bucket_start, 'unixepoch', 'localtime') AS day,
+                       SUM(executions) AS total,
+                       SUM(successful) AS successful,
+                       SUM(failed) AS failed,
+                       SUM(total_cost) AS cost
+                FROM execution_rollups{where} GROUP BY 1""", params)
+        }
         daily_stats = {}
         for i in range(7):
-            day = now - timedelta(days=i)
-            day_str = day.strftime('%Y-%m-%d')
-            day_start = day.replace(hour=0, minute=0, second=0).timestamp()
-            day_end = day.replace(hour=23, minute=59, second=59).timestamp()
-            
-            day_executions = [e for e in filtered 
-                            if day_start <= e.get('created_at', 0) <= day_end]
-            
+            day_str = (now - timedelta(days=i)).strftime('%Y-%m-%d')
+            row = per_day.get(day_str)
             daily_stats[day_str] = {
-                'total': len(day_executions),
-                'successful': len([e for e in day_executions if e.get('status') == 'completed']),
-                'failed': len([e for e in day_executions if e.get('status') == 'failed']),
-                'cost': sum(e.get('cost_info', {}).get('total_cost', 0) for e in day_executions)
+                'total': row['total'] if row else 0,
+                'successful': row['successful'] if row else 0,
+                'failed': row['failed'] if row else 0,
+                'cost': row['cost'] if row else 0
             }
-        
+
         analytics['daily_trends'] = daily_stats
-        
+
         return analytics
-    
+
     def get_performance_metrics(self, user_id: Optional[str] = None,
                               workflow_id: Optional[str] = None,
                               start_date: Optional[datetime] = None,
                               end_date: Optional[datetime] = None) -> Dict[str, Any]:
         """Get detailed performance metrics"""
-        filtered = self.executions
-        
-        # Apply filters
-        if user_id:
-            filtered = [e for e in filtered if e.get('user_id') == user_id]
-        
-        if workflow_id:
-            filtered = [e for e in filtered if e.get('workflow_id') == workflow_id]
-        
-        if start_date:
-            start_timestamp = start_date.timestamp()
-            filtered = [e for e in filtered if e.get('created_at', 0) >= start_timestamp]
-        
-        if end_date:
-            end_timestamp = end_date.timestamp()
-            filtered = [e for e in filtered if e.get('created_at', 0) <= end_timestamp]
-        
-        # Calculate performance metrics
-        execution_times = [e.get('execution_time', 0) for e in filtered if e.get('execution_time')]
-        
+        total = sum(row['executions'] for row in self._rollup_summary(user_id, workflow_id, start_date, end_date))
+        sketches = self.get_latency_sketches(user_id, workflow_id, start_date, end_date)
+
+        execution_sketch = sketches.get('execution')
+        has_times = execution_sketch is not None and execution_sketch.count > 0
         metrics = {
-            'total_executions': len(filtered),
-            'avg_execution_time': sum(execution_times) / len(execution_times) if execution_times else 0,
-            'min_execution_time': min(execution_times) if execution_times else 0,
-            'max_execution_time': max(execution_times) if execution_times else 0,
-            'p50_execution_time': 0,
-            'p95_execution_time': 0,
-            'p99_execution_time': 0
+            'total_executions': total,
+            'avg_execution_time': execution_sketch.mean if has_times else 0,
+            'min_execution_time': execution_sketch.min if has_times else 0,
+            'max_execution_time': execution_sketch.max if has_times else 0,
+            'p50_execution_time': execution_sketch.quantile(0.5) if has_times else 0,
+            'p95_execution_time': execution_sketch.quantile(0.95) if has_times else 0,
+            'p99_execution_time': execution_sketch.quantile(0.99) if has_times else 0
         }
-        
-        # Calculate percentiles
-        if execution_times:
-            sorted_times = sorted(execution_times)
-            n = len(sorted_times)
-            metrics['p50_execution_time'] = sorted_times[int(n * 0.5)]
-            metrics['p95_execution_time'] = sorted_times[int(n * 0.95)] if n > 20 else sorted_times[-1]
-            metrics['p99_execution_time'] = sorted_times[int(n * 0.99)] if n > 100 else sorted_times[-1]
-        
+
         # Node-level performance
         node_metrics = {}
-        for execution in filtered:
-            trace = execution.get('trace', {})
-            spans = trace.get('spans', [])
-            
-            for span in spans:
-                node_name = span.get('name', '')
-                if node_name.startswith('Node:'):
-                    node_id = node_name.replace('Node:', '').strip()
-                    if node_id not in node_metrics:
-                        node_metrics[node_id] = {
-                            'count': 0,
-                            'total_time': 0,
-                            'times': []
-                        }
-                    
-                    duration = 0
-                    if span.get('start_time') and span.get('end_time'):
-                        duration = (span['end_time'] - span['start_time']) / 1_000_000  # Convert to ms
-                    
-                    node_metrics[node_id]['count'] += 1
-                    node_metrics[node_id]['total_time'] += duration
-                    node_metrics[node_id]['times'].append(duration)
-        
-        # Calculate node averages
-        for node_id, data in node_metrics.items():
-            if data['times']:
-                data['avg_time'] = data['total_time'] / data['count']
-                data['min_time'] = min(data['times'])
-                data['max_time'] = max(data['times'])
-                del data['times']  # Remove raw data
-        
+        for metric, sketch in sketches.items():
+            if not metric.startswith('node:') or not sketch.count:
+                continue
+            node_metrics[metric[len('node:'):]] = {
+                'count': sketch.count,
+                'total_time': sketch.sum,
+                'avg_time': sketch.mean,
+                'min_time': sketch.min,
+                'max_time': sketch.max,
+                'p50_time': sketch.quantile(0.5),
+                'p95_time': sketch.quantile(0.95),
+                'p99_time': sketch.quantile(0.99)
+            }
+
         metrics['node_performance'] = node_metrics
-        
-        return metrics
\ No newline at end of file
+
+        return metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Storage statistics for monitoring"""
+        size_bytes = os.path.getsize(self.db_path) if self.db_path != ":memory:" and os.path.exists(self.db_path) else 0
+        return {
+            "backend": "sqlite",
+            "db_path": self.db_path,
+            "executions": self.count_executions(),
+            "size_bytes": size_bytes,
+            "retention_days": self.retention_days,
+            "max_executions": self.max_executions
+        }
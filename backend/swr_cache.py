@@ -0,0 +1,158 @@
+"""
+Stale-While-Revalidate Cache
+
+Bounded LRU cache for expensive async lookups (e.g. Composio action
+discovery). Entries are fresh for their TTL, then served stale for a grace
+window while a single background refresh runs. Concurrent refreshes of the
+same key share one in-flight task.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A loader returns (value, ttl_seconds); a ttl of None returns the value without caching it
+Loader = Callable[[], Awaitable[Tuple[Any, Optional[float]]]]
+
+
+class SWRCache:
+    """LRU cache with single-flight refresh and stale-while-revalidate reads"""
+
+    def __init__(self, name: str, max_entries: int = 256, ttl: float = 3600, stale_ttl: float = 86400):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()  # key -> (value, stored_at, ttl)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._background: set = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """Return (value, state) with state 'fresh', 'stale' or None; counts the lookup"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at, ttl = entry
+                age = now - stored_at
+                if age <= ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, "fresh"
+                if age <= ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return value, "stale"
+                del self._entries[key]
+            self.misses += 1
+            return None, None
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """Store a value, evicting least recently used entries beyond the size bound"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), self.ttl if ttl is None else ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    async def _load(self, key: Hashable, loader: Loader) -> Any:
+        self.refreshes += 1
+        try:
+            value, ttl = await loader()
+        except Exception:
+            self.refresh_errors += 1
+            raise
+        if ttl is not None:
+            self.set(key, value, ttl)
+        return value
+
+    async def refresh(self, key: Hashable, loader: Loader) -> Any:
+        """Reload a key, joining an in-flight refresh of the same key if there is one"""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = loop.create_task(self._load(key, loader))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None) if self._inflight.get(k) is t else None)
+        return await asyncio.shield(task)
+
+    def refresh_in_background(self, key: Hashable, loader: Loader):
+        """Schedule a refresh without waiting for it (no-op if one is already running)"""
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def _run():
+            try:
+                await self.refresh(key, loader)
+            except Exception as e:
+                logger.warning(f"Background refresh of {self.name} cache failed: {e}")
+
+        background = asyncio.get_running_loop().create_task(_run())
+        self._background.add(background)
+        background.add_done_callback(self._background.discard)
+
+    async def get(self, key: Hashable, loader: Loader) -> Any:
+        """Fresh value, stale value plus background refresh, or a (shared) load on a miss"""
+        value, state = self._lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self.refresh_in_background(key, loader)
+            return value
+        return await self.refresh(key, loader)
+
+    def peek(self, key: Hashable, loader: Loader = None) -> Any:
+        """Cached value (fresh or stale) without ever waiting; schedules a refresh when not fresh"""
+        value, state = self._lookup(key)
+        if state != "fresh" and loader is not None:
+            self.refresh_in_background(key, loader)
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/refresh metrics"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refreshes_in_flight": len(self._inflight),
+                "coalesced": self.coalesced,
+                "refresh_errors": self.refresh_errors,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,280 @@
+"""
+Tool Registry
+
+Process-wide registry of the tool functions workflow agents can use: the
+built-in web tools (with their frontend aliases), Composio action wrappers
+and tools exposed by connected MCP servers.
+
+The tool map is built once and only rebuilt after invalidation, i.e. when
+MCP servers are added, removed or reconfigured, or Composio settings change.
+Translators take a read-only snapshot instead of rebuilding it per execution.
+"""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Import MCP manager (with fallback for backwards compatibility)
+try:
+    from mcp_manager import get_mcp_manager, is_mcp_enabled
+    MCP_INTEGRATION_AVAILABLE = True
+except ImportError:
+    logging.warning("MCP integration not available")
+    MCP_INTEGRATION_AVAILABLE = False
+    
+    # Fallback functions
+    def get_mcp_manager():
+        return None
+    
+    def is_mcp_enabled():
+        return False
+
+# Import enhanced search tools with better error handling
+try:
+    from enhanced_search_tools import search_web, visit_webpage
+    print("✅ Using ENHANCED web search tools with DuckDuckGo error handling")
+    logging.info("✅ Production: Enhanced web search tools loaded successfully")
+except ImportError:
+    # Fallback to real any-agent tools
+    try:
+        from any_agent.tools import search_web as real_search_web, visit_webpage as real_visit_webpage
+        # Use real tools when available
+        search_web = real_search_web
+        visit_webpage = real_visit_webpage
+        print("✅ Using REAL any-agent web search tools")
+        logging.info("✅ Production: REAL web search tools loaded successfully")
+    except ImportError:
+        # Final fallback to mock functions for backwards compatibility
+        def search_web(query: str):
+            result = f"Mock search results for: {query}"
+            logging.warning(f"⚠️  MOCK SEARCH executed for query: {query}")
+            return result
+
+        def visit_webpage(url: str):
+            result = f"Mock webpage content for: {url}"
+            logging.warning(f"⚠️  MOCK WEBPAGE visit for URL: {url}")
+            return result
+        print("⚠️  Using MOCK web search tools (any-agent not available)")
+        logging.warning("⚠️  Production: MOCK web search tools in use (real tools not available)")
+
+
+# Built-in tools with aliases for frontend compatibility
+BUILTIN_TOOLS: Dict[str, Callable] = {
+    "search_web": search_web,
+    "visit_webpage": visit_webpage,
+    "web_search": search_web,  # Frontend alias for search_web
+    "WebSearch": search_web,   # UI display name alias
+    "webpage_visit": visit_webpage,  # Alternative naming
+    "visit_page": visit_webpage,     # Alternative naming
+}
+
+# Workflow tool key -> Composio action name
+COMPOSIO_TOOL_ACTIONS: Dict[str, str] = {
+    "composio_github_star_repo": "github_star_repo",
+    "composio_github_create_issue": "github_create_issue",
+    "composio_slack_send_message": "slack_send_message",
+    "composio_gmail_send_email": "gmail_send_email",
+    "composio_googledocs_create_doc": "GOOGLEDOCS_CREATE_DOCUMENT",
+    "composio_googlesheets_create_sheet": "googlesheets_create_sheet",
+    "composio_googledrive_upload": "googledrive_upload",
+    "composio_googlecalendar_create_event": "googlecalendar_create_event",
+    "composio_notion_create_page": "notion_create_page",
+    "composio_linear_create_issue": "linear_create_issue",
+    "composio_trello_create_card": "trello_create_card",
+    "composio_airtable_create_record": "airtable_create_record",
+    "composio_jira_create_issue": "jira_create_issue",
+}
+
+
+def create_composio_tool_wrapper(tool_name: str) -> Callable:
+    """Create a wrapper function for a Composio tool that can be used in workflows"""
+
+    def composio_tool_wrapper(input_text: str = "", title: str = "", text: str = "") -> str:
+        """Wrapper that executes Composio tool with user context during workflow execution"""
+        try:
+            # Import here to avoid circular imports
+            from composio_http_manager import UserContext, user_manager
+            import os
+
+            # Extract parameters from input_text and specific parameters
+            params = {}
+            if input_text:
+                params["input"] = input_text
+            if title:
+                params["title"] = title
+            if text:
+                params["text"] = text
+
+            # Get user context from environment (set by MCP server config)
+            api_key = os.getenv('COMPOSIO_API_KEY', '')
+            user_id = os.getenv('USER_ID', 'default_user')
+            enabled_tools_str = os.getenv('ENABLED_TOOLS', '')
+
+            # Parse enabled tools
+            enabled_tools = []
+            if enabled_tools_str:
+                enabled_tools = [tool.strip() for tool in enabled_tools_str.split(',') if tool.strip()]
+
+            # Check if we have a valid API key
+            if not api_key:
+                return f"❌ No Composio API key configured. Please set your API key in user settings to enable real {tool_name} execution."
+
+            # Create user context
+            user_context = UserContext(
+                user_id=user_id,
+                api_key=api_key,
+                enabled_tools=enabled_tools if enabled_tools else None,
+                preferences={}
+            )
+
+            # Execute the tool for real using the shared ComposioHttpClient; run_sync hands the
+            # call to the application loop so it reuses the pooled HTTP session
+            result = user_manager.run_sync(
+                lambda: user_manager.execute_tool_for_user(tool_name, params, user_context),
+                timeout=30
+            )
+
+            # Format the result for the workflow
+            if result.get("success"):
+                success_msg = f"✅ Successfully executed {tool_name}"
+                if "result" in result:
+                    success_msg += f"\n\nResult: {result['result']}"
+                logging.info(f"🎯 Composio tool executed successfully: {tool_name} for user {user_context.user_id}")
+                return success_msg
+            elif "mock_result" in result:
+                # This is a mock execution (no real API key or connection)
+                mock_msg = f"🔧 Mock execution of {tool_name}: {result['mock_result']}"
+                if "message" in result:
+                    mock_msg += f"\n💡 {result['message']}"
+                logging.info(f"🔧 Composio tool mock execution: {tool_name}")
+                return mock_msg
+            else:
+                # Real execution failed
+                error_msg = f"❌ Failed to execute {tool_name}: {result.get('error', 'Unknown error')}"
+                if "message" in result:
+                    error_msg += f"\n💡 {result['message']}"
+                logging.error(f"❌ Composio tool execution failed: {tool_name} - {result.get('error')}")
+                return error_msg
+
+        except Exception as e:
+            error_msg = f"❌ Error executing Composio tool {tool_name}: {str(e)}"
+            logging.error(error_msg)
+            return error_msg
+
+    # Set function metadata for debugging
+    composio_tool_wrapper.__name__ = f"composio_{tool_name}"
+    composio_tool_wrapper.__doc__ = f"Composio {tool_name} integration - executes real actions"
+
+    return composio_tool_wrapper
+
+
+class ToolRegistry:
+    """Versioned, lazily rebuilt map of tool key -> tool function"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._built_version = -1
+        self._built_mcp_state = None
+        self._tools: Mapping[str, Callable] = MappingProxyType({})
+        self._composio_tools: Optional[Dict[str, Callable]] = None
+        self.rebuild_count = 0
+        self.last_invalidation_reason: Optional[str] = None
+    
+    @property
+    def version(self) -> int:
+        """Current registry version (bumped on every invalidation)"""
+        return self._version
+    
+    def invalidate(self, reason: str = ""):
+        """Mark the tool map stale; it is rebuilt on the next snapshot"""
+        with self._lock:
+            self._version += 1
+            self._composio_tools = None
+            self.last_invalidation_reason = reason or None
+        logging.info(f"🔄 Tool registry invalidated (v{self._version}): {reason or 'no reason given'}")
+    
+    def _mcp_state(self) -> tuple:
+        """Cheap fingerprint of the MCP tool sources"""
+        if not MCP_INTEGRATION_AVAILABLE or not is_mcp_enabled():
+            return (False, 0)
+        mcp_manager = get_mcp_manager()
+        return (True, getattr(mcp_manager, "tools_version", 0) if mcp_manager else 0)
+    
+    def snapshot(self) -> Mapping[str, Callable]:
+        """Read-only view of the current tool map, rebuilt only when stale"""
+        mcp_state = self._mcp_state()
+        if self._built_version == self._version and self._built_mcp_state == mcp_state:
+            return self._tools
+        
+        with self._lock:
+            if self._built_version != self._version or self._built_mcp_state != mcp_state:
+                self._tools = MappingProxyType(self._build())
+                self._built_version = self._version
+                self._built_mcp_state = mcp_state
+                self.rebuild_count += 1
+                self._log_inventory()
+            return self._tools
+    
+    def _build(self) -> Dict[str, Callable]:
+        tools = dict(BUILTIN_TOOLS)
+        
+        # Composio wrappers read credentials at call time, so they survive MCP changes
+        if self._composio_tools is None:
+            try:
+                import composio_http_manager  # noqa: F401 - wrappers need the Composio bridge
+                self._composio_tools = {
+                    tool_key: create_composio_tool_wrapper(action)
+                    for tool_key, action in COMPOSIO_TOOL_ACTIONS.items()
+                }
+                logging.info(f"✅ Added {len(self._composio_tools)} Composio tools for workflow execution")
+            except ImportError as e:
+                logging.warning(f"⚠️  Composio integration not available for workflow execution: {e}")
+                self._composio_tools = {}
+        tools.update(self._composio_tools)
+        
+        # Add MCP tools if available and enabled
+        if MCP_INTEGRATION_AVAILABLE and is_mcp_enabled():
+            try:
+                mcp_manager = get_mcp_manager()
+                if mcp_manager:
+                    mcp_tools = mcp_manager.get_available_tools()
+                    tools.update(mcp_tools)
+                    logging.info(f"Added {len(mcp_tools)} MCP tools to available tools")
+            except Exception as e:
+                logging.warning(f"Failed to load MCP tools, continuing with built-in tools only: {e}")
+        
+        return tools
+    
+    def _log_inventory(self):
+        logging.info("=" * 60)
+        logging.info(f"🔧 TOOL REGISTRY v{self._version} (rebuild #{self.rebuild_count}):")
+        for tool_name, tool_func in self._tools.items():
+            func_name = getattr(tool_func, '__name__', 'unknown')
+            func_module = getattr(tool_func, '__module__', 'unknown')
+            logging.info(f"  - {tool_name}: {func_module}.{func_name}")
+        logging.info(f"Total tools available: {len(self._tools)}")
+        logging.info("=" * 60)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry version and rebuild metrics"""
+        return {
+            "version": self._version,
+            "built_version": self._built_version,
+            "tool_count": len(self._tools),
+            "rebuild_count": self.rebuild_count,
+            "last_invalidation_reason": self.last_invalidation_reason,
+        }
+
+
+# Global tool registry instance
+_tool_registry: Optional[ToolRegistry] = None
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get or create the global tool registry"""
+    global _tool_registry
+    if _tool_registry is None:
+        _tool_registry = ToolRegistry()
+    return _tool_registry
@@ -0,0 +1,173 @@
+"""
+Trace Summarization
+
+Finalizing an execution needs cost and token totals, performance metrics and
+per-node aggregates from its agent trace. summarize_trace reads the spans'
+usage attributes into columns once, prices spans without a recorded cost
+from the cached model price table, and produces all of them. The span list
+itself is kept as-is and is shared by reference between the execution record
+and the WorkflowStore record instead of being copied into each.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from model_prices import ModelPriceTable, get_model_price_table
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_span(span: Any) -> Dict[str, Any]:
+    """Plain-dict form of an any-agent span object"""
+    try:
+        return {
+            "name": getattr(span, 'name', ''),
+            "kind": str(getattr(span, 'kind', '')),
+            "start_time": getattr(span, 'start_time', 0),
+            "end_time": getattr(span, 'end_time', 0),
+            "attributes": dict(getattr(span, 'attributes', {})),
+            "status": str(getattr(span, 'status', '')),
+            "events": [str(event) for event in getattr(span, 'events', [])]
+        }
+    except Exception as e:
+        return {"span_error": str(e)}
+
+
+def _number(value: Any, cast=float) -> Any:
+    try:
+        return cast(value or 0)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def span_usage(attributes: Dict[str, Any]) -> Tuple[int, int, float, float]:
+    """(input_tokens, output_tokens, input_cost, output_cost), GenAI semantic convention first, then OpenInference"""
+    return (
+        _number(attributes.get("gen_ai.usage.input_tokens", attributes.get("llm.token_count.prompt", 0)), int),
+        _number(attributes.get("gen_ai.usage.output_tokens", attributes.get("llm.token_count.completion", 0)), int),
+        _number(attributes.get("gen_ai.usage.input_cost", attributes.get("cost_prompt", 0.0))),
+        _number(attributes.get("gen_ai.usage.output_cost", attributes.get("cost_completion", 0.0))),
+    )
+
+
+def span_cost_columns(spans: List[Dict[str, Any]], price_table: ModelPriceTable = None) -> Dict[str, List[Any]]:
+    """Per-span usage as columns (input/output tokens, cost, model); unrecorded costs are priced from the table"""
+    attributes = [span.get("attributes") or {} for span in spans]
+    usage = [span_usage(attrs) for attrs in attributes]
+    input_tokens = [row[0] for row in usage]
+    output_tokens = [row[1] for row in usage]
+    costs = [row[2] + row[3] for row in usage]
+    models = [attrs.get("llm.model_name") or attrs.get("gen_ai.request.model") for attrs in attributes]
+
+    # Only spans with tokens but no recorded cost need the table (one memoized lookup per model)
+    unpriced = [i for i, cost in enumerate(costs) if cost == 0 and (input_tokens[i] or output_tokens[i])]
+    if unpriced:
+        table = price_table or get_model_price_table()
+        for i in unpriced:
+            rates = table.rates(models[i]) if models[i] else None
+            if rates is not None:
+                costs[i] = input_tokens[i] * rates[0] + output_tokens[i] * rates[1]
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "cost": costs, "model": models}
+
+
+@dataclass
+class TraceSummary:
+    """Everything execution finalization needs from an agent trace"""
+    spans: List[Dict[str, Any]] = field(default_factory=list)
+    cost_info: Dict[str, Any] = field(default_factory=dict)
+    performance: Dict[str, Any] = field(default_factory=dict)
+    node_metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    final_output: Any = None
+
+    def agent_trace(self) -> Dict[str, Any]:
+        """Agent trace for the execution record; its spans live once, at trace['spans']"""
+        return {
+            "final_output": self.final_output,
+            "cost_info": self.cost_info,
+            "performance": self.performance,
+            "metadata": {"total_spans": len(self.spans)},
+        }
+
+
+def summarize_trace(agent_trace: Any, execution_time: float = 0.0, price_table: ModelPriceTable = None) -> TraceSummary:
+    """Cost, token, performance and per-node aggregates from one pass over a trace's spans"""
+    summary = TraceSummary()
+    summary.performance = {"total_duration_ms": execution_time * 1000}
+    if not agent_trace:
+        summary.cost_info = {"total_cost": 0, "total_tokens": 0, "input_tokens": 0, "output_tokens": 0}
+        return summary
+
+    if isinstance(agent_trace, dict):
+        spans = agent_trace.get("spans") or []
+        base_performance = agent_trace.get("performance") or {}
+        summary.final_output = agent_trace.get("final_output")
+    else:
+        # Raw any-agent trace object
+        spans = [serialize_span(span) for span in getattr(agent_trace, 'spans', None) or []]
+        base_performance = {}
+        summary.final_output = getattr(agent_trace, 'final_output', None)
+    summary.spans = spans
+
+    columns = span_cost_columns(spans, price_table)
+    total_cost = sum(columns["cost"])
+    input_tokens = sum(columns["input_tokens"])
+    output_tokens = sum(columns["output_tokens"])
+    unpriced_models = {
+        model or "unknown"
+        for model, cost, tokens_in, tokens_out in zip(columns["model"], columns["cost"], columns["input_tokens"], columns["output_tokens"])
+        if cost == 0 and (tokens_in or tokens_out)
+    }
+
+    node_metrics: Dict[str, Dict[str, Any]] = {}
+    for i, span in enumerate(spans):
+        node_id = span.get("workflow_node_id") or (span.get("attributes") or {}).get("workflow_node_id")
+        if not node_id:
+            continue
+        metrics = node_metrics.get(node_id)
+        if metrics is None:
+            metrics = node_metrics[node_id] = {
+                "node_name": span.get("workflow_node") or (span.get("attributes") or {}).get("workflow_node") or node_id,
+                "span_count": 0, "duration_ms": 0.0, "total_cost": 0.0, "input_tokens": 0, "output_tokens": 0,
+                "start_time": None, "end_time": None,
+            }
+        metrics["span_count"] += 1
+        metrics["total_cost"] += columns["cost"][i]
+        metrics["input_tokens"] += columns["input_tokens"][i]
+        metrics["output_tokens"] += columns["output_tokens"][i]
+        if span.get("start_time") and span.get("end_time"):
+            # Nested spans overlap, so a node's duration is the extent of its spans
+            if metrics["start_time"] is None or span["start_time"] < metrics["start_time"]:
+                metrics["start_time"] = span["start_time"]
+            if metrics["end_time"] is None or span["end_time"] > metrics["end_time"]:
+                metrics["end_time"] = span["end_time"]
+            metrics["duration_ms"] = (metrics["end_time"] - metrics["start_time"]) / 1_000_000
+
+    if not spans and hasattr(agent_trace, 'get_total_cost'):
+        # Trace objects without spans only report totals
+        try:
+            totals = agent_trace.get_total_cost()
+            total_cost = getattr(totals, 'total_cost', 0) or 0
+            input_tokens = getattr(totals, 'input_tokens', 0) or 0
+            output_tokens = getattr(totals, 'output_tokens', 0) or 0
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read trace cost totals: {e}")
+
+    summary.cost_info = {
+        "total_cost": total_cost,
+        "total_tokens": input_tokens + output_tokens,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+    }
+    summary.performance = {
+        **base_performance,
+        "total_duration_ms": base_performance.get("total_duration_ms", execution_time * 1000),
+        "span_count": len(spans),
+        **summary.cost_info,
+    }
+    summary.node_metrics = node_metrics
+
+    if unpriced_models:
+        logger.warning(f"⚠️  Spans with tokens but no cost (models without a known price): {sorted(unpriced_models)}")
+    logger.info(f"💰 Trace summary: {len(spans)} spans, ${total_cost:.6f}, {input_tokens + output_tokens} tokens, {len(node_metrics)} nodes")
+    return summary
@@ -5,58 +5,28 @@ Converts visual workflow definitions from the frontend into any-agent's
 native multi-agent orchestration format.
 """
 
+import asyncio
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass
 from any_agent import AgentConfig, AgentFramework, AnyAgent
 import json
 import traceback
 import os
 import logging
-from jsonpath_ng import jsonpath, parse
-
-# Import MCP manager (with fallback for backwards compatibility)
-try:
-    from mcp_manager import get_mcp_manager, is_mcp_enabled
-    MCP_INTEGRATION_AVAILABLE = True
-except ImportError:
-    logging.warning("MCP integration not available")
-    MCP_INTEGRATION_AVAILABLE = False
-    
-    # Fallback functions
-    def get_mcp_manager():
-        return None
-    
-    def is_mcp_enabled():
-        return False
+from agent_worker_pool import get_agent_worker_pool
+from agent_pool import get_agent_instance_pool
+from agent_streaming import run_agent_with_output_stream, with_output_stream_callback
+from workflow_graph import WorkflowGraph, get_node_label, get_node_type
+from workflow_plan import CompiledWorkflowPlan
+from conditional_router import CompiledRule, compile_router, router_input
+from trace_summary import span_cost_columns
 
-# Import enhanced search tools with better error handling
-try:
-    from enhanced_search_tools import search_web, visit_webpage
-    print("✅ Using ENHANCED web search tools with DuckDuckGo error handling")
-    logging.info("✅ Production: Enhanced web search tools loaded successfully")
-except ImportError:
-    # Fallback to real any-agent tools
-    try:
-        from any_agent.tools import search_web as real_search_web, visit_webpage as real_visit_webpage
-        # Use real tools when available
-        search_web = real_search_web
-        visit_webpage = real_visit_webpage
-        print("✅ Using REAL any-agent web search tools")
-        logging.info("✅ Production: REAL web search tools loaded successfully")
-    except ImportError:
-        # Final fallback to mock functions for backwards compatibility
-        def search_web(query: str):
-            result = f"Mock search results for: {query}"
-            logging.warning(f"⚠️  MOCK SEARCH executed for query: {query}")
-            return result
-
-        def visit_webpage(url: str):
-            result = f"Mock webpage content for: {url}"
-            logging.warning(f"⚠️  MOCK WEBPAGE visit for URL: {url}")
-            return result
-        print("⚠️  Using MOCK web search tools (any-agent not available)")
-        logging.warning("⚠️  Production: MOCK web search tools in use (real tools not available)")
+# Process-wide tool registry (built-in, Composio and MCP tools)
+from tool_registry import (
+    ToolRegistry, get_tool_registry, get_mcp_manager, is_mcp_enabled,
+    MCP_INTEGRATION_AVAILABLE, search_web, visit_webpage
+)
 
 @dataclass
 class VisualWorkflowNode:
@@ -80,178 +50,10 @@ class VisualWorkflowEdge:
 class VisualToAnyAgentTranslator:
     """Translates visual workflows to any-agent multi-agent configurations"""
     
-    def __init__(self):
-        # Initialize with existing tools (backwards compatible)
-        self.available_tools = {
-            "search_web": search_web,
-            "visit_webpage": visit_webpage,
-            # Add aliases for frontend compatibility
-            "web_search": search_web,  # Frontend alias for search_web
-            "WebSearch": search_web,   # UI display name alias
-            "webpage_visit": visit_webpage,  # Alternative naming
-            "visit_page": visit_webpage,     # Alternative naming
-        }
-        
-        # Add Composio tools for workflow execution
-        self._add_composio_tools()
-        
-        # Add MCP tools if available and enabled
-        self._update_available_tools()
-    
-    def _add_composio_tools(self):
-        """Add Composio tools to available_tools for workflow execution"""
-        try:
-            # Import our Composio bridge for per-user execution
-            from composio_http_manager import ComposioHttpClient, UserContext
-            
-            # Create placeholder functions for each Composio tool that will be executed with user context
-            composio_tools = {
-                "composio_github_star_repo": self._create_composio_tool_wrapper("github_star_repo"),
-                "composio_github_create_issue": self._create_composio_tool_wrapper("github_create_issue"),
-                "composio_slack_send_message": self._create_composio_tool_wrapper("slack_send_message"),
-                "composio_gmail_send_email": self._create_composio_tool_wrapper("gmail_send_email"),
-                "composio_googledocs_create_doc": self._create_composio_tool_wrapper("GOOGLEDOCS_CREATE_DOCUMENT"),
-                "composio_googlesheets_create_sheet": self._create_composio_tool_wrapper("googlesheets_create_sheet"),
-                "composio_googledrive_upload": self._create_composio_tool_wrapper("googledrive_upload"),
-                "composio_googlecalendar_create_event": self._create_composio_tool_wrapper("googlecalendar_create_event"),
-                "composio_notion_create_page": self._create_composio_tool_wrapper("notion_create_page"),
-                "composio_linear_create_issue": self._create_composio_tool_wrapper("linear_create_issue"),
-                "composio_trello_create_card": self._create_composio_tool_wrapper("trello_create_card"),
-                "composio_airtable_create_record": self._create_composio_tool_wrapper("airtable_create_record"),
-                "composio_jira_create_issue": self._create_composio_tool_wrapper("jira_create_issue")
-            }
-            
-            self.available_tools.update(composio_tools)
-            logging.info(f"✅ Added {len(composio_tools)} Composio tools for workflow execution")
-            
-        except ImportError as e:
-            logging.warning(f"⚠️  Composio integration not available for workflow execution: {e}")
-    
-    def _create_composio_tool_wrapper(self, tool_name: str):
-        """Create a wrapper function for a Composio tool that can be used in workflows"""
-        
-        def composio_tool_wrapper(input_text: str = "", title: str = "", text: str = "") -> str:
-            """Wrapper that executes Composio tool with user context during workflow execution"""
-            try:
-                # Import here to avoid circular imports
-                from composio_http_manager import ComposioHttpClient, UserContext
-                import asyncio
-                import os
-                
-                # Extract parameters from input_text and specific parameters
-                params = {}
-                if input_text:
-                    params["input"] = input_text
-                if title:
-                    params["title"] = title
-                if text:
-                    params["text"] = text
-                
-                # Get user context from environment (set by MCP server config)
-                api_key = os.getenv('COMPOSIO_API_KEY', '')
-                user_id = os.getenv('USER_ID', 'default_user')
-                enabled_tools_str = os.getenv('ENABLED_TOOLS', '')
-                
-                # Parse enabled tools
-                enabled_tools = []
-                if enabled_tools_str:
-                    enabled_tools = [tool.strip() for tool in enabled_tools_str.split(',') if tool.strip()]
-                
-                # Check if we have a valid API key
-                if not api_key:
-                    return f"❌ No Composio API key configured. Please set your API key in user settings to enable real {tool_name} execution."
-                
-                # Create user context
-                user_context = UserContext(
-                    user_id=user_id,
-                    api_key=api_key,
-                    enabled_tools=enabled_tools if enabled_tools else None,
-                    preferences={}
-                )
-                
-                # Execute the tool for real using the ComposioHttpClient
-                manager = ComposioHttpClient()
-                
-                # Run the async execution in the current event loop or create a new one
-                try:
-                    # Try to get the current event loop
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        # If we're already in an async context, create a new event loop in a thread
-                        import concurrent.futures
-                        import threading
-                        
-                        def run_in_new_loop():
-                            new_loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(new_loop)
-                            try:
-                                return new_loop.run_until_complete(
-                                    manager.execute_tool_for_user(tool_name, params, user_context)
-                                )
-                            finally:
-                                new_loop.close()
-                        
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(run_in_new_loop)
-                            result = future.result(timeout=30)  # 30 second timeout
-                    else:
-                        # We can run directly in the current loop
-                        result = loop.run_until_complete(
-                            manager.execute_tool_for_user(tool_name, params, user_context)
-                        )
-                except RuntimeError:
-                    # No event loop, create one
-                    result = asyncio.run(
-                        manager.execute_tool_for_user(tool_name, params, user_context)
-                    )
-                
-                # Format the result for the workflow
-                if result.get("success"):
-                    success_msg = f"✅ Successfully executed {tool_name}"
-                    if "result" in result:
-                        success_msg += f"\n\nResult: {result['result']}"
-                    logging.info(f"🎯 Composio tool executed successfully: {tool_name} for user {user_context.user_id}")
-                    return success_msg
-                elif "mock_result" in result:
-                    # This is a mock execution (no real API key or connection)
-                    mock_msg = f"🔧 Mock execution of {tool_name}: {result['mock_result']}"
-                    if "message" in result:
-                        mock_msg += f"\n💡 {result['message']}"
-                    logging.info(f"🔧 Composio tool mock execution: {tool_name}")
-                    return mock_msg
-                else:
-                    # Real execution failed
-                    error_msg = f"❌ Failed to execute {tool_name}: {result.get('error', 'Unknown error')}"
-                    if "message" in result:
-                        error_msg += f"\n💡 {result['message']}"
-                    logging.error(f"❌ Composio tool execution failed: {tool_name} - {result.get('error')}")
-                    return error_msg
-                
-            except Exception as e:
-                error_msg = f"❌ Error executing Composio tool {tool_name}: {str(e)}"
-                logging.error(error_msg)
-                return error_msg
-        
-        # Set function metadata for debugging
-        composio_tool_wrapper.__name__ = f"composio_{tool_name}"
-        composio_tool_wrapper.__doc__ = f"Composio {tool_name} integration - executes real actions"
-        
-        return composio_tool_wrapper
-    
-    def _update_available_tools(self):
-        """Safely add MCP tools to existing tool set"""
-        if not is_mcp_enabled() or not MCP_INTEGRATION_AVAILABLE:
-            logging.debug("MCP tools not enabled or not available")
-            return
-        
-        try:
-            mcp_manager = get_mcp_manager()
-            if mcp_manager:
-                mcp_tools = mcp_manager.get_available_tools()
-                self.available_tools.update(mcp_tools)
-                logging.info(f"Added {len(mcp_tools)} MCP tools to available tools")
-        except Exception as e:
-            logging.warning(f"Failed to load MCP tools, continuing with built-in tools only: {e}")
+    def __init__(self, tool_registry: Optional[ToolRegistry] = None):
+        # Read-only snapshot of the shared tool registry; rebuilt only when tools change
+        self.tool_registry = tool_registry or get_tool_registry()
+        self.available_tools = self.tool_registry.snapshot()
     
     def get_available_tool_info(self) -> Dict[str, Dict[str, Any]]:
         """Get information about all available tools for UI display"""
@@ -624,105 +426,18 @@ def _run_any_agent_in_process(main_agent_config_dict: Dict, managed_agents_confi
         from any_agent import AgentConfig, AgentFramework, AnyAgent
         from typing import Any
         
-        # Import the real tools for agent configuration
-        from any_agent.tools import search_web, visit_webpage
-        
         # Create a logger for subprocess
         import logging
         logging.basicConfig(level=logging.INFO)
         logger = logging.getLogger(__name__)
-        logger.info(f"🔧 Production subprocess: Imported real tools - search_web: {search_web.__name__}, visit_webpage: {visit_webpage.__name__}")
         
         # Helper function to map tool names to actual tool functions
         def get_actual_tools(tool_names):
-            # Basic tools with all possible aliases
-            tool_map = {
-                "search_web": search_web,
-                "visit_webpage": visit_webpage,
-                # Add aliases for frontend compatibility
-                "web_search": search_web,  # Frontend sends this!
-                "WebSearch": search_web,   # UI display name
-                "webpage_visit": visit_webpage,
-                "visit_page": visit_webpage
-            }
-            
-            logger.info(f"🔧 Subprocess tool map initialized with {len(tool_map)} base tools")
-            
-            # Add Composio tools by recreating the tool wrappers in subprocess
-            try:
-                # Import Composio bridge in subprocess
-                sys.path.insert(0, os.path.dirname(__file__))
-                from composio_http_manager import ComposioHttpClient, UserContext
-                
-                # Create Composio tool wrappers in subprocess
-                def create_composio_wrapper(tool_name):
-                    def wrapper(input_text: str = "", title: str = "", text: str = "") -> str:
-                        try:
-                            import asyncio
-                            import os
-                            
-                            # Get user context from environment
-                            api_key = os.getenv('COMPOSIO_API_KEY', '')
-                            user_id = os.getenv('USER_ID', 'default_user')
-                            
-                            if not api_key:
-                                return f"❌ No Composio API key configured for {tool_name}"
-                            
-                            # Create user context
-                            user_context = UserContext(
-                                user_id=user_id,
-                                api_key=api_key,
-                                enabled_tools=None,
-                                preferences={}
-                            )
-                            
-                            # Extract parameters from input_text and specific parameters
-                            params = {}
-                            if input_text:
-                                params["input"] = input_text
-                            if title:
-                                params["title"] = title
-                            if text:
-                                params["text"] = text
-                            
-                            # Execute the tool
-                            manager = ComposioHttpClient()
-                            result = asyncio.run(
-                                manager.execute_tool_for_user(tool_name, params, user_context)
-                            )
-                            
-                            if result.get("success"):
-                                return f"✅ {tool_name} executed successfully: {result.get('result', 'Done')}"
-                            else:
-                                return f"❌ {tool_name} failed: {result.get('error', 'Unknown error')}"
-                                
-                        except Exception as e:
-                            return f"❌ {tool_name} error: {str(e)}"
-                    
-                    wrapper.__name__ = f"composio_{tool_name}"
-                    return wrapper
-                
-                # Add Composio tools to the map
-                composio_tools = {
-                    "composio_googledocs_create_doc": create_composio_wrapper("GOOGLEDOCS_CREATE_DOCUMENT"),
-                    "composio_github_star_repo": create_composio_wrapper("github_star_repo"),
-                    "composio_github_create_issue": create_composio_wrapper("github_create_issue"),
-                    "composio_slack_send_message": create_composio_wrapper("slack_send_message"),
-                    "composio_gmail_send_email": create_composio_wrapper("gmail_send_email"),
-                    "composio_googlesheets_create_sheet": create_composio_wrapper("googlesheets_create_sheet"),
-                    "composio_googledrive_upload": create_composio_wrapper("googledrive_upload"),
-                    "composio_googlecalendar_create_event": create_composio_wrapper("googlecalendar_create_event"),
-                    "composio_notion_create_page": create_composio_wrapper("notion_create_page"),
-                    "composio_linear_create_issue": create_composio_wrapper("linear_create_issue"),
-                    "composio_trello_create_card": create_composio_wrapper("trello_create_card"),
-                    "composio_airtable_create_record": create_composio_wrapper("airtable_create_record"),
-                    "composio_jira_create_issue": create_composio_wrapper("jira_create_issue")
-                }
-                tool_map.update(composio_tools)
-                logger.info(f"🔧 Subprocess: Added {len(composio_tools)} Composio tools to tool map")
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Subprocess: Could not load Composio tools: {e}")
+            # Same tool map as the main process (built-in aliases, Composio wrappers, MCP tools)
+            sys.path.insert(0, os.path.dirname(__file__))
+            from tool_registry import get_tool_registry
+            tool_map = get_tool_registry().snapshot()
+            logger.info(f"🔧 Subprocess tool map initialized with {len(tool_map)} tools")
             
             # Map tool names to functions
             mapped_tools = []
@@ -821,7 +536,6 @@ def _extract_trace_from_result(result) -> Dict[str, Any]:
         
         # Debug logging
         logger.info(f"🔍 Trace extraction: result type = {type(result)}")
-        logger.info(f"🔍 Trace extraction: result attributes = {dir(result) if hasattr(result, '__dict__') else 'N/A'}")
         
         trace_data = {
             "final_output": result,
@@ -834,7 +548,7 @@ def _extract_trace_from_result(result) -> Dict[str, Any]:
         if hasattr(result, 'spans'):
             spans = getattr(result, 'spans', [])
             logger.info(f"🔍 Trace extraction: Found {len(spans)} spans")
-            for i, span in enumerate(spans):
+            for span in spans:
                 span_data = {
                     "name": getattr(span, 'name', 'unknown'),
                     "span_id": getattr(span, 'span_id', None),
@@ -855,7 +569,6 @@ def _extract_trace_from_result(result) -> Dict[str, Any]:
                     span_data["duration_ms"] = duration_ns / 1_000_000
                 
                 trace_data["spans"].append(span_data)
-                logger.info(f"  Span {i}: {span_data['name']}, attrs: {list(span_data['attributes'].keys())}")
         else:
             logger.info("🔍 Trace extraction: No 'spans' attribute found on result")
         
@@ -877,51 +590,17 @@ def _extract_trace_from_result(result) -> Dict[str, Any]:
         else:
             logger.info("🔍 Trace extraction: No 'get_total_cost' method found")
         
-        # If get_total_cost didn't work, manually aggregate from spans
+        # If get_total_cost didn't work, aggregate from the spans in one columnar pass
         if not trace_data["cost_info"] or trace_data["cost_info"].get("total_cost", 0) == 0:
-            total_input_tokens = 0
-            total_output_tokens = 0
-            total_input_cost = 0.0
-            total_output_cost = 0.0
-            
-            for i, span in enumerate(trace_data["spans"]):
-                attrs = span.get("attributes", {})
-                
-                # Debug: Log available attributes for the first few spans
-                if i < 3:
-                    logger.info(f"🔍 Span {i} attributes: {list(attrs.keys())}")
-                    for key in attrs.keys():
-                        if any(keyword in key.lower() for keyword in ['token', 'cost', 'usage']):
-                            logger.info(f"   {key}: {attrs[key]}")
-                
-                # Extract token counts using GenAI semantic convention or fallback to OpenInference
-                input_tokens = attrs.get("gen_ai.usage.input_tokens", attrs.get("llm.token_count.prompt", 0))
-                output_tokens = attrs.get("gen_ai.usage.output_tokens", attrs.get("llm.token_count.completion", 0))
-                input_cost = attrs.get("gen_ai.usage.input_cost", attrs.get("cost_prompt", 0.0))
-                output_cost = attrs.get("gen_ai.usage.output_cost", attrs.get("cost_completion", 0.0))
-                
-                # Debug: Log extracted values
-                if i < 3 and (input_tokens > 0 or output_tokens > 0 or input_cost > 0 or output_cost > 0):
-                    logger.info(f"🔍 Span {i} extracted: tokens={input_tokens}+{output_tokens}, cost=${input_cost:.6f}+${output_cost:.6f}")
-                
-                total_input_tokens += input_tokens
-                total_output_tokens += output_tokens
-                total_input_cost += input_cost
-                total_output_cost += output_cost
-            
-            total_cost = total_input_cost + total_output_cost
-            total_tokens = total_input_tokens + total_output_tokens
-            
+            columns = span_cost_columns(trace_data["spans"])
+            input_tokens = sum(columns["input_tokens"])
+            output_tokens = sum(columns["output_tokens"])
             trace_data["cost_info"] = {
-                "total_cost": total_cost,
-                "total_tokens": total_tokens,
-                "input_tokens": total_input_tokens,
-                "output_tokens": total_output_tokens,
-                "input_cost": total_input_cost,
-                "output_cost": total_output_cost
+                "total_cost": sum(columns["cost"]),
+                "total_tokens": input_tokens + output_tokens,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens
             }
-            
-            # Debug: Log final cost info
             logger.info(f"💰 Final trace cost info: {trace_data['cost_info']}")
         
         # Calculate performance metrics
@@ -959,162 +638,289 @@ def _ensure_string_input(input_data: Any) -> str:
         return str(input_data)
 
 
-async def _execute_graph_step_by_step(nodes: List[Dict], edges: List[Dict], input_data: str, framework: str, translator: VisualToAnyAgentTranslator, execution_id: str, websocket: Any) -> Dict[str, Any]:
+async def _create_agent(framework: str, agent_config: AgentConfig) -> AnyAgent:
+    """Create an any-agent agent without blocking the event loop"""
+    worker_pool = get_agent_worker_pool()
+    agent_framework = AgentFramework.from_string(framework.upper())
+    agent_config = with_output_stream_callback(agent_config)
+    if worker_pool.native_async and hasattr(AnyAgent, "create_async"):
+        return await AnyAgent.create_async(agent_framework=agent_framework, agent_config=agent_config)
+    return await worker_pool.run(AnyAgent.create, agent_framework=agent_framework, agent_config=agent_config)
+
+
+class GraphExecutionError(Exception):
+    """Raised by a workflow node to abort the run with a user-facing error"""
+
+
+def _edge_key(edge: Dict[str, Any]) -> str:
+    """Stable key for an edge dict (ids are optional in older saved workflows)"""
+    return edge.get('id') or f"{edge['source']}:{edge.get('sourceHandle', 'default')}->{edge['target']}"
+
+
+def _notify_node_event(on_node_event: Optional[Callable[[str, str], None]], node_id: str, status: str):
+    """Report a node status change to the caller without letting callback errors abort the run"""
+    if on_node_event is None:
+        return
+    try:
+        on_node_event(node_id, status)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"⚠️  Node event callback failed for {node_id}: {e}")
+
+
+def _combine_node_outputs(graph: WorkflowGraph, node_ids: List[str], node_outputs: Dict[str, Any]) -> Any:
+    """Combine the outputs of several nodes into the input of a join node"""
+    if len(node_ids) == 1:
+        return node_outputs[node_ids[0]]
+    return "\n\n".join(
+        f"**{get_node_label(graph.node_map[node_id])}:**\n{_ensure_string_input(node_outputs[node_id])}"
+        for node_id in node_ids
+    )
+
+
+async def _execute_graph_node(node_id: str, node_input: Any, graph: WorkflowGraph, input_data: str, framework: str,
+                              translator: VisualToAnyAgentTranslator, execution_id: str, websocket: Any,
+                              all_agent_traces: List[Dict], plan: Optional[CompiledWorkflowPlan] = None,
+                              json_cache: Optional[Dict[int, tuple]] = None) -> tuple:
+    """
+    Execute a single workflow node.
+
+    Returns (output, live_edges) where live_edges is None when every outgoing edge
+    carries the output, or the list of edges selected by a conditional node.
+    """
+    logger = logging.getLogger(__name__)
+    worker_pool = get_agent_worker_pool()
+    current_node = graph.node_map[node_id]
+    node_type = get_node_type(current_node)
+    print(f"Executing node: {node_id} ({node_type})")
+
+    if node_type == 'input':
+        # Input nodes just pass the data through
+        return node_input, None
+
+    if node_type == 'agent':
+        # Tools wired into this agent's tool port become its tools
+        if plan is not None:
+            agent_config = plan.agent_config(node_id, framework, translator)
+        else:
+            agent_nodes = [current_node] + graph.attached_tool_nodes(node_id)
+            agent_config, _ = translator.translate_workflow(agent_nodes, graph.tool_edges.get(node_id, []), framework)
+        # Ensure agent input is a string
+        string_input = _ensure_string_input(node_input)
+        # Reuse a pooled agent for this configuration and run it on the worker pool
+        # so the event loop keeps serving other requests
+        agent_pool = get_agent_instance_pool()
+        async with agent_pool.lease(framework, agent_config, lambda: _create_agent(framework, agent_config)) as agent:
+            result = await agent_pool.run(agent, run_agent_with_output_stream(agent, string_input, websocket, execution_id, node_id))
+
+        # Collect trace data from this agent execution
+        logger.info(f"🔍 Collecting trace from agent node {node_id}")
+        agent_trace_data = _extract_trace_from_result(result)
+
+        # Generate intelligent step name that combines node purpose with context
+        base_node_name = current_node.get('data', {}).get('name', node_id)
+        node_instructions = current_node.get('data', {}).get('instructions', '')
+
+        # Create descriptive step name
+        if node_instructions:
+            # Extract key action from instructions
+            step_description = _extract_step_purpose(node_instructions, input_data)
+            intelligent_step_name = f"{base_node_name} - {step_description}"
+        else:
+            intelligent_step_name = base_node_name
+
+        # IMPORTANT: Mark spans with workflow context to prevent separate execution records
+        if agent_trace_data and "spans" in agent_trace_data:
+            for span in agent_trace_data["spans"]:
+                if "attributes" not in span:
+                    span["attributes"] = {}
+                # Add workflow context to prevent this span from creating separate execution
+                span["attributes"]["workflow_node"] = intelligent_step_name
+                span["attributes"]["workflow_node_id"] = node_id
+                span["attributes"]["workflow_step_type"] = "agent_node"
+                logger.info(f"🏷️  Tagged span with workflow context: {intelligent_step_name}")
+
+        all_agent_traces.append({
+            "node_id": node_id,
+            "node_name": base_node_name,  # Keep original node name
+            "step_name": intelligent_step_name,  # New: descriptive step name
+            "trace": agent_trace_data
+        })
+        logger.info(f"📊 Agent trace collected: {len(agent_trace_data.get('spans', []))} spans, cost=${agent_trace_data.get('cost_info', {}).get('total_cost', 0):.6f}")
+        return result.final_output, None
+
+    if node_type == 'tool':
+        tool_name = current_node.get('data', {}).get('tool_type')
+        if tool_name not in translator.available_tools:
+            raise GraphExecutionError(f"Tool '{tool_name}' not found.")
+        tool_func = translator.available_tools[tool_name]
+        # The input to a tool could be a string or JSON. We pass it as is.
+        return await worker_pool.run(tool_func, node_input), None
+
+    if node_type == 'conditional':
+        # Rules are evaluated against a dict; chained routers share the parsed JSON of the same input
+        eval_input = router_input(node_input, json_cache)
+        router = plan.conditional_routers.get(node_id) if plan is not None else None
+        if router is None:
+            edges_by_handle = {}
+            for edge in graph.outgoing[node_id]:
+                edges_by_handle.setdefault(edge.get('sourceHandle'), edge)
+            router = compile_router(current_node, edges_by_handle)
+        chosen_edge = router.route(eval_input)
+
+        # Send path_taken message over WebSocket
+        if chosen_edge and websocket:
+            await websocket.send_json({
+                "type": "path_taken",
+                "execution_id": execution_id,
+                "edge_id": chosen_edge['id']
+            })
+
+        # Conditionals route their input unchanged; untaken branches are skipped
+        return node_input, [chosen_edge] if chosen_edge else []
+
+    # Output and unknown node types pass the data through
+    return node_input, None
+
+
+async def _execute_graph_step_by_step(nodes: List[Dict], edges: List[Dict], input_data: str, framework: str, translator: VisualToAnyAgentTranslator, execution_id: str, websocket: Any, on_node_event: Optional[Callable[[str, str], None]] = None, plan: Optional[CompiledWorkflowPlan] = None) -> Dict[str, Any]:
     """
-    Executes a workflow step-by-step, handling conditional logic and sending progress.
+    Executes a workflow as a dependency graph, handling conditional logic and sending progress.
+
+    A node runs once all of its incoming edges are resolved, so independent branches run
+    concurrently (capped by WORKFLOW_MAX_PARALLEL_NODES) and nodes with several inputs
+    join them. Nodes reachable only through untaken conditional paths are skipped.
+    on_node_event(node_id, status) is called as nodes start ("running") and finish
+    ("completed", "failed" or "skipped"). A compiled plan supplies the prebuilt graph,
+    conditional edge maps and translated agent configs.
     """
     print(f"🔍 Step-by-step execution for {execution_id}: {len(nodes)} nodes")
-    
-    node_map = {node['id']: node for node in nodes}
-    current_input = input_data
-    
+
+    graph = plan.graph if plan is not None else WorkflowGraph.from_dicts(nodes, edges)
+    logger = logging.getLogger(__name__)
+
     # Collect trace data from all agent executions
     all_agent_traces = []
-    logger = logging.getLogger(__name__)
-    
-    # Find the start node (a node with no incoming edges)
-    # This is a simplification; a robust implementation should handle multiple start nodes or triggers.
-    all_node_ids = set(node_map.keys())
-    target_node_ids = set(edge['target'] for edge in edges)
-    start_node_ids = all_node_ids - target_node_ids
-    
+    # Parsed JSON of conditional inputs, shared by routers that see the same output
+    parsed_router_inputs: Dict[int, tuple] = {}
+
+    # Every node without incoming data edges starts with the workflow input
+    start_node_ids = graph.start_node_ids
     if not start_node_ids:
         return {"error": "Could not find a start node for the workflow."}
-    
-    # For now, we'll start with one of the start nodes.
-    current_node_id = start_node_ids.pop()
-
-    while current_node_id:
-        current_node = node_map[current_node_id]
-        node_type = current_node.get('data', {}).get('type') or current_node.get('type')
-        print(f"Executing node: {current_node_id} ({node_type})")
-
-        if node_type == 'input':
-            # Input nodes just pass the data through
-            pass
-        elif node_type == 'agent':
-            agent_config, _ = translator.translate_workflow([current_node], [], framework)
-            agent = AnyAgent.create(agent_framework=AgentFramework.from_string(framework.upper()), agent_config=agent_config)
-            # Ensure agent input is a string
-            string_input = _ensure_string_input(current_input)
-            result = agent.run(string_input)
-            current_input = result.final_output
-            
-            # Collect trace data from this agent execution
-            logger.info(f"🔍 Collecting trace from agent node {current_node_id}")
-            agent_trace_data = _extract_trace_from_result(result)
-            
-            # Generate intelligent step name that combines node purpose with context
-            base_node_name = current_node.get('data', {}).get('name', current_node_id)
-            node_instructions = current_node.get('data', {}).get('instructions', '')
-            
-            # Create descriptive step name
-            if node_instructions:
-                # Extract key action from instructions
-                step_description = _extract_step_purpose(node_instructions, input_data)
-                intelligent_step_name = f"{base_node_name} - {step_description}"
-            else:
-                intelligent_step_name = base_node_name
-            
-            # IMPORTANT: Mark spans with workflow context to prevent separate execution records
-            if agent_trace_data and "spans" in agent_trace_data:
-                for span in agent_trace_data["spans"]:
-                    if "attributes" not in span:
-                        span["attributes"] = {}
-                    # Add workflow context to prevent this span from creating separate execution
-                    span["attributes"]["workflow_node"] = intelligent_step_name
-                    span["attributes"]["workflow_node_id"] = current_node_id
-                    span["attributes"]["workflow_step_type"] = "agent_node"
-                    logger.info(f"🏷️  Tagged span with workflow context: {intelligent_step_name}")
-            
-            all_agent_traces.append({
-                "node_id": current_node_id,
-                "node_name": base_node_name,  # Keep original node name
-                "step_name": intelligent_step_name,  # New: descriptive step name
-                "trace": agent_trace_data
-            })
-            logger.info(f"📊 Agent trace collected: {len(agent_trace_data.get('spans', []))} spans, cost=${agent_trace_data.get('cost_info', {}).get('total_cost', 0):.6f}")
-        elif node_type == 'tool':
-            tool_name = current_node.get('data', {}).get('tool_type')
-            if tool_name in translator.available_tools:
-                tool_func = translator.available_tools[tool_name]
-                # The input to a tool could be a string or JSON. We pass it as is.
-                current_input = tool_func(current_input)
+
+    max_parallel_nodes = max(1, int(os.getenv("WORKFLOW_MAX_PARALLEL_NODES", "4")))
+    semaphore = asyncio.Semaphore(max_parallel_nodes)
+    node_index = {node_id: index for index, node_id in enumerate(graph.node_order)}
+
+    node_outputs: Dict[str, Any] = {}
+    live_edge_keys = set()  # edges that carried an output
+    unresolved_inputs = {node_id: len(graph.incoming[node_id]) for node_id in graph.executable_node_ids}
+    completed_order: List[str] = []
+    skipped_node_ids: List[str] = []
+    running: Dict[asyncio.Task, str] = {}
+
+    async def run_node(node_id: str, node_input: Any) -> tuple:
+        async with semaphore:
+            _notify_node_event(on_node_event, node_id, "running")
+            try:
+                result = await _execute_graph_node(
+                    node_id, node_input, graph, input_data, framework,
+                    translator, execution_id, websocket, all_agent_traces, plan, parsed_router_inputs
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _notify_node_event(on_node_event, node_id, "failed")
+                raise
+            _notify_node_event(on_node_event, node_id, "completed")
+            return result
+
+    def resolve_outgoing(node_id: str, live_edges: Optional[List[Dict]]) -> List[str]:
+        """Mark a finished node's outgoing edges and return targets that became ready"""
+        ready = []
+        for edge in graph.outgoing[node_id]:
+            if live_edges is None or any(edge is live for live in live_edges):
+                live_edge_keys.add(_edge_key(edge))
+            target = edge['target']
+            unresolved_inputs[target] -= 1
+            if unresolved_inputs[target] == 0:
+                ready.append(target)
+        return ready
+
+    def activate(ready_node_ids: List[str]):
+        """Start ready nodes, propagating skips through untaken branches"""
+        pending = sorted(ready_node_ids, key=node_index.get, reverse=True)
+        while pending:
+            node_id = pending.pop()
+            incoming_edges = graph.incoming[node_id]
+            if not incoming_edges:
+                node_input = input_data
             else:
-                return {"error": f"Tool '{tool_name}' not found."}
-        elif node_type == 'conditional':
-            next_node_id = None
-            # The input for evaluation needs to be a dictionary.
-            # We will try to parse the current_input if it's a stringified JSON.
-            eval_input = {}
-            if isinstance(current_input, str):
+                live_sources = list(dict.fromkeys(
+                    edge['source'] for edge in incoming_edges if _edge_key(edge) in live_edge_keys
+                ))
+                if not live_sources:
+                    print(f"⏭️  Skipping node {node_id}: no active inputs")
+                    skipped_node_ids.append(node_id)
+                    _notify_node_event(on_node_event, node_id, "skipped")
+                    pending.extend(sorted(resolve_outgoing(node_id, []), key=node_index.get, reverse=True))
+                    continue
+                node_input = _combine_node_outputs(graph, live_sources, node_outputs)
+            running[asyncio.create_task(run_node(node_id, node_input))] = node_id
+
+    activate(start_node_ids)
+
+    try:
+        while running:
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: node_index[running[t]]):
+                node_id = running.pop(task)
                 try:
-                    eval_input = json.loads(current_input)
-                except json.JSONDecodeError:
-                    # If it's not JSON, we can't evaluate rules.
-                    # We could wrap it in a dictionary to allow basic checks.
-                    eval_input = {"result": current_input}
-            elif isinstance(current_input, dict):
-                eval_input = current_input
-
-            conditions = current_node.get('data', {}).get('conditions', [])
-            for condition in conditions:
-                if 'rule' in condition and _evaluate_condition(condition['rule'], eval_input):
-                    # Find the edge corresponding to this condition's handle
-                    edge = next((e for e in edges if e['source'] == current_node_id and e['sourceHandle'] == condition['id']), None)
-                    if edge:
-                        next_node_id = edge['target']
-                        break
-            
-            # Handle default/fallback case
-            if not next_node_id:
-                default_condition = next((c for c in conditions if c.get('is_default')), None)
-                if default_condition:
-                    edge = next((e for e in edges if e['source'] == current_node_id and e['sourceHandle'] == default_condition['id']), None)
-                    if edge:
-                        next_node_id = edge['target']
-            
-            # NEW: Send path_taken message over WebSocket
-            if next_node_id:
-                await websocket.send_json({
-                    "type": "path_taken",
-                    "execution_id": execution_id,
-                    "edge_id": edge['id']
-                })
-
-            current_node_id = next_node_id
-            continue
-
-        # Find the next node for non-conditional nodes
-        next_edge = next((edge for edge in edges if edge['source'] == current_node_id), None)
-        if next_edge:
-            current_node_id = next_edge['target']
-        else:
-            current_node_id = None
-    
+                    output, live_edges = task.result()
+                except GraphExecutionError as e:
+                    return {"error": str(e)}
+                node_outputs[node_id] = output
+                completed_order.append(node_id)
+                activate(resolve_outgoing(node_id, live_edges))
+    finally:
+        # Stop sibling branches if one node failed
+        for task in running:
+            task.cancel()
+
+    never_ran = [node_id for node_id, remaining in unresolved_inputs.items() if remaining > 0]
+    if never_ran:
+        logger.warning(f"⚠️  Nodes never became ready (cycle or dangling input): {never_ran}")
+
+    # Final output comes from the nodes where data flow ended
+    terminal_node_ids = [
+        node_id for node_id in completed_order
+        if not any(_edge_key(edge) in live_edge_keys for edge in graph.outgoing[node_id])
+    ]
+    final_output = _combine_node_outputs(graph, terminal_node_ids, node_outputs) if terminal_node_ids else input_data
+
     # Aggregate all trace data from agent executions
     logger.info(f"🔗 Aggregating traces from {len(all_agent_traces)} agent executions")
-    print(f"🔍 DEBUG: Step-by-step execution completed with {len(all_agent_traces)} agent nodes:")
+    print(f"🔍 DEBUG: Step-by-step execution completed with {len(all_agent_traces)} agent nodes ({len(skipped_node_ids)} skipped):")
     for i, trace_info in enumerate(all_agent_traces):
         spans_count = len(trace_info["trace"].get("spans", []))
         cost = trace_info["trace"].get("cost_info", {}).get("total_cost", 0)
         step_name = trace_info.get('step_name', trace_info['node_name'])
         print(f"  Step {i+1}: {step_name} ({trace_info['node_id']}) - {spans_count} spans, ${cost:.6f}")
-    
-    aggregated_trace = _aggregate_agent_traces(all_agent_traces, current_input)
-    
+
+    aggregated_trace = _aggregate_agent_traces(all_agent_traces, final_output)
+
     # Final debug output
     result = {
-        "final_output": current_input,
+        "final_output": final_output,
         "agent_trace": aggregated_trace,
         "execution_pattern": "step_by_step",
         "main_agent": all_agent_traces[0]["step_name"] if all_agent_traces else "unknown",
         "managed_agents": [trace["step_name"] for trace in all_agent_traces[1:]] if len(all_agent_traces) > 1 else [],
         "framework_used": framework
     }
-    
+
     print(f"🏁 Completed {execution_id}: {result['main_agent']}")
-    
+
     return result
 
 
@@ -1264,60 +1070,41 @@ def _evaluate_condition(rule: Dict[str, str], data: Dict[str, Any]) -> bool:
     Supports operators: equals, contains, not_equals, greater_than, less_than
     """
     try:
-        jsonpath_expression = parse(rule['jsonpath'])
-        match = jsonpath_expression.find(data)
-        
-        if not match:
-            return False
-
-        extracted_value = match[0].value
-        rule_value = rule['value']
-        operator = rule['operator']
-
-        if operator == 'equals':
-            return str(extracted_value) == rule_value
-        elif operator == 'contains':
-            return rule_value in str(extracted_value)
-        elif operator == 'not_equals':
-            return str(extracted_value) != rule_value
-        elif operator == 'greater_than':
-            try:
-                # Try to compare as numbers
-                return float(extracted_value) > float(rule_value)
-            except (ValueError, TypeError):
-                # Fall back to string comparison
-                return str(extracted_value) > rule_value
-        elif operator == 'less_than':
-            try:
-                # Try to compare as numbers
-                return float(extracted_value) < float(rule_value)
-            except (ValueError, TypeError):
-                # Fall back to string comparison
-                return str(extracted_value) < rule_value
-        
-        return False
+        return CompiledRule(rule).matches(data)
     except Exception as e:
         print(f"Error evaluating condition: {e}")
         return False
 
 
-async def execute_visual_workflow_with_anyagent(nodes: List[Dict], edges: List[Dict], input_data: str, framework: str = "openai", execution_id: str = None, websocket: Any = None) -> Dict[str, Any]:
+async def execute_visual_workflow_with_anyagent(nodes: List[Dict], edges: List[Dict], input_data: str, framework: str = "openai", execution_id: str = None, websocket: Any = None, on_node_event: Optional[Callable[[str, str], None]] = None, plan: Optional[CompiledWorkflowPlan] = None) -> Dict[str, Any]:
     """
     Execute a visual workflow using any-agent's native multi-agent orchestration
     """
+    # Cheap: the translator only snapshots the shared tool registry
     translator = VisualToAnyAgentTranslator()
     
-    # Debug: Log available tools at execution time
-    translator.debug_available_tools()
-    
-    if execution_id and websocket:
-        return await _execute_graph_step_by_step(nodes, edges, input_data, framework, translator, execution_id, websocket)
+    if execution_id:
+        # Step-by-step runs whenever there is an execution to report on; the WebSocket is optional
+        return await _execute_graph_step_by_step(nodes, edges, input_data, framework, translator, execution_id, websocket, on_node_event, plan)
     else:
         # Fallback to old execution model if no execution context is provided
         # Enhanced to include intelligent step naming for single-node workflows
         main_agent_config, _ = translator.translate_workflow(nodes, edges, framework)
-        agent = AnyAgent.create(agent_framework=AgentFramework.from_string(framework.upper()), agent_config=main_agent_config)
-        result = agent.run(input_data)
+        executable_node_ids = [n["id"] for n in nodes if n.get("type") in ["agent", "tool"]]
+        for node_id in executable_node_ids:
+            _notify_node_event(on_node_event, node_id, "running")
+        try:
+            agent_pool = get_agent_instance_pool()
+            async with agent_pool.lease(framework, main_agent_config, lambda: _create_agent(framework, main_agent_config)) as agent:
+                # The whole workflow runs as one agent, so its stream is attributed to the first executable node
+                stream_node_id = executable_node_ids[0] if executable_node_ids else "workflow"
+                result = await agent_pool.run(agent, run_agent_with_output_stream(agent, input_data, websocket, execution_id, stream_node_id))
+        except Exception:
+            for node_id in executable_node_ids:
+                _notify_node_event(on_node_event, node_id, "failed")
+            raise
+        for node_id in executable_node_ids:
+            _notify_node_event(on_node_event, node_id, "completed")
         
         # Generate intelligent step name for single-node workflows
         if nodes:
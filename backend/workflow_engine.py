@@ -13,6 +13,8 @@ from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 from any_agent import AnyAgent, AgentConfig, AgentFramework
 from any_agent.tools import search_web
+from agent_pool import get_agent_instance_pool
+from agent_worker_pool import get_agent_worker_pool
 
 
 class NodeType(Enum):
@@ -402,29 +404,26 @@ class WorkflowExecutionEngine:
             tools=[]  # TODO: Add tools based on node configuration
         )
         
-        # Execute agent in thread pool (same as before to avoid event loop conflicts)
-        def run_agent():
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                agent = AnyAgent.create(
-                    agent_framework=context.framework,
-                    agent_config=agent_config
-                )
-                
-                result = agent.run(prompt=prompt)
-                agent.exit()
-                
-                return str(result.final_output) if hasattr(result, 'final_output') else str(result)
-            finally:
-                loop.close()
+        # Reuse a pooled agent for this configuration; run it on the shared worker
+        # pool to avoid event loop conflicts without blocking the loop
+        worker_pool = get_agent_worker_pool()
+        
+        async def create_agent():
+            return await worker_pool.run(
+                AnyAgent.create,
+                agent_framework=context.framework,
+                agent_config=agent_config
+            )
+        
+        agent_pool = get_agent_instance_pool()
+        async with agent_pool.lease(context.framework, agent_config, create_agent) as agent:
+            # On timeout the worker thread keeps running; the pool closes the agent once it finishes
+            agent_result = await asyncio.wait_for(
+                agent_pool.run(agent, worker_pool.run(agent.run, prompt=prompt)),
+                timeout=60  # 60 second timeout
+            )
         
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_agent)
-            result = future.result(timeout=60)  # 60 second timeout
+        result = str(agent_result.final_output) if hasattr(agent_result, 'final_output') else str(agent_result)
         
         return {
             "result": result,
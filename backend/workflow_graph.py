@@ -0,0 +1,161 @@
+"""
+Workflow Graph
+
+Dependency view over the visual workflow node/edge dicts, shared by the
+step-by-step graph runner. Separates data-flow edges from tool attachment
+edges (edges into an agent's 'tool' handle) and indexes both directions.
+Also provides the linear-time structural analysis used by validation.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+def get_node_type(node: Dict[str, Any]) -> str:
+    """Resolve the execution type of a node dict (data.type wins over node.type)"""
+    return node.get('data', {}).get('type') or node.get('type')
+
+
+def get_node_label(node: Dict[str, Any]) -> str:
+    """Human readable node name used when combining outputs"""
+    data = node.get('data', {})
+    return data.get('name') or data.get('label') or node['id']
+
+
+@dataclass
+class WorkflowGraph:
+    """Adjacency indexes for a visual workflow"""
+    node_map: Dict[str, Dict[str, Any]]
+    node_order: List[str]
+    incoming: Dict[str, List[Dict[str, Any]]]
+    outgoing: Dict[str, List[Dict[str, Any]]]
+    tool_edges: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    attached_tool_ids: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_dicts(cls, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> "WorkflowGraph":
+        """Build the graph from the frontend node and edge dicts"""
+        node_map = {node['id']: node for node in nodes}
+        node_order = [node['id'] for node in nodes]
+        incoming = {node_id: [] for node_id in node_order}
+        outgoing = {node_id: [] for node_id in node_order}
+        tool_edges: Dict[str, List[Dict[str, Any]]] = {}
+
+        for edge in edges:
+            source, target = edge.get('source'), edge.get('target')
+            if source not in node_map or target not in node_map:
+                continue
+            if edge.get('targetHandle') == 'tool':
+                # Tool wired into an agent's tool port: a capability, not a data dependency
+                tool_edges.setdefault(target, []).append(edge)
+                continue
+            outgoing[source].append(edge)
+            incoming[target].append(edge)
+
+        # Attached tools only run inside their agent, never as standalone steps
+        attached_tool_ids = {
+            edge['source']
+            for agent_edges in tool_edges.values()
+            for edge in agent_edges
+            if not incoming[edge['source']] and not outgoing[edge['source']]
+        }
+
+        return cls(
+            node_map=node_map,
+            node_order=node_order,
+            incoming=incoming,
+            outgoing=outgoing,
+            tool_edges=tool_edges,
+            attached_tool_ids=attached_tool_ids,
+        )
+
+    @property
+    def executable_node_ids(self) -> List[str]:
+        """Nodes that run as workflow steps, in definition order"""
+        return [node_id for node_id in self.node_order if node_id not in self.attached_tool_ids]
+
+    @property
+    def start_node_ids(self) -> List[str]:
+        """Executable nodes without incoming data-flow edges"""
+        return [node_id for node_id in self.executable_node_ids if not self.incoming[node_id]]
+
+    def attached_tool_nodes(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Tool nodes wired into the given agent's tool port"""
+        return [self.node_map[edge['source']] for edge in self.tool_edges.get(agent_id, [])]
+
+
+@dataclass
+class GraphAnalysis:
+    """Structural facts about a workflow graph, computed in O(V+E)"""
+    start_nodes: List[str]
+    end_nodes: List[str]
+    topological_order: List[str]
+    has_cycle: bool
+    blocked_nodes: Set[str]  # nodes on or downstream of a cycle (no topological position)
+    reachable: Set[str]      # nodes reachable from any start node
+    longest_path: int        # nodes on the longest start-to-end path (0 with a cycle)
+    path_count: int          # distinct start-to-end paths (0 with a cycle)
+
+
+def analyze_graph(node_ids: Iterable[str], edges: Iterable[Tuple[str, str]]) -> GraphAnalysis:
+    """Cycle detection, reachability, longest path and path count in one topological pass.
+
+    `edges` are (source, target) pairs; edges touching unknown nodes are ignored.
+    """
+    node_ids = list(dict.fromkeys(node_ids))
+    outgoing: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    in_degree: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+    for source, target in edges:
+        if source in outgoing and target in in_degree:
+            outgoing[source].append(target)
+            in_degree[target] += 1
+
+    start_nodes = [node_id for node_id in node_ids if in_degree[node_id] == 0]
+    end_nodes = [node_id for node_id in node_ids if not outgoing[node_id]]
+
+    # Kahn's algorithm, carrying per-node DP values along the order
+    remaining = dict(in_degree)
+    depth = {node_id: 1 for node_id in start_nodes}       # longest path ending here
+    paths_to = {node_id: 1 for node_id in start_nodes}    # start-to-here path count
+    queue = deque(start_nodes)
+    order: List[str] = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for target in outgoing[node_id]:
+            depth[target] = max(depth.get(target, 0), depth[node_id] + 1)
+            paths_to[target] = paths_to.get(target, 0) + paths_to[node_id]
+            remaining[target] -= 1
+            if remaining[target] == 0:
+                queue.append(target)
+
+    has_cycle = len(order) < len(node_ids)
+    blocked_nodes = {node_id for node_id in node_ids if remaining[node_id] > 0}
+
+    # Everything the DP touched hangs off a start node; nodes stuck behind a
+    # cycle are reachable too, so finish reachability with a plain traversal
+    reachable = set(depth)
+    stack = [node_id for node_id in blocked_nodes if node_id in reachable]
+    while stack:
+        for target in outgoing[stack.pop()]:
+            if target not in reachable:
+                reachable.add(target)
+                stack.append(target)
+
+    if has_cycle:
+        longest_path = path_count = 0
+    else:
+        longest_path = max((depth[node_id] for node_id in end_nodes), default=0)
+        path_count = sum(paths_to[node_id] for node_id in end_nodes)
+
+    return GraphAnalysis(
+        start_nodes=start_nodes,
+        end_nodes=end_nodes,
+        topological_order=order,
+        has_cycle=has_cycle,
+        blocked_nodes=blocked_nodes,
+        reachable=reachable,
+        longest_path=longest_path,
+        path_count=path_count,
+    )
@@ -0,0 +1,179 @@
+"""
+Compiled Workflow Plans
+
+Everything that only depends on a workflow's definition - validation, the
+dependency graph, topological order, compiled conditional routers, per-agent
+translated configs and the structural identity - is prepared once per
+canonical content hash and kept in a bounded LRU. Repeated runs of the same
+workflow (webhooks, experiments, re-runs from the designer) skip straight to
+execution.
+
+The canonical hash ignores layout-only fields (node positions), so dragging
+nodes around the canvas does not invalidate a plan.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from conditional_router import ConditionalRouter, compile_router
+from workflow_graph import GraphAnalysis, WorkflowGraph, analyze_graph, get_node_type
+
+# Node keys that only affect the canvas layout
+_LAYOUT_KEYS = ("position", "positionAbsolute", "width", "height", "selected", "dragging")
+
+
+def canonical_workflow_hash(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> str:
+    """Content hash of a workflow definition, ignoring layout-only fields"""
+    canonical = {
+        "nodes": [{key: value for key, value in node.items() if key not in _LAYOUT_KEYS} for node in nodes],
+        "edges": edges,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CompiledWorkflowPlan:
+    """Validated, indexed form of a workflow definition shared by every run of it"""
+    workflow_hash: str
+    nodes: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+    validation: Dict[str, Any]
+    graph: Optional[WorkflowGraph] = None            # None when validation failed
+    analysis: Optional[GraphAnalysis] = None         # over data-flow edges
+    conditional_edges: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)  # node -> sourceHandle -> edge
+    conditional_routers: Dict[str, ConditionalRouter] = field(default_factory=dict)
+    identity: Optional[Dict[str, Any]] = None        # structural identity, filled on first run
+    compiled_at: float = field(default_factory=time.time)
+    _agent_configs: Dict[Tuple[str, str], Tuple[Any, Any]] = field(default_factory=dict, repr=False)
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.validation.get("valid"))
+
+    @property
+    def topological_order(self) -> List[str]:
+        return self.analysis.topological_order if self.analysis else []
+
+    def agent_config(self, node_id: str, framework: str, translator: Any) -> Any:
+        """Translated AgentConfig for an agent node with its attached tools, memoized per tool registry snapshot"""
+        key = (node_id, str(framework).lower())
+        cached = self._agent_configs.get(key)
+        if cached is not None and cached[0] is translator.available_tools:
+            return cached[1]
+        agent_nodes = [self.graph.node_map[node_id]] + self.graph.attached_tool_nodes(node_id)
+        agent_config, _ = translator.translate_workflow(agent_nodes, self.graph.tool_edges.get(node_id, []), framework)
+        self._agent_configs[key] = (translator.available_tools, agent_config)
+        return agent_config
+
+
+def compile_workflow_plan(workflow_hash: str, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]],
+                          validate: Callable[[List[Dict], List[Dict]], Dict[str, Any]]) -> CompiledWorkflowPlan:
+    """Validate a private copy of the workflow and build its indexes"""
+    # Validation normalizes node data in place, and the plan outlives the request
+    nodes = copy.deepcopy(nodes)
+    edges = copy.deepcopy(edges)
+    validation = validate(nodes, edges)
+    plan = CompiledWorkflowPlan(workflow_hash=workflow_hash, nodes=nodes, edges=edges, validation=validation)
+    if not plan.valid:
+        return plan
+
+    graph = WorkflowGraph.from_dicts(nodes, edges)
+    plan.graph = graph
+    plan.analysis = analyze_graph(
+        graph.executable_node_ids,
+        ((edge["source"], edge["target"]) for node_id in graph.executable_node_ids for edge in graph.outgoing[node_id])
+    )
+    for node_id in graph.node_order:
+        if get_node_type(graph.node_map[node_id]) == "conditional":
+            handles: Dict[str, Dict[str, Any]] = {}
+            for edge in graph.outgoing[node_id]:
+                handles.setdefault(edge.get("sourceHandle"), edge)
+            plan.conditional_edges[node_id] = handles
+            plan.conditional_routers[node_id] = compile_router(graph.node_map[node_id], handles)
+    return plan
+
+
+class WorkflowPlanCache:
+    """Bounded LRU of compiled plans keyed by canonical workflow hash"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max(1, max_entries if max_entries is not None else int(os.getenv("WORKFLOW_PLAN_CACHE_SIZE", "256")))
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[str, CompiledWorkflowPlan]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.compiles = 0
+        self.invalid_plans = 0
+        self.evictions = 0
+        self.compile_time_ms = 0.0
+
+    def get_or_compile(self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]],
+                       validate: Callable[[List[Dict], List[Dict]], Dict[str, Any]]) -> Tuple[CompiledWorkflowPlan, bool]:
+        """Return (plan, cache_hit), compiling and caching the plan on a miss"""
+        workflow_hash = canonical_workflow_hash(nodes, edges)
+        with self._lock:
+            plan = self._plans.get(workflow_hash)
+            if plan is not None:
+                self._plans.move_to_end(workflow_hash)
+                self.hits += 1
+                return plan, True
+            self.misses += 1
+
+        started = time.perf_counter()
+        plan = compile_workflow_plan(workflow_hash, nodes, edges, validate)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.compiles += 1
+            self.compile_time_ms += elapsed_ms
+            if not plan.valid:
+                self.invalid_plans += 1
+            # A concurrent compile of the same workflow may have won; keep the first plan
+            plan = self._plans.setdefault(workflow_hash, plan)
+            self._plans.move_to_end(workflow_hash)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+                self.evictions += 1
+        return plan, False
+
+    def clear(self):
+        """Drop every cached plan"""
+        with self._lock:
+            self._plans.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/compile metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._plans),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "compiles": self.compiles,
+                "invalid_plans": self.invalid_plans,
+                "evictions": self.evictions,
+                "avg_compile_ms": round(self.compile_time_ms / self.compiles, 3) if self.compiles else 0.0,
+            }
+
+
+# Global plan cache instance
+_workflow_plan_cache: Optional[WorkflowPlanCache] = None
+
+
+def get_workflow_plan_cache() -> WorkflowPlanCache:
+    """Get or create the global workflow plan cache"""
+    global _workflow_plan_cache
+    if _workflow_plan_cache is None:
+        _workflow_plan_cache = WorkflowPlanCache()
+    return _workflow_plan_cache
@@ -4,7 +4,7 @@ import React, { useState, useEffect } from 'react'
 import { 
   FlaskConical, Play, Plus, FileText, BarChart3, Clock, 
   CheckCircle, XCircle, AlertCircle, Eye, Download, Upload,
-  Settings, Trash2, Edit, Copy, Filter, Search, RefreshCw, X, Loader2
+  Settings, Trash2, Edit, Copy, Filter, Search, RefreshCw, X
 } from 'lucide-react'
 import { EvaluationCase, EvaluationRun, EvaluationMetrics, EVALUATION_TEMPLATES, EvaluationTemplateKey } from '../types/evaluation'
 import { EvaluationCaseEditor } from './evaluations/EvaluationCaseEditor'
@@ -28,16 +28,6 @@ export default function EvaluationsPage() {
   const [statusFilter, setStatusFilter] = useState<'all' | 'completed' | 'running' | 'failed'>('all')
   const [saveStatus, setSaveStatus] = useState<{ type: 'idle' | 'saving' | 'success' | 'error', message?: string }>({ type: 'idle' })
   const [runStatus, setRunStatus] = useState<{ type: 'idle' | 'running' | 'success' | 'error', message?: string }>({ type: 'idle' })
-  const [runProgress, setRunProgress] = useState<{
-    [runId: string]: {
-      current_step?: number
-      total_steps?: number
-      current_activity?: string
-      percentage?: number
-      elapsed_ms?: number
-    }
-  }>({})
-  const [progressPolling, setProgressPolling] = useState<{[runId: string]: NodeJS.Timeout}>({})
 
   useEffect(() => {
     fetchEvaluationData()
@@ -61,6 +51,7 @@ export default function EvaluationsPage() {
       // Transform the data to match our types
       const transformedCases = casesData.cases.map((caseData: any) => ({
         llm_judge: caseData.llm_judge,
+        judge_mode: caseData.judge_mode,
         checkpoints: caseData.checkpoints,
         ground_truth: caseData.ground_truth,
         final_output_criteria: caseData.final_output_criteria || []
@@ -131,20 +122,27 @@ export default function EvaluationsPage() {
     setRunStatus({ type: 'running', message: 'Starting evaluation run...' })
     
     try {
+      // The run endpoint judges the final output of a workflow execution
+      if (!runConfig.traceId) {
+        throw new Error('Enter the execution ID of the workflow run to evaluate')
+      }
+
       // Prepare the request data
       const requestData = {
+        name: runConfig.name,
+        execution_id: runConfig.traceId,
         evaluation_case_id: runConfig.evaluationCase.id,
-        run_name: runConfig.name,
-        description: runConfig.description,
-        trace_id: runConfig.traceId,
-        // Note: File upload would need separate handling for actual file content
-        trace_file_name: runConfig.traceFile?.name,
-        llm_judge: runConfig.evaluationCase.llm_judge,
-        checkpoints: runConfig.evaluationCase.checkpoints,
-        ground_truth: runConfig.evaluationCase.ground_truth,
-        final_output_criteria: runConfig.evaluationCase.final_output_criteria || []
+        model: runConfig.evaluationCase.llm_judge,
+        evaluation_criteria: {
+          final_output_criteria: runConfig.evaluationCase.final_output_criteria || []
+        },
+        // Sent so the backend can reject them instead of silently skipping them
+        checkpoints: runConfig.evaluationCase.checkpoints || [],
+        ground_truth: runConfig.evaluationCase.ground_truth || [],
+        judge_mode: runConfig.evaluationCase.judge_mode
       }
 
+      const startedAt = Date.now()
       const response = await fetch(`${BACKEND_URL}/api/evaluations/run`, {
         method: 'POST',
         headers: {
@@ -155,46 +153,45 @@ export default function EvaluationsPage() {
 
       const data = await response.json()
 
-      if (response.ok && data.evaluation_id) {        
-        // Create a temporary run entry to show in the table immediately
-        const tempRun: EvaluationRun = {
-          id: data.evaluation_id,
+      if (response.ok && data.evaluation) {
+        // Judging finishes within the request, so the run is complete (and saved) already
+        const completedRun: EvaluationRun = {
+          id: data.run_id,
           name: runConfig.name,
           evaluation_case: runConfig.evaluationCase,
-          status: 'running',
+          status: 'completed',
           result: {
-            trace: null, // Will be populated when complete
-            hypothesis_answer: null, // Will be populated when complete
-            score: 0,
-            total_points: 0,
-            earned_points: 0,
+            trace: null,
+            hypothesis_answer: null,
+            score: data.evaluation.score,
+            total_points: data.evaluation.total_points,
+            earned_points: data.evaluation.earned_points,
             checkpoint_results: [],
             ground_truth_results: [],
-            final_output_results: []
+            final_output_results: data.evaluation.results
           },
-          duration_ms: 0,
-          created_at: new Date().toISOString(),
-          trace_id: runConfig.traceId || ''
+          duration_ms: Date.now() - startedAt,
+          created_at: new Date(startedAt).toISOString(),
+          trace_id: runConfig.traceId
         }
         
-        // Add the temp run to the state immediately
-        setEvaluationRuns(prev => [tempRun, ...prev])
-        
-        // Start progress polling
-        startProgressPolling(data.evaluation_id)
+        setEvaluationRuns(prev => [completedRun, ...prev])
         
-        // Close modal and refresh data
+        // Close modal and switch to runs tab to show the new run
         setShowRunModal(false)
         setSelectedCase(null)
-        
-        // Switch to runs tab to show the new run
         setActiveTab('runs')
         
-        // Clear any previous status
-        setRunStatus({ type: 'idle' })
+        setRunStatus({ 
+          type: 'success', 
+          message: `✅ Evaluation completed: ${data.evaluation.earned_points}/${data.evaluation.total_points} points (${data.judge_mode} judging)` 
+        })
+        setTimeout(() => {
+          setRunStatus({ type: 'idle' })
+        }, 5000)
         
       } else {
-        throw new Error(data.message || 'Failed to start evaluation')
+        throw new Error(data.detail || data.message || 'Failed to start evaluation')
       }
     } catch (error) {
       console.error('Failed to start evaluation:', error)
@@ -210,137 +207,6 @@ export default function EvaluationsPage() {
     }
   }
 
-  const startProgressPolling = (evaluationId: string) => {
-    // Clear any existing polling
-    if (progressPolling[evaluationId]) {
-      clearInterval(progressPolling[evaluationId])
-    }
-
-    let isPolling = true // Local flag to track if we should continue polling
-
-    const pollProgress = async () => {
-      if (!isPolling) return // Stop if polling was cancelled
-      
-      try {
-        const response = await fetch(`${BACKEND_URL}/api/evaluations/runs/${evaluationId}/progress`)
-        if (response.ok) {
-          const progressData = await response.json()
-          setRunProgress(prev => ({
-            ...prev,
-            [evaluationId]: {
-              current_step: progressData.progress?.current_step,
-              total_steps: progressData.progress?.total_steps,
-              current_activity: progressData.progress?.current_activity || '',
-              percentage: progressData.progress?.percentage || 0,
-              elapsed_ms: progressData.elapsed_ms || 0
-            }
-          }))
-          
-          if (progressData.status === 'completed') {
-            // Evaluation completed - STOP polling immediately
-            isPolling = false
-            if (progressPolling[evaluationId]) {
-              clearInterval(progressPolling[evaluationId])
-              setProgressPolling(prev => {
-                const newState = { ...prev }
-                delete newState[evaluationId]
-                return newState
-              })
-            }
-            
-            const duration = progressData.elapsed_ms ? `${Math.round(progressData.elapsed_ms / 1000)}s` : 'unknown time'
-            setRunStatus({ 
-              type: 'success', 
-              message: `✅ Evaluation completed successfully in ${duration}!` 
-            })
-            
-            // Clear progress for this run
-            setRunProgress(prev => {
-              const newState = { ...prev }
-              delete newState[evaluationId]
-              return newState
-            })
-            
-            // Refresh the evaluation data to get the actual completed results
-            fetchEvaluationData()
-            
-            // Clear success message after 5 seconds
-            setTimeout(() => {
-              setRunStatus({ type: 'idle' })
-            }, 5000)
-          } else if (progressData.status === 'failed') {
-            // Evaluation failed - STOP polling immediately
-            isPolling = false
-            if (progressPolling[evaluationId]) {
-              clearInterval(progressPolling[evaluationId])
-              setProgressPolling(prev => {
-                const newState = { ...prev }
-                delete newState[evaluationId]
-                return newState
-              })
-            }
-            
-            setRunStatus({ 
-              type: 'error', 
-              message: `❌ Evaluation failed` 
-            })
-            
-            // Clear progress for this run
-            setRunProgress(prev => {
-              const newState = { ...prev }
-              delete newState[evaluationId]
-              return newState
-            })
-            
-            // Clear error message after 5 seconds
-            setTimeout(() => {
-              setRunStatus({ type: 'idle' })
-            }, 5000)
-          }
-        }
-      } catch (error) {
-        console.error('Failed to fetch progress:', error)
-        // On error, stop polling to prevent endless failed requests
-        isPolling = false
-        if (progressPolling[evaluationId]) {
-          clearInterval(progressPolling[evaluationId])
-          setProgressPolling(prev => {
-            const newState = { ...prev }
-            delete newState[evaluationId]
-            return newState
-          })
-        }
-      }
-    }
-
-    // Poll every 2 seconds
-    const interval = setInterval(pollProgress, 2000)
-    setProgressPolling(prev => ({
-      ...prev,
-      [evaluationId]: interval
-    }))
-    
-    // Initial poll
-    pollProgress()
-    
-    // Return cleanup function
-    return () => {
-      isPolling = false
-      clearInterval(interval)
-    }
-  }
-
-  // Cleanup polling on unmount
-  useEffect(() => {
-    return () => {
-      for (const runId in progressPolling) {
-        if (progressPolling[runId]) {
-          clearInterval(progressPolling[runId])
-        }
-      }
-    }
-  }, [progressPolling])
-
   const handleViewResults = (run: EvaluationRun) => {
     setSelectedRun(run)
     setShowResultsModal(true)
@@ -904,34 +770,6 @@ export default function EvaluationsPage() {
                         <td className="px-6 py-4 whitespace-nowrap">
                           <div className="text-sm font-medium text-gray-900">{run.name}</div>
                           <div className="text-sm text-gray-500">ID: {run.id}</div>
-                          {/* Show progress if run is active and has progress */}
-                          {run.status === 'running' && runProgress[run.id] && (
-                            <div className="mt-1">
-                              <div className="flex items-center gap-2 text-xs text-blue-600">
-                                <Loader2 className="w-3 h-3 animate-spin" />
-                                <span>
-                                  {runProgress[run.id].current_activity} 
-                                  {runProgress[run.id].current_step && runProgress[run.id].total_steps && (
-                                    <span> ({runProgress[run.id].current_step}/{runProgress[run.id].total_steps})</span>
-                                  )}
-                                  {runProgress[run.id].percentage !== undefined && (
-                                    <span> {Math.round(runProgress[run.id].percentage!)}%</span>
-                                  )}
-                                  {runProgress[run.id].elapsed_ms && (
-                                    <span> {Math.round(runProgress[run.id].elapsed_ms! / 1000)}s</span>
-                                  )}
-                                </span>
-                              </div>
-                              {runProgress[run.id].percentage !== undefined && (
-                                <div className="mt-1 w-full bg-gray-200 rounded-full h-1">
-                                  <div 
-                                    className="bg-blue-500 h-1 rounded-full transition-all duration-300 ease-out" 
-                                    style={{ width: `${runProgress[run.id].percentage}%` }}
-                                  />
-                                </div>
-                              )}
-                            </div>
-                          )}
                         </td>
                         <td className="px-6 py-4 whitespace-nowrap">
                           <div className="flex items-center gap-2">
@@ -133,6 +133,24 @@ export function EvaluationCaseEditor({ evaluationCase, isOpen, onClose, onSave,
               </select>
             </div>
 
+            {/* Judge Mode */}
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-2">
+                Judge Mode
+              </label>
+              <select
+                value={formData.judge_mode || 'per_criterion'}
+                onChange={(e) => setFormData({ ...formData, judge_mode: e.target.value as EvaluationCase['judge_mode'] })}
+                className="w-full border border-gray-300 rounded-lg px-3 py-2 focus:ring-2 focus:ring-purple-500 focus:border-transparent"
+              >
+                <option value="per_criterion">One judge call per criterion</option>
+                <option value="batched">Batched: all criteria in one judge call</option>
+              </select>
+              <p className="text-xs text-gray-500 mt-1">
+                Batched judging sends the answer once for every criterion, cutting judge calls and tokens
+              </p>
+            </div>
+
             {/* Checkpoints */}
             <div>
               <div className="flex items-center justify-between mb-4">
@@ -143,17 +143,17 @@ export function EvaluationRunModal({ evaluationCase, isOpen, onClose, onRun }: E
           {inputMethod === 'trace-id' && (
             <div>
               <label className="block text-sm font-medium text-gray-700 mb-2">
-                Trace ID *
+                Execution ID *
               </label>
               <input
                 type="text"
                 value={traceId}
                 onChange={(e) => setTraceId(e.target.value)}
-                placeholder="Enter the trace ID to evaluate"
+                placeholder="Enter the execution ID of the workflow run to evaluate"
                 className="w-full border border-gray-300 rounded-lg px-3 py-2 focus:ring-2 focus:ring-purple-500 focus:border-transparent"
               />
               <p className="text-xs text-gray-500 mt-1">
-                You can find trace IDs in the Analytics dashboard or Trace Viewer
+                You can find execution IDs in the Analytics dashboard or Trace Viewer
               </p>
             </div>
           )}
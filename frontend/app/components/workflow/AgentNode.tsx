@@ -22,7 +22,8 @@ import {
   Trash2,
   Clock,
   Loader2,
-  XCircle
+  XCircle,
+  MinusCircle
 } from 'lucide-react'
 import { NodeEditorModal } from './NodeEditorModal'
 import { EnhancedNodeData, AgentFramework, POPULAR_MODELS, FRAMEWORK_INFO, NodeExecutionStatus, NodeExecutionState } from '../../types/workflow'
@@ -64,6 +65,7 @@ const getNodeBorderColor = (type: string, executionStatus?: NodeExecutionStatus)
       case 'running': return 'border-blue-400 border-2 shadow-lg'
       case 'completed': return 'border-green-400 border-2 shadow-lg'
       case 'failed': return 'border-red-400 border-2 shadow-lg'
+      case 'skipped': return 'border-gray-300 border-2 border-dashed opacity-60'
       case 'waiting': return 'border-yellow-400 border-2 shadow-lg'
       case 'pending': return 'border-gray-400 border-2'
       default: break
@@ -175,6 +177,7 @@ const getExecutionStatusIcon = (status?: NodeExecutionStatus) => {
     case 'running': return <Loader2 className="w-4 h-4 text-blue-600 animate-spin" />
     case 'completed': return <CheckCircle className="w-4 h-4 text-green-600" />
     case 'failed': return <XCircle className="w-4 h-4 text-red-600" />
+    case 'skipped': return <MinusCircle className="w-4 h-4 text-gray-400" />
     case 'waiting': return <Clock className="w-4 h-4 text-yellow-600" />
     case 'pending': return <Clock className="w-4 h-4 text-gray-400" />
     default: return null
@@ -186,6 +189,7 @@ const getExecutionStatusText = (status?: NodeExecutionStatus) => {
     case 'running': return 'Running...'
     case 'completed': return 'Completed'
     case 'failed': return 'Failed'
+    case 'skipped': return 'Skipped'
     case 'waiting': return 'Waiting'
     case 'pending': return 'Pending'
     case 'idle':
@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { Play, Square, Loader2, Clock, CheckCircle, XCircle, AlertCircle, Send } from 'lucide-react'
+import { Play, Square, Loader2, Clock, CheckCircle, XCircle, AlertCircle, Send, MinusCircle } from 'lucide-react'
 import { WorkflowExecutionState, NodeExecutionStatus } from '../../types/workflow'
 import { WorkflowService } from '../../services/workflow'
 
@@ -18,6 +18,7 @@ const getStatusIcon = (status: NodeExecutionStatus) => {
     case 'running': return <Loader2 className="w-4 h-4 text-blue-600 animate-spin" />
     case 'completed': return <CheckCircle className="w-4 h-4 text-green-600" />
     case 'failed': return <XCircle className="w-4 h-4 text-red-600" />
+    case 'skipped': return <MinusCircle className="w-4 h-4 text-gray-400" />
     case 'waiting': return <Clock className="w-4 h-4 text-yellow-600" />
     case 'waiting_for_input': return <Clock className="w-4 h-4 text-orange-600" />
     case 'pending': return <Clock className="w-4 h-4 text-gray-400" />
@@ -31,6 +32,7 @@ const getStatusColor = (status: NodeExecutionStatus) => {
     case 'running': return 'bg-blue-100 text-blue-800'
     case 'completed': return 'bg-green-100 text-green-800'
     case 'failed': return 'bg-red-100 text-red-800'
+    case 'skipped': return 'bg-gray-100 text-gray-500 line-through'
     case 'waiting': return 'bg-yellow-100 text-yellow-800'
     case 'waiting_for_input': return 'bg-orange-100 text-orange-800'
     case 'pending': return 'bg-gray-100 text-gray-800'
@@ -53,7 +55,7 @@ export default function ExecutionProgressPanel({
   const nodeStates = executionState ? Array.from(executionState.nodes.entries()) : []
   const totalNodes = nodeStates.length
   const completedNodes = nodeStates.filter(([_, state]) => 
-    state.status === 'completed' || state.status === 'failed'
+    state.status === 'completed' || state.status === 'failed' || state.status === 'skipped'
   ).length
   const runningNodes = nodeStates.filter(([_, state]) => state.status === 'running').length
   const failedNodes = nodeStates.filter(([_, state]) => state.status === 'failed').length
@@ -15,6 +15,8 @@ function mapBackendStatusToFrontend(backendStatus: string): NodeExecutionStatus
       return 'completed'
     case 'failed':
       return 'failed'
+    case 'skipped':
+      return 'skipped'
     case 'waiting_for_input':
       return 'waiting_for_input'
     default:
@@ -100,7 +102,7 @@ export function ExecutionProvider({
       // Calculate overall progress
       const totalNodes = newNodeStates.size
       const completedNodes = Array.from(newNodeStates.values()).filter(
-        state => state.status === 'completed' || state.status === 'failed'
+        state => state.status === 'completed' || state.status === 'failed' || state.status === 'skipped'
       ).length
       const progress = totalNodes > 0 ? (completedNodes / totalNodes) * 100 : 0
 
@@ -113,7 +115,7 @@ export function ExecutionProvider({
       const hasRunning = Array.from(newNodeStates.values()).some(state => state.status === 'running')
       const hasFailed = Array.from(newNodeStates.values()).some(state => state.status === 'failed')
       const allCompleted = Array.from(newNodeStates.values()).every(
-        state => state.status === 'completed' || state.status === 'failed'
+        state => state.status === 'completed' || state.status === 'failed' || state.status === 'skipped'
       )
 
       let overallStatus: 'idle' | 'running' | 'completed' | 'failed' | 'waiting_for_input' = prev.status
@@ -177,6 +179,40 @@ export function ExecutionProvider({
           return;
         }
         
+        // Append streamed agent output to the node's partial output
+        if (data.type === 'node_output_delta') {
+          setExecutionState(prev => {
+            if (!prev) return prev
+            const nodeState = prev.nodes.get(data.node_id)
+            if (!nodeState || nodeState.streamingOutputOutOfSync) return prev
+            const current = nodeState.streamingOutput || ''
+            // Replayed chunks (after a reconnect) are already applied
+            if (data.offset < current.length) return prev
+            const newNodeStates = new Map(prev.nodes)
+            if (data.offset > current.length) {
+              // Deltas were dropped: stop appending until the final output replaces the text
+              newNodeStates.set(data.node_id, { ...nodeState, streamingOutputOutOfSync: true })
+            } else {
+              newNodeStates.set(data.node_id, { ...nodeState, streamingOutput: current + data.delta })
+            }
+            return { ...prev, nodes: newNodeStates }
+          })
+          return
+        }
+        
+        // The node's final output settles its streamed text (and resyncs after a gap)
+        if (data.type === 'node_output_final') {
+          setExecutionState(prev => {
+            if (!prev) return prev
+            const nodeState = prev.nodes.get(data.node_id)
+            if (!nodeState) return prev
+            const newNodeStates = new Map(prev.nodes)
+            newNodeStates.set(data.node_id, { ...nodeState, streamingOutput: data.output, streamingOutputOutOfSync: false })
+            return { ...prev, nodes: newNodeStates }
+          })
+          return
+        }
+        
         // Handle input received confirmation
         if (data.type === 'input_received') {
           console.log('✅ Input received confirmation:', data.user_input)
@@ -202,7 +238,7 @@ export function ExecutionProvider({
             updateNodeStatus(nodeId, {
               status: frontendStatus,
               startTime: frontendStatus === 'running' ? Date.now() : undefined,
-              endTime: ['completed', 'failed'].includes(frontendStatus) ? Date.now() : undefined,
+              endTime: ['completed', 'failed', 'skipped'].includes(frontendStatus) ? Date.now() : undefined,
               progress: data.progress.percentage || 0
             })
           })
@@ -223,10 +259,11 @@ export function ExecutionProvider({
           }
           
         } else if (data.status === 'completed') {
-          // Mark all nodes as completed
+          // Mark all nodes as completed, except those off the path the workflow took
           nodeIds.forEach(nodeId => {
+            const skipped = data.progress?.node_status?.[nodeId]?.status === 'skipped'
             updateNodeStatus(nodeId, {
-              status: 'completed',
+              status: skipped ? 'skipped' : 'completed',
               endTime: Date.now()
             })
           })
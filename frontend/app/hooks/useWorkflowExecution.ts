@@ -47,7 +47,7 @@ export function useWorkflowExecution(options: UseWorkflowExecutionOptions = {})
       // Calculate overall progress
       const totalNodes = newNodeStates.size
       const completedNodes = Array.from(newNodeStates.values()).filter(
-        state => state.status === 'completed' || state.status === 'failed'
+        state => state.status === 'completed' || state.status === 'failed' || state.status === 'skipped'
       ).length
       const progress = totalNodes > 0 ? (completedNodes / totalNodes) * 100 : 0
 
@@ -60,7 +60,7 @@ export function useWorkflowExecution(options: UseWorkflowExecutionOptions = {})
       const hasRunning = Array.from(newNodeStates.values()).some(state => state.status === 'running')
       const hasFailed = Array.from(newNodeStates.values()).some(state => state.status === 'failed')
       const allCompleted = Array.from(newNodeStates.values()).every(
-        state => state.status === 'completed' || state.status === 'failed'
+        state => state.status === 'completed' || state.status === 'failed' || state.status === 'skipped'
       )
 
       let overallStatus: 'idle' | 'running' | 'completed' | 'failed' | 'waiting_for_input' = prev.status
@@ -111,10 +111,11 @@ export function useWorkflowExecution(options: UseWorkflowExecutionOptions = {})
             })
           }
         } else if (data.status === 'completed') {
-          // Mark all nodes as completed (simplified for Phase 1)
+          // Mark all nodes as completed, except those off the path the workflow took
           nodeIds.forEach(nodeId => {
+            const skipped = data.progress?.node_status?.[nodeId]?.status === 'skipped'
             updateNodeStatus(nodeId, {
-              status: 'completed',
+              status: skipped ? 'skipped' : 'completed',
               endTime: Date.now()
             })
           })
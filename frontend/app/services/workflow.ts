@@ -66,6 +66,38 @@ export interface FrameworkInfo {
 
 const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000'
 
+interface PatchOperation {
+  op: 'add' | 'replace' | 'remove'
+  path: string
+  value?: any
+}
+
+/**
+ * Apply the backend's JSON-patch style execution deltas to a local copy of the state
+ */
+function applyPatch(state: Record<string, any>, ops: PatchOperation[]): Record<string, any> {
+  let root: any = state
+  for (const { op, path, value } of ops) {
+    if (path === '') {
+      root = op === 'remove' ? {} : value
+      continue
+    }
+    const keys = path.slice(1).split('/').map(key => key.replace(/~1/g, '/').replace(/~0/g, '~'))
+    const last = keys.pop() as string
+    let target = root
+    for (const key of keys) {
+      if (target[key] === null || typeof target[key] !== 'object') target[key] = {}
+      target = target[key]
+    }
+    if (op === 'remove') {
+      delete target[last]
+    } else {
+      target[last] = value
+    }
+  }
+  return root
+}
+
 export class WorkflowService {
   /**
    * Get available agent frameworks
@@ -263,10 +295,37 @@ export class WorkflowService {
         console.log('✅ WebSocket connected successfully')
       }
       
+      // Execution state is sent in full once ("status") and then as sequence-numbered
+      // deltas; rebuild the full state so listeners keep receiving complete updates
+      let executionState: Record<string, any> | null = null
+      let lastSeq = 0
+      let resyncRequested = false
+
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data)
-          onMessage(data)
+          if (data.type === 'status') {
+            const { seq, ...state } = data
+            executionState = state
+            lastSeq = seq ?? lastSeq
+            resyncRequested = false
+            onMessage(data)
+          } else if (data.type === 'execution_delta') {
+            if (!executionState || data.seq !== lastSeq + 1) {
+              // Missed an update: ask for a fresh snapshot and drop deltas until it arrives
+              executionState = null
+              if (!resyncRequested) {
+                resyncRequested = true
+                ws.send('resync')
+              }
+              return
+            }
+            lastSeq = data.seq
+            executionState = applyPatch(executionState, data.ops)
+            onMessage({ ...executionState, type: 'execution_update', execution_id: data.execution_id, seq: data.seq })
+          } else {
+            onMessage(data)
+          }
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error)
         }
@@ -23,6 +23,8 @@ export interface EvaluationCase {
   checkpoints: CheckpointCriteria[]
   ground_truth: GroundTruthAnswer[]
   final_output_criteria: CheckpointCriteria[]
+  // 'batched' scores all criteria of an output in a single judge call
+  judge_mode?: 'per_criterion' | 'batched'
   created_at?: string
 }
 
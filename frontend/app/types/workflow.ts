@@ -630,7 +630,8 @@ export const SYSTEM_MODEL_CONFIGS: SystemModelConfig[] = [
 ]
 
 // Add execution status types for progress visualization
-export type NodeExecutionStatus = 'idle' | 'pending' | 'running' | 'completed' | 'failed' | 'waiting' | 'waiting_for_input'
+// 'skipped': the node was not on the path the workflow actually took (e.g. an unselected conditional branch)
+export type NodeExecutionStatus = 'idle' | 'pending' | 'running' | 'completed' | 'failed' | 'skipped' | 'waiting' | 'waiting_for_input'
 
 export interface NodeExecutionState {
   status: NodeExecutionStatus
@@ -639,6 +640,8 @@ export interface NodeExecutionState {
   progress?: number // 0-100
   cost?: number
   output?: any
+  streamingOutput?: string // partial agent output while the node runs
+  streamingOutputOutOfSync?: boolean // deltas were missed; waiting for the final output
   error?: string
 }
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for leasing pooled agent instances
+"""
+
+import sys
+import os
+import asyncio
+import threading
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from agent_pool import AgentInstancePool
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from agent_pool import AgentInstancePool
+
+
+class _Config:
+    model_id = "gpt-4o-mini"
+    instructions = "Be brief."
+    tools = []
+
+
+class _Agent:
+    def __init__(self):
+        self.exited = False
+        self.exited_while_running = False
+        self.running = False
+
+    def run(self, release: threading.Event):
+        self.running = True
+        release.wait(5)
+        self.running = False
+        return "done"
+
+    def exit(self):
+        self.exited = True
+        self.exited_while_running = self.running
+
+
+def test_pool_is_off_by_default():
+    os.environ.pop("AGENT_POOL_ENABLED", None)
+    assert not AgentInstancePool().enabled
+
+
+def test_reuses_instance_for_same_config():
+    async def run():
+        pool = AgentInstancePool(max_size=4, enabled=True)
+        created = []
+
+        async def create():
+            created.append(_Agent())
+            return created[-1]
+
+        for _ in range(2):
+            async with pool.lease("openai", _Config(), create):
+                pass
+        return created, pool.get_stats()
+
+    created, stats = asyncio.run(run())
+    assert len(created) == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_timed_out_run_closes_agent_after_it_finishes():
+    async def run():
+        pool = AgentInstancePool(max_size=4, enabled=True)
+        agent = _Agent()
+        release = threading.Event()
+
+        async def create():
+            return agent
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with pool.lease("openai", _Config(), create) as leased:
+                await asyncio.wait_for(pool.run(leased, loop.run_in_executor(None, leased.run, release)), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        closed_during_run = agent.exited
+        release.set()
+        for _ in range(100):
+            if agent.exited:
+                break
+            await asyncio.sleep(0.01)
+        return closed_during_run, agent, pool.get_stats()
+
+    closed_during_run, agent, stats = asyncio.run(run())
+    assert not closed_during_run
+    assert agent.exited and not agent.exited_while_running
+    assert stats["discarded"] == 1 and stats["idle"] == 0
+
+
+if __name__ == "__main__":
+    test_pool_is_off_by_default()
+    test_reuses_instance_for_same_config()
+    test_timed_out_run_closes_agent_after_it_finishes()
+    print("✅ Agent pool tests passed")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for per-turn streaming and fallback of agent output
+"""
+
+import sys
+import os
+import asyncio
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from agent_streaming import NodeOutputPublisher, OutputStreamCallback, run_agent_with_output_stream
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from agent_streaming import NodeOutputPublisher, OutputStreamCallback, run_agent_with_output_stream
+
+
+class _Sink:
+    def __init__(self):
+        self.messages = []
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+
+class _Result:
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+class _Agent:
+    """Non-streaming agent (any framework without a streaming API)"""
+
+    def run(self, prompt):
+        return _Result(f"echo: {prompt}")
+
+
+class _Span:
+    def __init__(self, attributes):
+        self.attributes = attributes
+
+
+class _Context:
+    def __init__(self, attributes):
+        self.current_span = _Span(attributes)
+
+
+class _CallbackAgent:
+    """Agent whose run fires the output stream callback like any-agent does after each LLM call"""
+
+    def __init__(self):
+        self.callback = OutputStreamCallback()
+        self.thread = None
+
+    def run(self, prompt):
+        import threading
+        self.thread = threading.current_thread()
+        self.callback.after_llm_call(_Context({"gen_ai.output.type": "json", "gen_ai.output": '{"tool": "search"}'}))
+        self.callback.after_llm_call(_Context({"gen_ai.output.type": "text", "gen_ai.output": "Looking it up. "}))
+        self.callback.after_llm_call(_Context({"gen_ai.output.type": "text", "gen_ai.output": f"echo: {prompt}"}))
+        return _Result(f"echo: {prompt}")
+
+
+def test_each_turn_is_one_delta():
+    async def run():
+        sink = _Sink()
+        publisher = NodeOutputPublisher(sink, "exec_1", "agent-1")
+        for turn in ["Looking it up. ", "", "Found it."]:
+            await publisher.send(turn)
+        return sink.messages, publisher
+
+    messages, publisher = asyncio.run(run())
+    assert [m["delta"] for m in messages] == ["Looking it up. ", "Found it."]
+    assert [m["offset"] for m in messages] == [0, 15]
+    assert all(m["type"] == "node_output_delta" and m["node_id"] == "agent-1" for m in messages)
+    assert publisher.events == 2 and publisher.sent_chars == 24
+
+
+def test_non_streaming_agent_sends_one_chunk():
+    os.environ["AGENT_OUTPUT_STREAMING"] = "true"
+    try:
+        sink = _Sink()
+        result = asyncio.run(run_agent_with_output_stream(_Agent(), "hi", sink, "exec_1", "agent-1"))
+    finally:
+        del os.environ["AGENT_OUTPUT_STREAMING"]
+    assert result.final_output == "echo: hi"
+    assert [m["delta"] for m in sink.messages if m["type"] == "node_output_delta"] == ["echo: hi"]
+    assert sink.messages[-1] == {"type": "node_output_final", "execution_id": "exec_1", "node_id": "agent-1", "output": "echo: hi"}
+
+
+def test_callback_text_is_streamed_from_worker_thread():
+    import threading
+    os.environ["AGENT_OUTPUT_STREAMING"] = "true"
+    try:
+        sink = _Sink()
+        agent = _CallbackAgent()
+        result = asyncio.run(run_agent_with_output_stream(agent, "hi", sink, "exec_1", "agent-1"))
+    finally:
+        del os.environ["AGENT_OUTPUT_STREAMING"]
+    # The agent ran on the worker pool, not the event loop thread
+    assert agent.thread is not threading.main_thread()
+    assert result.final_output == "echo: hi"
+    # Tool-call turns are skipped and the final output is not sent twice
+    deltas = [m for m in sink.messages if m["type"] == "node_output_delta"]
+    assert [m["delta"] for m in deltas] == ["Looking it up. ", "echo: hi"]
+    assert sink.messages[-1]["output"] == "echo: hi"
+    assert deltas[0]["offset"] == 0
+
+
+def test_streaming_disabled_sends_nothing():
+    sink = _Sink()
+    result = asyncio.run(run_agent_with_output_stream(_Agent(), "hi", sink, "exec_1", "agent-1"))
+    assert result.final_output == "echo: hi"
+    assert sink.messages == []
+
+
+if __name__ == "__main__":
+    test_each_turn_is_one_delta()
+    test_non_streaming_agent_sends_one_chunk()
+    test_callback_text_is_streamed_from_worker_thread()
+    test_streaming_disabled_sends_nothing()
+    print("✅ Agent streaming tests passed")
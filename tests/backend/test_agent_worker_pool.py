@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded agent worker pool: admission, queue limits and context propagation
+"""
+
+import sys
+import os
+import asyncio
+import contextvars
+import threading
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from agent_worker_pool import AgentWorkerPool
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from agent_worker_pool import AgentWorkerPool
+
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class _BlockingWork:
+    """Callable that records which calls started and blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = []
+        self._lock = threading.Lock()
+
+    def __call__(self, label):
+        with self._lock:
+            self.started.append(label)
+        self.release.wait(5)
+        return label
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+def test_work_beyond_the_queue_limit_waits_for_admission():
+    async def run():
+        pool = AgentWorkerPool(max_workers=2, max_queue=1)
+        work = _BlockingWork()
+        tasks = [asyncio.create_task(pool.run(work, i)) for i in range(5)]
+        await _until(lambda: pool.get_stats()["active"] == 2)
+        await asyncio.sleep(0.02)
+        full = pool.get_stats()
+        started_while_full = list(work.started)
+
+        work.release.set()
+        results = await asyncio.gather(*tasks)
+        pool.shutdown(wait=True)
+        return pool, full, started_while_full, results
+
+    pool, full, started_while_full, results = asyncio.run(run())
+    # Two running, one queued for a thread, two held back before the executor
+    assert len(started_while_full) == 2
+    assert full["active"] == 2 and full["queue_depth"] == 3 and full["waiting_for_admission"] == 2
+    assert full["saturation"] == 1.0 and full["queue_utilization"] == 3.0
+    assert results == [0, 1, 2, 3, 4]
+    stats = pool.get_stats()
+    assert stats["completed"] == 5 and stats["queue_depth"] == 0 and stats["peak_queue_depth"] >= 3
+
+
+def test_abandoned_and_failed_calls_release_their_slot():
+    def fail():
+        raise ValueError("tool exploded")
+
+    async def run():
+        pool = AgentWorkerPool(max_workers=1, max_queue=0)
+        work = _BlockingWork()
+        running = asyncio.create_task(pool.run(work, "running"))
+        await _until(lambda: pool.get_stats()["active"] == 1)
+
+        # A caller that gives up while waiting for admission never reaches a thread
+        try:
+            await asyncio.wait_for(pool.run(work, "abandoned"), 0.05)
+            raise AssertionError("expected the admission wait to time out")
+        except asyncio.TimeoutError:
+            pass
+        waiting_after_timeout = pool.get_stats()["waiting_for_admission"]
+
+        work.release.set()
+        await running
+        try:
+            await pool.run(fail)
+            raise AssertionError("expected the tool error")
+        except ValueError:
+            pass
+        # Neither the abandoned nor the failed call leaked the only slot
+        after = await asyncio.wait_for(pool.run(work, "after"), 1)
+        pool.shutdown(wait=True)
+        return pool, work, waiting_after_timeout, after
+
+    pool, work, waiting_after_timeout, after = asyncio.run(run())
+    assert waiting_after_timeout == 0
+    assert after == "after" and work.started == ["running", "after"]
+    stats = pool.get_stats()
+    assert stats["submitted"] == 4 and stats["completed"] == 2 and stats["failed"] == 1
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+
+def test_context_variables_reach_the_worker_thread():
+    def read_context():
+        return request_id.get(), threading.current_thread().name
+
+    async def call_as(value):
+        request_id.set(value)
+        return await pool.run(read_context)
+
+    async def run():
+        return await asyncio.gather(*(call_as(f"req_{i}") for i in range(6)))
+
+    pool = AgentWorkerPool(max_workers=3, max_queue=3)
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown(wait=True)
+    assert [value for value, _ in results] == [f"req_{i}" for i in range(6)]
+    assert all(thread.startswith("agent-worker") for _, thread in results)
+    # Each caller set its value in its own task context
+    assert request_id.get() is None
+
+
+def test_private_loops_bypass_admission():
+    pool = AgentWorkerPool(max_workers=1, max_queue=0)
+    try:
+        assert asyncio.run(pool.run(lambda: "main")) == "main"
+        # A second loop (e.g. one started on a worker thread) must not share the first loop's semaphore
+        result = []
+        thread = threading.Thread(target=lambda: result.append(asyncio.run(pool.run(lambda: "private"))))
+        thread.start()
+        thread.join(5)
+    finally:
+        pool.shutdown(wait=True)
+    assert result == ["private"]
+    assert pool.get_stats()["completed"] == 2
+
+
+if __name__ == "__main__":
+    test_work_beyond_the_queue_limit_waits_for_admission()
+    test_abandoned_and_failed_calls_release_their_slot()
+    test_context_variables_reach_the_worker_thread()
+    test_private_loops_bypass_admission()
+    print("✅ Agent worker pool tests passed")
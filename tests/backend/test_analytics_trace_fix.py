@@ -73,31 +73,22 @@ def create_mock_trace_data() -> Dict[str, Any]:
     }
 
 def test_backend_extraction():
-    """Test the backend main.py extraction methods"""
-    logger.info("🧪 Testing backend trace extraction methods...")
+    """Test the backend trace summary (cost, performance and spans in one pass)"""
+    logger.info("🧪 Testing backend trace summary...")
     
     try:
-        from main import WorkflowExecutor
-        
-        # Create test executor
-        executor = WorkflowExecutor()
+        from trace_summary import summarize_trace
         
         # Test data with OpenInference attributes
         mock_trace = create_mock_trace_data()
         
-        # Test cost extraction
-        logger.info("Testing _extract_cost_info_from_trace...")
-        cost_info = executor._extract_cost_info_from_trace(mock_trace)
+        logger.info("Testing summarize_trace...")
+        summary = summarize_trace(mock_trace, 3.5)
+        cost_info = summary.cost_info
+        performance = summary.performance
+        spans = summary.spans
         logger.info(f"Extracted cost info: {cost_info}")
-        
-        # Test performance extraction  
-        logger.info("Testing _extract_performance_metrics...")
-        performance = executor._extract_performance_metrics(mock_trace, 3.5)
         logger.info(f"Extracted performance: {performance}")
-        
-        # Test spans extraction
-        logger.info("Testing _extract_spans_from_trace...")
-        spans = executor._extract_spans_from_trace(mock_trace)
         logger.info(f"Extracted {len(spans)} spans")
         
         # Verify results
@@ -239,8 +230,7 @@ def test_attribute_mapping():
     ]
     
     try:
-        from main import WorkflowExecutor
-        executor = WorkflowExecutor()
+        from trace_summary import summarize_trace
         
         all_passed = True
         
@@ -255,7 +245,7 @@ def test_attribute_mapping():
             }
             
             # Extract cost info
-            result = executor._extract_cost_info_from_trace(mock_trace)
+            result = summarize_trace(mock_trace).cost_info
             
             # Check results
             actual_tokens = result.get("total_tokens", 0)
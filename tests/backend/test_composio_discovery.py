@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled Composio HTTP session and concurrent, cached action discovery
+(HTTP calls replaced by a fake session)
+"""
+
+import sys
+import os
+import asyncio
+from contextlib import asynccontextmanager
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from composio_http_manager import ComposioHttpClient, UserContext
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from composio_http_manager import ComposioHttpClient, UserContext
+
+
+class _Response:
+    def __init__(self, status, payload):
+        self.status = status
+        self.payload = payload
+
+    async def json(self, content_type=None):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Answers connectedAccounts and per-app actions requests after a per-app delay"""
+
+    def __init__(self, apps, delays=None, failing=()):
+        self.apps = apps
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @asynccontextmanager
+    async def get(self, url, headers=None, timeout=None):
+        self.requests += 1
+        if "connectedAccounts" in url:
+            yield _Response(200, {"items": [{"appName": app} for app in self.apps]})
+            return
+        app = url.split("appNames=")[1]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(app, 0.01))
+        finally:
+            self.in_flight -= 1
+        if app in self.failing:
+            yield _Response(500, {})
+        else:
+            yield _Response(200, {"items": [{"name": f"{app.upper()}_ACTION", "description": app}]})
+
+
+def _client(session):
+    client = ComposioHttpClient()
+
+    @asynccontextmanager
+    async def http_session():
+        yield session
+
+    client._http_session = http_session
+    return client
+
+
+def _user():
+    return UserContext(user_id="user_1", api_key="key_1")
+
+
+def test_apps_are_discovered_concurrently_under_the_limit():
+    os.environ["COMPOSIO_DISCOVERY_CONCURRENCY"] = "3"
+    try:
+        apps = [f"app{i}" for i in range(9)]
+        session = _FakeSession(apps, delays={app: 0.05 for app in apps})
+        client = _client(session)
+        (discovery, ttl) = asyncio.run(client._discover_actions_uncached(_user(), "key_1"))
+    finally:
+        del os.environ["COMPOSIO_DISCOVERY_CONCURRENCY"]
+    assert session.max_in_flight == 3
+    assert all(f"APP{i}_ACTION" in discovery["tools"] for i in range(9))
+    assert not discovery["partial"] and ttl == client._discovery_cache.ttl
+
+
+def test_failed_and_slow_apps_give_partial_results():
+    os.environ["COMPOSIO_DISCOVERY_DEADLINE"] = "0.1"
+    try:
+        session = _FakeSession(["fast", "broken", "slow"], delays={"slow": 5}, failing=["broken"])
+        client = _client(session)
+        (discovery, ttl) = asyncio.run(client._discover_actions_uncached(_user(), "key_1"))
+    finally:
+        del os.environ["COMPOSIO_DISCOVERY_DEADLINE"]
+    assert "FAST_ACTION" in discovery["tools"]
+    assert "SLOW_ACTION" not in discovery["tools"] and "BROKEN_ACTION" not in discovery["tools"]
+    # Fallback tools are still offered, and partial results expire sooner
+    assert "github_create_issue" in discovery["tools"]
+    assert discovery["partial"] and ttl == 60
+
+
+def test_discovery_is_cached_per_user():
+    async def run():
+        session = _FakeSession(["github"])
+        client = _client(session)
+        first = await client.discover_actions_for_user(_user())
+        second = await client.discover_actions_for_user(_user())
+        return session, first, second
+
+    session, first, second = asyncio.run(run())
+    assert "GITHUB_ACTION" in first and first == second
+    assert session.requests == 2  # connected accounts + one app, once
+
+
+def test_discovery_errors_fall_back_to_base_tools():
+    async def run():
+        client = ComposioHttpClient()
+
+        async def failing_discovery(user_context, api_key):
+            raise RuntimeError("network down")
+
+        client._discover_actions_uncached = failing_discovery
+        return client, await client.discover_actions_for_user(_user())
+
+    client, tools = asyncio.run(run())
+    assert tools == client.available_tools
+
+
+def test_one_pooled_session_per_client():
+    async def run():
+        client = ComposioHttpClient()
+        async with client._http_session() as first:
+            pass
+        async with client._http_session() as second:
+            pass
+        reused = first is second and not first.closed
+        await client.close()
+        return client, reused, first
+
+    client, reused, session = asyncio.run(run())
+    assert reused and session.closed
+    stats = client.get_pool_stats()
+    assert stats["sessions_created"] == 1 and stats["requests"] == 2 and stats["in_flight"] == 0
+    assert not stats["session_open"]
+
+
+def test_private_loop_gets_a_transient_session():
+    client = ComposioHttpClient()
+
+    async def call():
+        async with client._http_session() as session:
+            return session
+
+    # Synchronous callers (no application loop) run on a short-lived loop
+    session = client.run_sync(call)
+    assert session.closed
+    # ... which must not capture the shared session
+    assert client._session_loop is None and client._session is None
+    stats = client.get_pool_stats()
+    assert stats["transient_sessions"] == 1 and stats["sessions_created"] == 0
+
+
+if __name__ == "__main__":
+    test_apps_are_discovered_concurrently_under_the_limit()
+    test_failed_and_slow_apps_give_partial_results()
+    test_discovery_is_cached_per_user()
+    test_discovery_errors_fall_back_to_base_tools()
+    test_one_pooled_session_per_client()
+    test_private_loop_gets_a_transient_session()
+    print("✅ Composio discovery tests passed")
@@ -6,15 +6,18 @@ Test script for conditional router node functionality
 import sys
 import os
 import json
+import time
 from typing import Dict, List, Any
 
 # Import from the current directory (assumes we're running from backend/)
 try:
     from visual_to_anyagent_translator import _evaluate_condition
+    from conditional_router import compile_router, router_input
 except ImportError:
     # Fallback: add the backend directory to path
     sys.path.append(os.path.join(os.getcwd(), 'backend'))
     from backend.visual_to_anyagent_translator import _evaluate_condition
+    from conditional_router import compile_router, router_input
 
 def test_evaluate_condition():
     """Test the _evaluate_condition function with various scenarios"""
@@ -302,6 +305,64 @@ def test_conditional_workflow():
     print(f"\n{'='*50}")
     print("🎯 Conditional workflow test completed")
 
+
+def _triage_router():
+    """Email triage: urgent / sales / default, as in the conditional workflow examples"""
+    node = {"id": "router", "data": {"conditions": [
+        {"id": "urgent", "rule": {"jsonpath": "$.classification.priority", "operator": "equals", "value": "urgent"}},
+        {"id": "big_deal", "rule": {"jsonpath": "$.deal_size", "operator": "greater_than", "value": "10000"}},
+        {"id": "unwired", "rule": {"jsonpath": "$.anything", "operator": "contains", "value": ""}},
+        {"id": "tagged", "rule": {"jsonpath": "$.tags[0]", "operator": "equals", "value": "vip"}},
+        {"id": "other", "is_default": True},
+    ]}}
+    edges = {handle: {"id": f"e-{handle}", "source": "router", "target": handle, "sourceHandle": handle}
+             for handle in ("urgent", "big_deal", "tagged", "other")}
+    return compile_router(node, edges)
+
+
+def test_routes_first_matching_condition():
+    router = _triage_router()
+    assert router.route({"classification": {"priority": "urgent"}, "deal_size": 50000})["id"] == "e-urgent"
+    # Numeric comparison, not string comparison ("9000" > "10000" as strings)
+    assert router.route({"deal_size": 9000})["id"] == "e-other"
+    assert router.route({"deal_size": "25000"})["id"] == "e-big_deal"
+    # Complex paths go through jsonpath_ng
+    assert router.route({"tags": ["vip"]})["id"] == "e-tagged"
+
+
+def test_unwired_conditions_and_default():
+    router = _triage_router()
+    # "unwired" would match anything with $.anything but has no edge
+    assert router.route({"anything": "x"})["id"] == "e-other"
+    assert len(router.branches) == 3
+    no_default = compile_router({"id": "r", "data": {"conditions": [
+        {"id": "a", "rule": {"jsonpath": "$.x", "operator": "equals", "value": "1"}}
+    ]}}, {})
+    assert no_default.route({"x": "1"}) is None
+
+
+def test_parsed_input_is_shared():
+    cache = {}
+    output = json.dumps({"classification": {"priority": "urgent"}})
+    first = router_input(output, cache)
+    assert router_input(output, cache) is first
+    assert router_input("plain text", cache) == {"result": "plain text"}
+    assert router_input(["not", "a", "string"], cache) == {}
+
+
+def test_routing_benchmark():
+    """Routing a parsed input through a compiled router takes microseconds"""
+    router = _triage_router()
+    data = {"classification": {"priority": "normal"}, "deal_size": 500, "tags": ["vip"]}
+    rounds = 10000
+    started = time.perf_counter()
+    for _ in range(rounds):
+        edge = router.route(data)
+    per_route = (time.perf_counter() - started) / rounds
+    assert edge["id"] == "e-tagged"
+    assert per_route < 0.001
+
+
 if __name__ == "__main__":
     print("🚀 Starting Conditional Router Node Tests\n")
     
@@ -311,6 +372,12 @@ if __name__ == "__main__":
     # Run workflow tests
     test_conditional_workflow()
     
+    # Run compiled router tests
+    test_routes_first_matching_condition()
+    test_unwired_conditions_and_default()
+    test_parsed_input_is_shared()
+    test_routing_benchmark()
+    
     print(f"\n{'='*60}")
     print("✨ Test execution completed!")
     
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-subscriber execution event hub
+"""
+
+import sys
+import os
+import asyncio
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from execution_events import DISCONNECT, DROP_OLDEST, EventBroker, ExecutionEventHub, LocalBroker
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from execution_events import DISCONNECT, DROP_OLDEST, EventBroker, ExecutionEventHub, LocalBroker
+
+
+async def _drain(subscription):
+    events = []
+    while True:
+        event = await subscription.next_event(timeout=0)
+        if event is None:
+            return events
+        events.append(event)
+
+
+def test_every_subscriber_gets_every_event():
+    async def run():
+        hub = ExecutionEventHub()
+        first, second = hub.subscribe("e"), hub.subscribe("e")
+        for i in range(3):
+            hub.publish("e", {"type": "tick", "i": i})
+        return await _drain(first), await _drain(second)
+
+    first, second = asyncio.run(run())
+    assert [e["seq"] for e in first] == [1, 2, 3]
+    assert first == second
+
+
+def test_replay_from_last_seen_sequence():
+    async def run():
+        hub = ExecutionEventHub(replay_size=5)
+        for i in range(8):
+            hub.publish("e", {"type": "tick", "i": i})
+        resumed = hub.subscribe("e", after_seq=5)
+        too_old = hub.subscribe("e", after_seq=1)
+        return await _drain(resumed), resumed.replay_complete, too_old.replay_complete
+
+    resumed, complete, too_old_complete = asyncio.run(run())
+    assert [e["seq"] for e in resumed] == [6, 7, 8]
+    assert complete and not too_old_complete
+
+
+def test_output_deltas_do_not_evict_state_events():
+    async def run():
+        hub = ExecutionEventHub(replay_size=3, output_replay_size=2)
+        hub.publish("e", {"type": "status"})
+        for i in range(5):
+            hub.publish("e", {"type": "node_output_delta", "offset": i, "delta": "x"})
+        hub.publish("e", {"type": "execution_delta"})
+        resumed = hub.subscribe("e", after_seq=0)
+        return await _drain(resumed), resumed.replay_complete
+
+    replayed, complete = asyncio.run(run())
+    # Both state events survive; only the newest deltas are kept, in sequence order
+    assert [e["seq"] for e in replayed] == [1, 5, 6, 7]
+    assert complete
+
+
+def test_slow_consumer_policies():
+    async def run():
+        hub = ExecutionEventHub(max_queue=3)
+        dropping = hub.subscribe("e", policy=DROP_OLDEST)
+        disconnecting = hub.subscribe("e", policy=DISCONNECT)
+        for i in range(5):
+            hub.publish("e", {"type": "tick", "i": i})
+        return await _drain(dropping), disconnecting.closed, disconnecting.close_reason, hub.get_stats()
+
+    kept, closed, reason, stats = asyncio.run(run())
+    assert [e["seq"] for e in kept] == [3, 4, 5]
+    assert closed and reason == "slow_consumer"
+    assert stats["slow_disconnects"] == 1 and stats["subscribers"] == 1
+
+
+def test_local_broker_shares_events_between_hubs():
+    async def run():
+        broker = LocalBroker()
+        worker_a, worker_b = ExecutionEventHub(broker=broker), ExecutionEventHub(broker=broker)
+        watcher = worker_b.subscribe("e")
+        worker_a.publish("e", {"type": "tick"})
+        worker_a.publish("e", {"type": "tick"})
+        return await _drain(watcher), worker_b.last_seq("e")
+
+    events, last_seq = asyncio.run(run())
+    assert [e["seq"] for e in events] == [1, 2] and last_seq == 2
+
+
+def test_incomplete_broker_fails_at_construction():
+    class PublishOnlyBroker(EventBroker):
+        def publish(self, execution_id, event):
+            pass
+
+    try:
+        PublishOnlyBroker()
+    except TypeError:
+        return
+    raise AssertionError("a broker without attach/detach should not be constructible")
+
+
+if __name__ == "__main__":
+    test_every_subscriber_gets_every_event()
+    test_replay_from_last_seen_sequence()
+    test_output_deltas_do_not_evict_state_events()
+    test_slow_consumer_policies()
+    test_local_broker_shares_events_between_hubs()
+    test_incomplete_broker_fails_at_construction()
+    print("✅ Execution event hub tests passed")
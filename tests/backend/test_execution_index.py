@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for ULID execution IDs, the per-user execution index and the execution sweeper
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from services.workflow_executor import WorkflowExecutor, new_execution_id
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from services.workflow_executor import WorkflowExecutor, new_execution_id
+
+
+def test_execution_ids_are_unique_and_time_sortable():
+    ids = []
+    for _ in range(5):
+        ids.append(new_execution_id())
+        time.sleep(0.002)  # ULIDs only sort across milliseconds
+    assert ids == sorted(ids)
+    assert all(i.startswith("exec_") and len(i) == len("exec_") + 26 for i in ids)
+    assert len({new_execution_id() for _ in range(1000)}) == 1000
+
+
+def test_index_keeps_insertion_order_and_finds_owner():
+    executor = WorkflowExecutor()
+    ids = [new_execution_id() for _ in range(3)]
+    for execution_id in ids:
+        executor._add_execution("alice", execution_id, {"status": "running"})
+    executor._add_execution("bob", "exec_bob", {"status": "running"})
+
+    assert list(executor.user_executions["alice"]) == ids
+    assert executor._get_execution_by_id(ids[1])["status"] == "running"
+    assert executor._get_user_id_from_execution_id(ids[1]) == "alice"
+    assert executor._get_user_id_from_execution_id("exec_bob") == "bob"
+    assert executor._get_execution_by_id("exec_missing") is None
+
+    # Re-adding an ID moves it to the end, and to its new owner
+    executor._add_execution("alice", ids[0], {"status": "completed"})
+    assert list(executor.user_executions["alice"]) == ids[1:] + ids[:1]
+    executor._add_execution("bob", ids[0], {"status": "completed"})
+    assert ids[0] not in executor.user_executions["alice"]
+    assert executor._get_user_id_from_execution_id(ids[0]) == "bob"
+
+
+def test_oldest_executions_are_evicted_with_their_state():
+    executor = WorkflowExecutor()
+    executor.max_executions_per_user = 3
+    ids = [new_execution_id() for _ in range(5)]
+    for execution_id in ids:
+        executor._add_execution("alice", execution_id, {"status": "running"})
+        executor.pending_inputs[execution_id] = {"question": "?"}
+        executor.event_hub.publish(execution_id, {"type": "status", "status": "running"})
+
+    assert list(executor.user_executions["alice"]) == ids[2:]
+    assert executor.evicted_executions == 2
+    for evicted in ids[:2]:
+        assert executor._get_execution_by_id(evicted) is None
+        assert evicted not in executor._execution_owners
+        assert evicted not in executor.pending_inputs
+        assert executor.event_hub.last_seq(evicted) == 0
+    assert executor.event_hub.last_seq(ids[-1]) == 1
+
+
+def test_expired_executions_are_dropped_on_insert():
+    executor = WorkflowExecutor()
+    old, fresh = new_execution_id(), new_execution_id()
+    executor._add_execution("alice", old, {"status": "completed", "created_at": time.time() - 25 * 3600})
+    executor._add_execution("alice", fresh, {"status": "running"})
+    assert list(executor.user_executions["alice"]) == [fresh]
+
+
+def test_sweeper_reclaims_idle_executions_and_orphans():
+    executor = WorkflowExecutor()
+    idle, active = new_execution_id(), new_execution_id()
+    executor._add_execution("idle_user", idle, {"status": "completed"})
+    executor._add_execution("active_user", active, {"status": "running"})
+    executor.pending_inputs["exec_orphan"] = {"question": "?"}
+    # The idle user never adds another execution, so only the sweeper can expire this one
+    executor.user_executions["idle_user"][idle]["created_at"] = time.time() - 25 * 3600
+
+    assert executor.sweep_executions() == {"expired": 1, "orphans": 1}
+    assert "idle_user" not in executor.user_executions
+    assert executor._get_execution_by_id(idle) is None
+    assert executor._get_execution_by_id(active) is not None
+    assert "exec_orphan" not in executor.pending_inputs
+
+    stats = executor.get_memory_stats()
+    assert stats["users"] == 1 and stats["executions"] == 1
+    assert stats["sweeps"] == 1 and stats["swept_executions"] == 1 and stats["swept_orphans"] == 1
+
+
+def test_sweeper_runs_periodically():
+    async def run():
+        executor = WorkflowExecutor()
+        executor.sweep_interval_seconds = 0.01
+        execution_id = new_execution_id()
+        executor._add_execution("alice", execution_id, {"status": "completed"})
+        executor.user_executions["alice"][execution_id]["created_at"] = time.time() - 25 * 3600
+
+        executor.start_sweeper()
+        assert executor.get_memory_stats()["sweeper_running"]
+        await asyncio.sleep(0.05)
+        await executor.stop_sweeper()
+        return executor
+
+    executor = asyncio.run(run())
+    assert executor.sweeps >= 1
+    assert not executor.user_executions
+    assert not executor.get_memory_stats()["sweeper_running"]
+
+
+if __name__ == "__main__":
+    test_execution_ids_are_unique_and_time_sortable()
+    test_index_keeps_insertion_order_and_finds_owner()
+    test_oldest_executions_are_evicted_with_their_state()
+    test_expired_executions_are_dropped_on_insert()
+    test_sweeper_reclaims_idle_executions_and_orphans()
+    test_sweeper_runs_periodically()
+    print("✅ Execution index and sweeper tests passed")
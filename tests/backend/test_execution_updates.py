@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for coalesced, delta-encoded execution updates
+"""
+
+import sys
+import os
+import asyncio
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from execution_events import ExecutionEventHub
+    from services.execution_updates import ExecutionUpdatePublisher, diff_state
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from execution_events import ExecutionEventHub
+    from services.execution_updates import ExecutionUpdatePublisher, diff_state
+
+
+def _apply(state, ops):
+    for op in ops:
+        keys = [k.replace("~1", "/").replace("~0", "~") for k in op["path"][1:].split("/")]
+        target = state
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        if op["op"] == "remove":
+            del target[keys[-1]]
+        else:
+            target[keys[-1]] = op["value"]
+    return state
+
+
+def test_diff_state():
+    old = {"status": "running", "progress": {"percentage": 10, "node_status": {"a/b": {"status": "pending"}}}}
+    new = {"status": "running", "progress": {"percentage": 50, "node_status": {"a/b": {"status": "running"}, "c": {}}}}
+    ops = diff_state(old, new)
+    assert {"op": "replace", "path": "/progress/percentage", "value": 50} in ops
+    assert {"op": "replace", "path": "/progress/node_status/a~1b/status", "value": "running"} in ops
+    assert {"op": "add", "path": "/progress/node_status/c", "value": {}} in ops
+    assert diff_state(new, new) == []
+
+
+def test_bursts_are_coalesced_and_result_sent_once():
+    async def run():
+        hub = ExecutionEventHub()
+        subscription = hub.subscribe("exec_1")
+        publisher = ExecutionUpdatePublisher("exec_1", hub, window=0.01)
+        execution = {"status": "running", "progress": {"percentage": 0, "node_status": {}}}
+        publisher.mark_dirty(execution)
+        await asyncio.sleep(0.03)
+
+        for percentage in range(1, 51):
+            execution["progress"]["percentage"] = percentage
+            publisher.mark_dirty(execution)
+        await asyncio.sleep(0.03)
+
+        execution.update({"status": "completed", "result": "x" * 10000})
+        publisher.mark_dirty(execution)
+        await asyncio.sleep(0.03)
+        execution["progress"]["current_activity"] = "Done"
+        publisher.mark_dirty(execution)
+        await asyncio.sleep(0.03)
+
+        messages = []
+        while True:
+            event = await subscription.next_event(timeout=0)
+            if event is None:
+                return messages, publisher.snapshot(execution)
+            messages.append(event)
+
+    messages, snapshot = asyncio.run(run())
+    assert [m["seq"] for m in messages] == [1, 2, 3, 4]  # status, one coalesced progress delta, completion, activity
+    assert messages[0]["type"] == "status"
+    assert sum("x" * 10000 in str(m) for m in messages) == 1
+
+    state = {k: v for k, v in messages[0].items() if k not in ("type", "execution_id", "seq")}
+    for message in messages[1:]:
+        state = _apply(state, message["ops"])
+    assert state["status"] == "completed"
+    assert state["progress"] == {"percentage": 50, "node_status": {}, "current_activity": "Done"}
+    assert snapshot["seq"] == 4 and snapshot["progress"] == state["progress"]
+
+
+if __name__ == "__main__":
+    test_diff_state()
+    test_bursts_are_coalesced_and_result_sent_once()
+    print("✅ Execution update tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency-graph scheduler: joins and skipped conditional branches
+(standalone tool nodes stand in for agents, so no LLM is called)
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from visual_to_anyagent_translator import _execute_graph_step_by_step
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from visual_to_anyagent_translator import _execute_graph_step_by_step
+
+
+class _FakeTranslator:
+    """Exposes recording tools; each returns '<name>(<input>)' after an optional delay"""
+
+    def __init__(self, names, delays=None):
+        self.calls = []
+        self._lock = threading.Lock()
+        self.available_tools = {name: self._tool(name, (delays or {}).get(name, 0)) for name in names}
+
+    def _tool(self, name, delay):
+        def tool(node_input):
+            time.sleep(delay)
+            with self._lock:
+                self.calls.append((name, node_input))
+            return f"{name}({node_input})"
+        return tool
+
+
+def _tool_node(node_id):
+    return {"id": node_id, "type": "tool", "data": {"type": "tool", "tool_type": node_id, "name": node_id.title()}}
+
+
+def _edge(source, target, source_handle=None):
+    return {"id": f"{source}-{target}", "source": source, "target": target, "sourceHandle": source_handle}
+
+
+def _triage_workflow():
+    """
+    input feeds route and enrich; route sends urgent input to alert and everything else
+    to archive, which feeds log. report joins alert, enrich and archive.
+    """
+    nodes = [
+        {"id": "input", "type": "input", "data": {"type": "input"}},
+        {"id": "route", "type": "conditional", "data": {"type": "conditional", "conditions": [
+            {"id": "urgent", "rule": {"jsonpath": "$.result", "operator": "contains", "value": "urgent"}},
+            {"id": "other", "is_default": True},
+        ]}},
+        _tool_node("alert"), _tool_node("archive"), _tool_node("log"),
+        _tool_node("enrich"), _tool_node("report"),
+    ]
+    edges = [
+        _edge("input", "route"), _edge("input", "enrich"),
+        _edge("route", "alert", "urgent"), _edge("route", "archive", "other"),
+        _edge("archive", "log"),
+        _edge("alert", "report"), _edge("enrich", "report"), _edge("archive", "report"),
+    ]
+    return nodes, edges
+
+
+def _run(input_data, delays=None):
+    nodes, edges = _triage_workflow()
+    translator = _FakeTranslator(["alert", "archive", "log", "enrich", "report"], delays)
+    events = []
+    result = asyncio.run(_execute_graph_step_by_step(
+        nodes, edges, input_data, "openai", translator, "exec_test", None,
+        on_node_event=lambda node_id, status: events.append((node_id, status)),
+    ))
+    return result, translator, events
+
+
+def test_nodes_behind_an_untaken_branch_are_skipped():
+    # Enrich is slow, so the join must wait for both of its live inputs
+    result, translator, events = _run("urgent: server down", delays={"enrich": 0.05})
+
+    ran = [name for name, _ in translator.calls]
+    assert "archive" not in ran and "log" not in ran
+    assert ("archive", "skipped") in events and ("log", "skipped") in events
+    assert not any(status == "running" for node_id, status in events if node_id in ("archive", "log"))
+
+    # The join ran once, after both live inputs, with only their outputs
+    assert ran.count("report") == 1 and ran[-1] == "report"
+    report_input = dict(translator.calls)["report"]
+    assert report_input == (
+        "**Alert:**\nalert(urgent: server down)\n\n"
+        "**Enrich:**\nenrich(urgent: server down)"
+    )
+    assert result["final_output"] == f"report({report_input})"
+
+
+def test_default_branch_skips_the_other_path():
+    # Report is slow, so the log branch finishes first
+    result, translator, events = _run("weekly digest", delays={"report": 0.05})
+
+    ran = [name for name, _ in translator.calls]
+    assert "alert" not in ran and ("alert", "skipped") in events
+    assert ran.count("log") == 1 and ran.count("report") == 1
+    assert dict(translator.calls)["report"] == (
+        "**Enrich:**\nenrich(weekly digest)\n\n"
+        "**Archive:**\narchive(weekly digest)"
+    )
+    # Two branches end the data flow, so the final output joins both
+    assert result["final_output"] == (
+        "**Log:**\nlog(archive(weekly digest))\n\n"
+        f"**Report:**\nreport({dict(translator.calls)['report']})"
+    )
+
+
+if __name__ == "__main__":
+    test_nodes_behind_an_untaken_branch_are_skipped()
+    test_default_branch_skips_the_other_path()
+    print("✅ Graph scheduler tests passed")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent LLM-judge verdict cache
+"""
+
+import sys
+import os
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    import judge_cache
+    import lightweight_evaluation
+    from judge_cache import JudgeVerdictCache, verdict_key
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    import judge_cache
+    import lightweight_evaluation
+    from judge_cache import JudgeVerdictCache, verdict_key
+
+
+def test_key_covers_every_input():
+    base = verdict_key("gpt-4o-mini", "is polite", [{"answer": "hi"}], "hello", "trace")
+    assert base == verdict_key("gpt-4o-mini", "is polite", [{"answer": "hi"}], "hello", "trace")
+    assert base != verdict_key("gpt-4o", "is polite", [{"answer": "hi"}], "hello", "trace")
+    assert base != verdict_key("gpt-4o-mini", "is concise", [{"answer": "hi"}], "hello", "trace")
+    assert base != verdict_key("gpt-4o-mini", "is polite", [{"answer": "hey"}], "hello", "trace")
+    assert base != verdict_key("gpt-4o-mini", "is polite", [{"answer": "hi"}], "hello!", "trace")
+    assert base != verdict_key("gpt-4o-mini", "is polite", [{"answer": "hi"}], "hello", None)
+
+
+def test_hits_misses_and_hit_rate():
+    cache = JudgeVerdictCache(db_path=":memory:", max_entries=10)
+    key = verdict_key("gpt-4o-mini", "is polite", None, "hello")
+    assert cache.get(key) is None
+    cache.put(key, "gpt-4o-mini", True, "Greets the user")
+    assert cache.get(key) == (True, "Greets the user")
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1 and stats["writes"] == 1
+
+
+def test_batch_lookup_and_store():
+    cache = JudgeVerdictCache(db_path=":memory:", max_entries=10)
+    keys = [verdict_key("m", f"criterion {i}", None, "out") for i in range(4)]
+    cache.put_many([(key, "m", i % 2 == 0, f"reason {i}") for i, key in enumerate(keys[:3])])
+    found = cache.get_many(keys)
+    assert found == {keys[0]: (True, "reason 0"), keys[1]: (False, "reason 1"), keys[2]: (True, "reason 2")}
+    stats = cache.get_stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1 and stats["writes"] == 3
+
+
+def test_least_recently_used_verdicts_are_evicted():
+    cache = JudgeVerdictCache(db_path=":memory:", max_entries=3)
+    keys = [verdict_key("m", f"criterion {i}", None, "out") for i in range(3)]
+    for key in keys:
+        cache.put(key, "m", True, "ok")
+    # Age the second verdict so it becomes the least recently used
+    cache._conn.execute("UPDATE judge_verdicts SET last_used_at = last_used_at - 100 WHERE cache_key = ?", (keys[1],))
+    cache.put(verdict_key("m", "criterion 3", None, "out"), "m", False, "no")
+    assert cache.get_stats()["entries"] == 3 and cache.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == (True, "ok")
+
+
+def test_cache_persists_across_instances():
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "verdicts.db")
+        key = verdict_key("m", "criterion", None, "out")
+        first = JudgeVerdictCache(db_path=path)
+        first.put(key, "m", False, "Missing details")
+        first.close()
+        second = JudgeVerdictCache(db_path=path)
+        assert second.get_stats()["entries"] == 1
+        assert second.get(key) == (False, "Missing details")
+        second.close()
+
+
+def test_verdicts_without_decision_are_not_cached():
+    cache = JudgeVerdictCache(db_path=":memory:")
+    responses = iter(['{"reason": "looks fine"}', '{"passed": true, "reason": "ok"}'])
+    originals = (lightweight_evaluation.get_judge_cache, lightweight_evaluation.completion)
+    lightweight_evaluation.get_judge_cache = lambda: cache
+    lightweight_evaluation.completion = lambda model, messages: _judge_response(next(responses))
+    try:
+        first = lightweight_evaluation.llm_evaluate_with_criterion("judge", "is polite", 1, hypothesis_final_output="hi")
+        assert not first.passed and "no boolean verdict" in first.reason
+        assert cache.get_stats()["entries"] == 0
+        # The next run asks the judge again instead of reusing a defaulted failure
+        second = lightweight_evaluation.llm_evaluate_with_criterion("judge", "is polite", 1, hypothesis_final_output="hi")
+        assert second.passed and cache.get_stats()["entries"] == 1
+    finally:
+        lightweight_evaluation.get_judge_cache, lightweight_evaluation.completion = originals
+        cache.close()
+
+
+def test_global_cache_is_created_once_under_concurrency():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    created = []
+    original_init = JudgeVerdictCache.__init__
+
+    def slow_init(self, *args, **kwargs):
+        created.append(threading.current_thread())
+        threading.Event().wait(0.05)  # widen the race window
+        original_init(self, db_path=":memory:")
+
+    judge_cache.close_judge_cache()
+    JudgeVerdictCache.__init__ = slow_init
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            caches = list(pool.map(lambda _: judge_cache.get_judge_cache(), range(8)))
+    finally:
+        JudgeVerdictCache.__init__ = original_init
+        judge_cache.close_judge_cache()
+    assert len(created) == 1
+    assert all(cache is caches[0] for cache in caches)
+
+
+def test_opt_out_flag():
+    os.environ["EVALUATION_JUDGE_CACHE"] = "false"
+    try:
+        assert judge_cache.get_judge_cache() is None
+    finally:
+        del os.environ["EVALUATION_JUDGE_CACHE"]
+
+
+class _BrokenCache:
+    """Verdict cache whose database is locked"""
+
+    def _fail(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    get = get_many = put = put_many = _fail
+
+
+def _judge_response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_cache_errors_bypass_the_cache():
+    calls = []
+
+    def completion(model, messages):
+        calls.append(model)
+        if "Criteria:" in messages[0]["content"]:
+            return _judge_response('{"results": [{"index": 1, "passed": true, "reason": "ok"}, {"index": 2, "passed": false, "reason": "no"}]}')
+        return _judge_response('{"passed": true, "reason": "ok"}')
+
+    async def acompletion(model, messages):
+        return completion(model, messages)
+
+    originals = (lightweight_evaluation.get_judge_cache, lightweight_evaluation.completion, lightweight_evaluation.acompletion)
+    lightweight_evaluation.get_judge_cache = lambda: _BrokenCache()
+    lightweight_evaluation.completion, lightweight_evaluation.acompletion = completion, acompletion
+    try:
+        criteria = [{"criteria": "is polite", "points": 1}, {"criteria": "is short", "points": 1}]
+        result = lightweight_evaluation.llm_evaluate_with_criterion("judge", "is polite", 1, hypothesis_final_output="hi")
+        assert result.passed and result.reason == "ok"
+        result = asyncio.run(lightweight_evaluation.allm_evaluate_with_criterion("judge", "is polite", 1, hypothesis_final_output="hi"))
+        assert result.passed and result.reason == "ok"
+        results = lightweight_evaluation.llm_evaluate_criteria_batch("judge", criteria, hypothesis_final_output="hi")
+        assert [r.passed for r in results] == [True, False]
+        results = asyncio.run(lightweight_evaluation.allm_evaluate_criteria_batch("judge", criteria, hypothesis_final_output="hi"))
+        assert [r.passed for r in results] == [True, False]
+        assert len(calls) == 4
+    finally:
+        lightweight_evaluation.get_judge_cache, lightweight_evaluation.completion, lightweight_evaluation.acompletion = originals
+
+
+if __name__ == "__main__":
+    test_key_covers_every_input()
+    test_hits_misses_and_hit_rate()
+    test_batch_lookup_and_store()
+    test_least_recently_used_verdicts_are_evicted()
+    test_cache_persists_across_instances()
+    test_verdicts_without_decision_are_not_cached()
+    test_global_cache_is_created_once_under_concurrency()
+    test_opt_out_flag()
+    test_cache_errors_bypass_the_cache()
+    print("✅ Judge cache tests passed")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent LLM-as-judge evaluation (judge calls replaced by a timed fake)
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    import enhanced_workflow_evaluation
+    from lightweight_evaluation import EvaluationResult, _batch_judge_results
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    import enhanced_workflow_evaluation
+    from lightweight_evaluation import EvaluationResult, _batch_judge_results
+
+JUDGE_SECONDS = 0.05
+
+
+class _FakeJudge:
+    """Stands in for aevaluate_workflow_output; passes criteria that don't mention 'fail'"""
+
+    def __init__(self, seconds=JUDGE_SECONDS):
+        self.seconds = seconds
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, workflow_output, criteria, points, model="gpt-4o-mini", use_cache=True):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.seconds)
+        finally:
+            self.in_flight -= 1
+        passed = "fail" not in criteria
+        return EvaluationResult(passed=passed, reason="fake", criteria=criteria, points=points)
+
+
+class _FakeBatchJudge:
+    """Stands in for aevaluate_workflow_output_batch; None simulates an unparseable response"""
+
+    def __init__(self, parseable=True):
+        self.parseable = parseable
+        self.calls = 0
+
+    async def __call__(self, workflow_output, criteria_list, model="gpt-4o-mini", use_cache=True, fallback=True):
+        self.calls += 1
+        if not self.parseable:
+            return None
+        return [EvaluationResult(passed="fail" not in c["criteria"], reason="batched", criteria=c["criteria"],
+                                 points=c["points"]) for c in criteria_list]
+
+
+def _with_batch_judge(judge):
+    original = enhanced_workflow_evaluation.aevaluate_workflow_output_batch
+    enhanced_workflow_evaluation.aevaluate_workflow_output_batch = judge
+    return original
+
+
+def _with_judge(judge):
+    original = enhanced_workflow_evaluation.aevaluate_workflow_output
+    enhanced_workflow_evaluation.aevaluate_workflow_output = judge
+    return original
+
+
+def _trace(steps=10):
+    spans = [
+        {
+            "name": f"Node: step_{i}",
+            "start_time": 0,
+            "end_time": 1_000_000,
+            "attributes": {"node.name": f"step_{i}", "node.id": f"n{i}", "node.type": "agent",
+                           "output": f"output {i}", "cost": 0.001},
+        }
+        for i in range(steps)
+    ]
+    return {"spans": spans, "final_output": "done"}
+
+
+CRITERIA = {
+    "final_output_criteria": [{"criteria": "is complete", "points": 2}, {"criteria": "should fail", "points": 1}],
+    "step_criteria": {"agent": [{"criteria": f"criterion {i}", "points": 1} for i in range(3)]},
+}
+
+
+def test_judgments_fan_out_under_concurrency_limit():
+    judge = _FakeJudge()
+    original = _with_judge(judge)
+    try:
+        started = time.perf_counter()
+        result = asyncio.run(enhanced_workflow_evaluation.aevaluate_end_to_end_workflow(
+            "exec_1", _trace(10), CRITERIA, concurrency=64, deadline=30))
+        elapsed = time.perf_counter() - started
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+
+    # 2 final + 10 steps x 3 criteria + 9 transitions x 2
+    assert judge.calls == 50
+    # Sequentially this would take 50 judge calls
+    assert elapsed < JUDGE_SECONDS * 10, elapsed
+    assert judge.max_in_flight == 50
+    assert len(result.step_evaluations) == 10
+    assert all(step.step_score == 1.0 for step in result.step_evaluations)
+    assert result.final_output_evaluation["earned_points"] == 2
+    assert len(result.flow_evaluation.transition_quality) == 9
+    assert result.flow_evaluation.flow_coherence == 1.0
+
+
+def test_concurrency_limit_is_respected():
+    judge = _FakeJudge(seconds=0.01)
+    original = _with_judge(judge)
+    try:
+        engine = enhanced_workflow_evaluation.JudgeEngine(concurrency=4, deadline=30)
+        criteria = [{"criteria": f"criterion {i}", "points": 1} for i in range(20)]
+        results = asyncio.run(engine.judge_all("output", criteria))
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+    assert judge.max_in_flight == 4
+    # Results keep the order of the criteria
+    assert [r.criteria for r in results] == [c["criteria"] for c in criteria]
+
+
+def test_deadline_fails_pending_judgments():
+    judge = _FakeJudge(seconds=1.0)
+    original = _with_judge(judge)
+    try:
+        started = time.perf_counter()
+        result = asyncio.run(enhanced_workflow_evaluation.aevaluate_end_to_end_workflow(
+            "exec_1", _trace(3), CRITERIA, concurrency=2, deadline=0.1))
+        elapsed = time.perf_counter() - started
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+    assert elapsed < 0.5, elapsed
+    assert all(not r["passed"] and "deadline" in r["reason"] for r in result.final_output_evaluation["results"])
+    assert result.overall_score == 0
+    assert any("deadline" in b for b in result.bottleneck_analysis)
+
+
+def test_sync_wrapper_matches_async():
+    judge = _FakeJudge(seconds=0)
+    original = _with_judge(judge)
+    try:
+        result = enhanced_workflow_evaluation.evaluate_end_to_end_workflow("exec_1", _trace(2), CRITERIA)
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+    assert result.execution_id == "exec_1"
+    assert len(result.step_evaluations) == 2
+    assert judge.calls == 2 + 2 * 3 + 2
+
+
+def test_batched_mode_makes_one_call_per_output():
+    judge, batch_judge = _FakeJudge(seconds=0), _FakeBatchJudge()
+    original, original_batch = _with_judge(judge), _with_batch_judge(batch_judge)
+    try:
+        result = asyncio.run(enhanced_workflow_evaluation.aevaluate_end_to_end_workflow(
+            "exec_1", _trace(10), CRITERIA, judge_mode="batched"))
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+        enhanced_workflow_evaluation.aevaluate_workflow_output_batch = original_batch
+    # 1 final output + 10 steps; transitions compare different outputs and stay per-criterion
+    assert batch_judge.calls == 11
+    assert judge.calls == 9 * 2
+    assert result.final_output_evaluation["earned_points"] == 2
+    assert all(r.reason == "batched" for step in result.step_evaluations for r in step.evaluation_results)
+
+
+def test_unparseable_batch_falls_back_to_per_criterion():
+    judge, batch_judge = _FakeJudge(seconds=0), _FakeBatchJudge(parseable=False)
+    original, original_batch = _with_judge(judge), _with_batch_judge(batch_judge)
+    try:
+        engine = enhanced_workflow_evaluation.JudgeEngine(judge_mode="batched")
+        results = asyncio.run(engine.judge_all("output", CRITERIA["final_output_criteria"]))
+    finally:
+        enhanced_workflow_evaluation.aevaluate_workflow_output = original
+        enhanced_workflow_evaluation.aevaluate_workflow_output_batch = original_batch
+    assert batch_judge.calls == 1 and judge.calls == 2 and engine.batch_fallbacks == 1
+    assert [r.passed for r in results] == [True, False]
+
+
+def test_batch_response_parsing():
+    criteria = [{"criteria": "is polite", "points": 1}, {"criteria": "is short", "points": 2}]
+    content = """```json
+    {"results": [{"index": 2, "passed": false, "reason": "Too long"},
+                 {"index": 1, "passed": true, "reason": "Says please"}]}
+    ```"""
+    results = _batch_judge_results(content, criteria)
+    assert [(r.criteria, r.passed, r.points) for r in results] == [("is polite", True, 1), ("is short", False, 2)]
+
+    for invalid in (
+        '{"results": [{"index": 1, "passed": true, "reason": "ok"}]}',  # missing a criterion
+        '{"results": [{"index": 1, "passed": true}, {"index": 1, "passed": false}]}',  # duplicate index
+        '{"results": [{"index": 1, "passed": "yes"}, {"index": 2, "passed": true}]}',  # non-boolean verdict
+        'I could not evaluate this.',
+    ):
+        try:
+            _batch_judge_results(invalid, criteria)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid batch response: {invalid}")
+
+
+if __name__ == "__main__":
+    test_judgments_fan_out_under_concurrency_limit()
+    test_concurrency_limit_is_respected()
+    test_deadline_fails_pending_judgments()
+    test_sync_wrapper_matches_async()
+    test_batched_mode_makes_one_call_per_output()
+    test_unparseable_batch_falls_back_to_per_criterion()
+    test_batch_response_parsing()
+    print("✅ Judge engine tests passed")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-flight stale-while-revalidate cache
+"""
+
+import sys
+import os
+import asyncio
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from swr_cache import SWRCache
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from swr_cache import SWRCache
+
+
+class _Loader:
+    """Counts calls; returns 'v<n>' after a delay, or raises once `fail` is set"""
+
+    def __init__(self, delay=0.0, ttl=60):
+        self.delay = delay
+        self.ttl = ttl
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"v{self.calls}", self.ttl
+
+
+def test_fresh_values_are_served_from_cache():
+    async def run():
+        cache = SWRCache("test")
+        loader = _Loader()
+        assert await cache.get("k", loader) == "v1"
+        assert await cache.get("k", loader) == "v1"
+        return cache, loader
+
+    cache, loader = asyncio.run(run())
+    assert loader.calls == 1
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_stale_value_is_served_while_revalidating():
+    async def run():
+        cache = SWRCache("test", stale_ttl=60)
+        loader = _Loader(delay=0.05, ttl=0)  # every stored value is immediately stale
+        assert await cache.get("k", loader) == "v1"
+
+        # Returns the stale value at once and refreshes in the background
+        assert await asyncio.wait_for(cache.get("k", loader), 0.01) == "v1"
+        assert await cache.get("k", loader) == "v1"  # refresh still running: no second one
+        assert loader.calls == 2
+        await asyncio.sleep(0.1)
+        assert cache.peek("k") == "v2"
+        return cache
+
+    cache = asyncio.run(run())
+    assert cache.stale_hits == 3 and cache.refreshes == 2
+
+
+def test_concurrent_misses_share_one_load():
+    async def run():
+        cache = SWRCache("test")
+        loader = _Loader(delay=0.02)
+        values = await asyncio.gather(*(cache.get("k", loader) for _ in range(10)))
+        return cache, loader, values
+
+    cache, loader, values = asyncio.run(run())
+    assert values == ["v1"] * 10
+    assert loader.calls == 1
+    assert cache.coalesced == 9
+    assert cache.get_stats()["refreshes_in_flight"] == 0
+
+
+def test_failed_refresh_keeps_serving_stale_value():
+    async def run():
+        cache = SWRCache("test", stale_ttl=60)
+        loader = _Loader(ttl=0)
+        assert await cache.get("k", loader) == "v1"
+
+        loader.fail = True
+        assert await cache.get("k", loader) == "v1"
+        await asyncio.sleep(0.01)  # let the background refresh fail
+        assert await cache.get("k", loader) == "v1"
+        await asyncio.sleep(0.01)
+        return cache
+
+    cache = asyncio.run(run())
+    assert cache.refresh_errors == 2
+
+
+def test_failed_load_on_miss_raises_and_caches_nothing():
+    async def run():
+        cache = SWRCache("test")
+        loader = _Loader()
+        loader.fail = True
+        try:
+            await cache.get("k", loader)
+            raise AssertionError("expected the loader error")
+        except RuntimeError:
+            pass
+        loader.fail = False
+        return cache, await cache.get("k", loader)
+
+    cache, value = asyncio.run(run())
+    assert value == "v2"
+    assert cache.refresh_errors == 1
+
+
+def test_lru_eviction_and_uncached_values():
+    async def run():
+        cache = SWRCache("test", max_entries=2)
+        for key in ("a", "b"):
+            await cache.get(key, _Loader())
+        await cache.get("a", _Loader())  # touch: "b" is now least recently used
+        await cache.get("c", _Loader())
+        uncached = _Loader(ttl=None)
+        await cache.get("d", uncached)
+        await cache.get("d", uncached)
+        return cache, uncached
+
+    cache, uncached = asyncio.run(run())
+    assert cache.peek("a") == "v1" and cache.peek("c") == "v1"
+    assert cache.peek("b") is None
+    assert cache.evictions == 1
+    assert uncached.calls == 2  # a ttl of None is never stored
+
+
+if __name__ == "__main__":
+    test_fresh_values_are_served_from_cache()
+    test_stale_value_is_served_while_revalidating()
+    test_concurrent_misses_share_one_load()
+    test_failed_refresh_keeps_serving_stale_value()
+    test_failed_load_on_miss_raises_and_caches_nothing()
+    test_lru_eviction_and_uncached_values()
+    print("✅ SWR cache tests passed")
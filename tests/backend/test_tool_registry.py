@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned tool registry and its invalidation
+"""
+
+import sys
+import os
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    import tool_registry
+    from tool_registry import ToolRegistry
+    from visual_to_anyagent_translator import VisualToAnyAgentTranslator
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    import tool_registry
+    from tool_registry import ToolRegistry
+    from visual_to_anyagent_translator import VisualToAnyAgentTranslator
+
+
+class _FakeMCPManager:
+    """Connected MCP servers' tools; tools_version is bumped when servers change"""
+
+    def __init__(self):
+        self.tools = {}
+        self.tools_version = 0
+
+    def get_available_tools(self):
+        return dict(self.tools)
+
+
+def _with_mcp(manager):
+    originals = (tool_registry.MCP_INTEGRATION_AVAILABLE, tool_registry.is_mcp_enabled, tool_registry.get_mcp_manager)
+    tool_registry.MCP_INTEGRATION_AVAILABLE = True
+    tool_registry.is_mcp_enabled = lambda: True
+    tool_registry.get_mcp_manager = lambda: manager
+    return originals
+
+
+def _restore_mcp(originals):
+    tool_registry.MCP_INTEGRATION_AVAILABLE, tool_registry.is_mcp_enabled, tool_registry.get_mcp_manager = originals
+
+
+def _tool(name):
+    def tool(query: str = ""):
+        return name
+    tool.__name__ = name
+    return tool
+
+
+def test_snapshot_is_reused_until_invalidated():
+    manager = _FakeMCPManager()
+    originals = _with_mcp(manager)
+    try:
+        registry = ToolRegistry()
+        first = registry.snapshot()
+        assert registry.snapshot() is first
+        assert registry.rebuild_count == 1
+        assert "search_web" in first and "composio_github_star_repo" in first
+
+        # A change the registry can't see stays hidden until someone invalidates
+        manager.tools["mcp_lookup"] = _tool("mcp_lookup")
+        assert "mcp_lookup" not in registry.snapshot()
+
+        registry.invalidate("MCP server added")
+        second = registry.snapshot()
+        assert "mcp_lookup" in second
+        assert "mcp_lookup" not in first  # earlier snapshots are immutable
+        assert registry.rebuild_count == 2
+        assert registry.get_stats()["built_version"] == registry.version == 1
+        assert registry.last_invalidation_reason == "MCP server added"
+    finally:
+        _restore_mcp(originals)
+
+
+def test_mcp_tools_version_change_triggers_rebuild():
+    manager = _FakeMCPManager()
+    originals = _with_mcp(manager)
+    try:
+        registry = ToolRegistry()
+        registry.snapshot()
+        manager.tools["mcp_lookup"] = _tool("mcp_lookup")
+        manager.tools_version += 1
+        assert "mcp_lookup" in registry.snapshot()
+        assert registry.rebuild_count == 2 and registry.version == 0
+    finally:
+        _restore_mcp(originals)
+
+
+def test_new_translators_see_invalidated_tools():
+    manager = _FakeMCPManager()
+    originals = _with_mcp(manager)
+    try:
+        registry = ToolRegistry()
+        before = VisualToAnyAgentTranslator(tool_registry=registry)
+        manager.tools["mcp_lookup"] = _tool("mcp_lookup")
+        registry.invalidate("MCP server added")
+        after = VisualToAnyAgentTranslator(tool_registry=registry)
+        assert "mcp_lookup" not in before.available_tools
+        assert after.available_tools["mcp_lookup"]() == "mcp_lookup"
+    finally:
+        _restore_mcp(originals)
+
+
+if __name__ == "__main__":
+    test_snapshot_is_reused_until_invalidated()
+    test_mcp_tools_version_change_triggers_rebuild()
+    test_new_translators_see_invalidated_tools()
+    print("✅ Tool registry tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the linear-time workflow graph analysis used by validation
+"""
+
+import sys
+import os
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from workflow_graph import analyze_graph
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from workflow_graph import analyze_graph
+
+
+class _CountingId(str):
+    """Node ID that counts how often it is hashed, i.e. every dict/set operation on it"""
+    hashes = 0
+
+    def __hash__(self):
+        _CountingId.hashes += 1
+        return str.__hash__(self)
+
+
+def _count_operations(nodes, edges):
+    """Analyse a graph with counting node IDs; returns (analysis, hash operations)"""
+    _CountingId.hashes = 0
+    nodes = [_CountingId(node) for node in nodes]
+    edges = [(_CountingId(source), _CountingId(target)) for source, target in edges]
+    return analyze_graph(nodes, edges), _CountingId.hashes
+
+
+def _diamond_chain(k):
+    """k diamonds in a row: 3k+1 nodes and 2**k start-to-end paths"""
+    nodes = ["n0"]
+    edges = []
+    for i in range(k):
+        left, right, join = f"l{i}", f"r{i}", f"n{i + 1}"
+        nodes += [left, right, join]
+        edges += [(f"n{i}", left), (f"n{i}", right), (left, join), (right, join)]
+    return nodes, edges
+
+
+def test_diamond_paths_and_depth():
+    nodes, edges = _diamond_chain(1)
+    analysis = analyze_graph(nodes, edges)
+    assert not analysis.has_cycle
+    assert analysis.start_nodes == ["n0"]
+    assert analysis.end_nodes == ["n1"]
+    assert analysis.path_count == 2
+    assert analysis.longest_path == 3
+    assert analysis.topological_order[0] == "n0" and analysis.topological_order[-1] == "n1"
+
+
+def test_single_node():
+    analysis = analyze_graph(["only"], [])
+    assert analysis.path_count == 1
+    assert analysis.longest_path == 1
+
+
+def test_cycle_detection_and_reachability():
+    """a -> b <-> c -> d: b, c and d never get a topological position but stay reachable"""
+    analysis = analyze_graph(["a", "b", "c", "d"], [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")])
+    assert analysis.has_cycle
+    assert analysis.blocked_nodes == {"b", "c", "d"}
+    assert analysis.reachable == {"a", "b", "c", "d"}
+    assert analysis.path_count == 0
+
+
+def test_pure_cycle_has_no_start():
+    analysis = analyze_graph(["a", "b"], [("a", "b"), ("b", "a")])
+    assert analysis.has_cycle
+    assert analysis.start_nodes == []
+    assert analysis.reachable == set()
+
+
+def test_exponential_path_count_is_linear_time():
+    """2**60 paths through 181 nodes: enumeration would never finish"""
+    nodes, edges = _diamond_chain(60)
+    analysis, operations = _count_operations(nodes, edges)
+    assert analysis.path_count == 2 ** 60
+    assert analysis.longest_path == 121
+    assert operations <= 20 * (len(nodes) + len(edges))
+
+
+def test_large_graph_benchmark():
+    """A 50k-node layered DAG costs a constant number of dict operations per node and edge"""
+    width, layers = 50, 1000
+    nodes = [f"{layer}:{i}" for layer in range(layers) for i in range(width)]
+    edges = [
+        (f"{layer}:{i}", f"{layer + 1}:{(i + step) % width}")
+        for layer in range(layers - 1) for i in range(width) for step in (0, 1)
+    ]
+    analysis, operations = _count_operations(nodes, edges)
+    assert not analysis.has_cycle
+    assert analysis.longest_path == layers
+    assert len(analysis.reachable) == len(nodes)
+    assert operations <= 20 * (len(nodes) + len(edges))
+
+
+if __name__ == "__main__":
+    test_diamond_paths_and_depth()
+    test_single_node()
+    test_cycle_detection_and_reachability()
+    test_pure_cycle_has_no_start()
+    test_exponential_path_count_is_linear_time()
+    test_large_graph_benchmark()
+    print("✅ Workflow graph tests passed")
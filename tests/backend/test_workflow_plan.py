@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled workflow plan cache
+"""
+
+import sys
+import os
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from workflow_plan import WorkflowPlanCache, canonical_workflow_hash
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from workflow_plan import WorkflowPlanCache, canonical_workflow_hash
+
+
+def _workflow(x=0):
+    nodes = [
+        {"id": "in", "type": "input", "data": {"label": "Input"}, "position": {"x": x, "y": 0}},
+        {"id": "check", "type": "conditional", "data": {"type": "conditional", "conditions": [
+            {"id": "yes", "rule": {"jsonpath": "$.ok", "operator": "equals", "value": "True"}},
+            {"id": "no", "is_default": True},
+        ]}, "position": {"x": x, "y": 100}},
+        {"id": "a", "type": "agent", "data": {"name": "A", "instructions": "Do A"}, "position": {"x": x, "y": 200}},
+        {"id": "b", "type": "agent", "data": {"name": "B", "instructions": "Do B"}, "position": {"x": x, "y": 300}},
+    ]
+    edges = [
+        {"id": "e1", "source": "in", "target": "check", "sourceHandle": "default", "targetHandle": "default"},
+        {"id": "e2", "source": "check", "target": "a", "sourceHandle": "yes", "targetHandle": "default"},
+        {"id": "e3", "source": "check", "target": "b", "sourceHandle": "no", "targetHandle": "default"},
+    ]
+    return nodes, edges
+
+
+def _counting_validator(calls):
+    def validate(nodes, edges):
+        calls.append(len(nodes))
+        nodes[2]["data"]["normalized"] = True  # validation may normalize node data in place
+        return {"valid": True, "message": "ok"}
+    return validate
+
+
+def test_hash_ignores_layout():
+    assert canonical_workflow_hash(*_workflow(0)) == canonical_workflow_hash(*_workflow(250))
+    nodes, edges = _workflow()
+    nodes[2]["data"]["instructions"] = "Do something else"
+    assert canonical_workflow_hash(nodes, edges) != canonical_workflow_hash(*_workflow())
+
+
+def test_repeat_runs_skip_compilation():
+    cache = WorkflowPlanCache(max_entries=4)
+    calls = []
+    nodes, edges = _workflow()
+    plan, hit = cache.get_or_compile(nodes, edges, _counting_validator(calls))
+    assert not hit and plan.valid
+    assert "normalized" not in nodes[2]["data"]  # the request's dicts are left untouched
+    assert plan.topological_order == ["in", "check", "a", "b"]
+    assert plan.conditional_edges["check"]["no"]["target"] == "b"
+
+    moved, hit = cache.get_or_compile(*_workflow(500), _counting_validator(calls))
+    assert hit and moved is plan
+    assert calls == [4]
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["compiles"] == 1
+
+
+def test_invalid_plans_are_cached_and_lru_is_bounded():
+    cache = WorkflowPlanCache(max_entries=2)
+    calls = []
+
+    def reject(nodes, edges):
+        calls.append(1)
+        return {"valid": False, "error": "nope"}
+
+    for _ in range(3):
+        plan, _ = cache.get_or_compile(*_workflow(), reject)
+    assert not plan.valid and plan.graph is None and len(calls) == 1
+
+    for i in range(3):
+        nodes, edges = _workflow()
+        nodes[2]["data"]["instructions"] = f"variant {i}"
+        cache.get_or_compile(nodes, edges, _counting_validator([]))
+    stats = cache.get_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 2
+
+
+if __name__ == "__main__":
+    test_hash_ignores_layout()
+    test_repeat_runs_skip_compilation()
+    test_invalid_plans_are_cached_and_lru_is_bounded()
+    print("✅ Workflow plan cache tests passed")
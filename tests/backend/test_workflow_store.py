@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite workflow store and its rollup-backed analytics
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+# Import from the current directory (assumes we're running from backend/)
+try:
+    from services.workflow_store import WorkflowStore
+except ImportError:
+    # Fallback: add the backend directory to path
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from services.workflow_store import WorkflowStore
+
+
+def _execution(execution_id, created_at, status="completed", workflow_id="wf_1", user_id="user_1", **extra):
+    return {
+        "execution_id": execution_id,
+        "user_id": user_id,
+        "workflow_id": workflow_id,
+        "workflow_name": f"Workflow {workflow_id}",
+        "status": status,
+        "created_at": created_at,
+        "execution_time": 2.0,
+        "cost_info": {"total_cost": 0.01},
+        **extra,
+    }
+
+
+def test_executions_persist_across_instances():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "store.db")
+        store = WorkflowStore(db_path=path)
+        now = time.time()
+        store.add_execution(_execution("exec_1", now - 10, trace={"spans": [
+            {"name": "Node: agent-1", "start_time": 0, "end_time": 5_000_000}
+        ]}))
+        store.add_execution(_execution("exec_2", now, status="failed", error_details={"error_type": "Timeout"}))
+        store.close()
+
+        reopened = WorkflowStore(db_path=path)
+        assert reopened.count_executions() == 2
+        assert [e["execution_id"] for e in reopened.get_recent_executions()] == ["exec_2", "exec_1"]
+        assert reopened.get_performance_metrics()["node_performance"]["agent-1"]["count"] == 1
+        assert reopened.get_comprehensive_analytics()["error_analysis"] == {"Timeout": 1}
+        reopened.close()
+
+
+def test_filters_and_decisions():
+    store = WorkflowStore(db_path=":memory:")
+    now = time.time()
+    store.add_execution(_execution("a1", now - 3, user_id="alice", workflow_id="wf_1"))
+    store.add_execution(_execution("a2", now - 2, user_id="alice", workflow_id="wf_2",
+                                   trace={"decisions": [{"path": "yes"}]}))
+    store.add_execution(_execution("b1", now - 1, user_id="bob", workflow_id="wf_1"))
+
+    assert [e["execution_id"] for e in store.get_recent_executions(user_id="alice")] == ["a2", "a1"]
+    assert [e["execution_id"] for e in store.get_recent_executions(workflow_id="wf_1", limit=1)] == ["b1"]
+    assert [e["execution_id"] for e in store.get_executions_with_decisions()] == ["a2"]
+    assert store.get_workflow_analytics(user_id="alice")["total_executions"] == 2
+    assert store.get_workflow_analytics(workflow_id="wf_1")["total_executions"] == 2
+    store.close()
+
+
+def test_readding_an_execution_replaces_it():
+    store = WorkflowStore(db_path=":memory:")
+    now = time.time()
+    store.add_execution(_execution("exec_1", now, status="running"))
+    store.add_execution(_execution("exec_1", now, status="completed"))
+    assert store.count_executions() == 1
+    analytics = store.get_workflow_analytics()
+    assert analytics["total_executions"] == 1 and analytics["successful_executions"] == 1
+    store.close()
+
+
+def test_retention_by_age_and_count():
+    store = WorkflowStore(db_path=":memory:", retention_days=1, max_executions=3)
+    now = time.time()
+    store.add_execution(_execution("too_old", now - 2 * 86400))
+    for i in range(4):
+        store.add_execution(_execution(f"exec_{i}", now - 10 + i))
+
+    assert store.apply_retention() == 2
+    assert [e["execution_id"] for e in store.get_recent_executions()] == ["exec_3", "exec_2", "exec_1"]
+    assert store.get_workflow_analytics()["total_executions"] == 3
+    store.close()
+
+
+def test_fractional_start_is_not_rounded_into_the_hour_bucket():
+    hour = int(time.time() // 3600) * 3600 - 3 * 3600
+    store = WorkflowStore(db_path=":memory:")
+    store.add_execution(_execution("before_start", hour + 0.2))
+    store.add_execution(_execution("after_start", hour + 0.7))
+    store.add_execution(_execution("next_hour", hour + 3600 + 10))
+
+    start = datetime.fromtimestamp(hour + 0.5)
+    buckets, raw = store._bucket_plan(start, datetime.fromtimestamp(hour + 2 * 3600 + 0.25))
+    assert buckets == [("hour", hour + 3600, hour + 2 * 3600)]
+    assert raw == [(hour + 0.5, hour + 3600, False), (hour + 2 * 3600, hour + 2 * 3600 + 0.25, True)]
+
+    analytics = store.get_workflow_analytics(start_date=start, end_date=datetime.fromtimestamp(hour + 2 * 3600 + 0.25))
+    assert analytics["total_executions"] == 2
+    assert {e["execution_id"] for e in analytics["recent_executions"]} == {"after_start", "next_hour"}
+    store.close()
+
+
+def _raw_totals(store, user_id=None, workflow_id=None, start=None, end=None):
+    """Analytics counters straight from the executions table"""
+    where, params = store._where(user_id, workflow_id, start, end)
+    row = store._query(f"""
+        SELECT COUNT(*), COALESCE(SUM(status = 'completed'), 0), COALESCE(SUM(status = 'failed'), 0),
+               COALESCE(SUM(total_cost), 0)
+        FROM executions{where}""", params)[0]
+    return tuple(row)
+
+
+def test_rollups_match_raw_executions_for_any_range():
+    rng = random.Random(7)
+    now = time.time()
+    store = WorkflowStore(db_path=":memory:")
+    for i in range(300):
+        store.add_execution(_execution(
+            f"exec_{i}", now - rng.uniform(0, 4 * 86400),
+            status=rng.choice(["completed", "completed", "failed"]),
+            user_id=rng.choice(["alice", "bob"]), workflow_id=rng.choice(["wf_1", "wf_2"]),
+            cost_info={"total_cost": rng.uniform(0, 0.1)},
+        ))
+
+    ranges = [(None, None), (None, now - 86400), (now - 3.5 * 86400, None)]
+    # Fractional edges; ranges inside one hour, across hours and across days
+    for _ in range(10):
+        lo = now - rng.uniform(0, 4 * 86400)
+        ranges.append((lo, lo + rng.choice([1800.5, 7200.25, 2.5 * 86400])))
+    for lo, hi in ranges:
+        start = datetime.fromtimestamp(lo) if lo is not None else None
+        end = datetime.fromtimestamp(hi) if hi is not None else None
+        for user_id, workflow_id in [(None, None), ("alice", None), (None, "wf_2"), ("bob", "wf_1")]:
+            analytics = store.get_workflow_analytics(user_id=user_id, start_date=start, end_date=end, workflow_id=workflow_id)
+            count, successful, failed, cost = _raw_totals(store, user_id, workflow_id, start, end)
+            assert analytics["total_executions"] == count, (lo, hi, user_id, workflow_id)
+            assert analytics["successful_executions"] == successful
+            assert analytics["failed_executions"] == failed
+            assert abs(analytics["total_cost"] - cost) < 1e-9
+            metrics = store.get_performance_metrics(user_id=user_id, workflow_id=workflow_id, start_date=start, end_date=end)
+            assert metrics["total_executions"] == count
+    store.close()
+
+
+def test_rollups_follow_retention_and_rebuild():
+    now = time.time()
+    store = WorkflowStore(db_path=":memory:", retention_days=1)
+    store.add_execution(_execution("old", now - 2 * 86400))
+    store.add_execution(_execution("new", now - 60, status="failed", error_details={"error_type": "Timeout"}))
+    store.apply_retention()
+    analytics = store.get_comprehensive_analytics()
+    assert analytics["total_executions"] == 1 and analytics["failed_executions"] == 1
+    assert analytics["error_analysis"] == {"Timeout": 1}
+
+    before = store.get_workflow_analytics()
+    store.rebuild_rollups()
+    store.rebuild_sketches()
+    after = store.get_workflow_analytics()
+    assert (after["total_executions"], after["failed_executions"]) == (before["total_executions"], before["failed_executions"])
+    assert store.get_performance_metrics()["p50_execution_time"] == 2.0
+    store.close()
+
+
+if __name__ == "__main__":
+    test_executions_persist_across_instances()
+    test_filters_and_decisions()
+    test_readding_an_execution_replaces_it()
+    test_retention_by_age_and_count()
+    test_fractional_start_is_not_rounded_into_the_hour_bucket()
+    test_rollups_match_raw_executions_for_any_range()
+    test_rollups_follow_retention_and_rebuild()
+    print("✅ Workflow store tests passed")